@@ -0,0 +1,202 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Startup time, peak RSS and import cost of the preptools CLI
+
+Every scenario runs `python -m preptools ...` in a new process, like a shell completion or a health check does.
+Read commands are sent to a local mock node, so the numbers don't depend on the network.
+
+    python -m benchmarks.startup                      # run and compare with the baseline
+    python -m benchmarks.startup --save-baseline      # run and store the result as the new baseline
+    python -m benchmarks.startup --importtime getPRep # import time breakdown of a command
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from preptools.command import COMMANDS
+from preptools.testing.mock_node import MockNode, MockState
+
+PREP_ADDRESS = MockState.synthetic(preps=1, proposals=0).preps[0]["address"]
+
+DEFAULT_REPEAT = 5
+# A scenario regresses when it is slower or bigger than the baseline by more than this ratio
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "startup_baseline.json")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Commands which are run for real against the mock node
+READ_COMMANDS = (
+    ("getPRep", PREP_ADDRESS),
+    ("getPReps",),
+    ("getStake", PREP_ADDRESS),
+    ("getBond", PREP_ADDRESS),
+    ("getBonderList", PREP_ADDRESS),
+    ("getProposals",),
+)
+
+
+def scenarios(url: str) -> List[Tuple[str, List[str]]]:
+    ret = [("--help", ["--help"])]
+    ret.extend((f"{command.name} --help", [command.name, "--help"]) for command in COMMANDS)
+    ret.extend((" ".join(argv[:1]), [*argv, "-u", url, "--no-cache"]) for argv in READ_COMMANDS)
+    return ret
+
+
+def _env(home: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PREPTOOLS_HOME"] = home
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (REPO_ROOT, env.get("PYTHONPATH")) if p)
+    return env
+
+
+def run_once(argv: Sequence[str], env: Dict[str, str], cwd: str) -> Tuple[float, int]:
+    """Run preptools once
+
+    :return: wall time in seconds, peak RSS in KiB
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "preptools", *argv],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env, cwd=cwd)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
+    if process.returncode != 0:
+        raise RuntimeError(f"preptools {' '.join(argv)} exited with {process.returncode}")
+
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return elapsed, rss
+
+
+def run_scenarios(repeat: int, only: Optional[Sequence[str]] = None) -> Dict[str, dict]:
+    results = {}
+    with MockNode(MockState.synthetic()) as node, tempfile.TemporaryDirectory() as home:
+        env = _env(home)
+        for name, argv in scenarios(node.url):
+            if only and name.split()[0] not in only:
+                continue
+            # The first run warms up the filesystem cache and writes the bytecode
+            run_once(argv, env, home)
+            samples = [run_once(argv, env, home) for _ in range(repeat)]
+            walls = [s[0] for s in samples]
+            results[name] = {
+                "wall": statistics.median(walls),
+                "min": min(walls),
+                "rss": max(s[1] for s in samples),
+            }
+    return results
+
+
+def importtime(argv: Sequence[str], top: int = 20) -> List[Tuple[str, int, int]]:
+    """Return the modules with the largest cumulative import time, like python -X importtime
+
+    :return: [(module, self us, cumulative us)]
+    """
+    with tempfile.TemporaryDirectory() as home:
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "preptools", *argv],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=_env(home), cwd=home)
+    return parse_importtime(process.stderr)[:top]
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    ret = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        ret.append((name.strip(), int(self_us), int(cumulative_us)))
+    ret.sort(key=lambda item: -item[2])
+    return ret
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Return the scenarios slower or bigger than the baseline by more than threshold"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["wall"] > base["wall"] * (1 + threshold):
+            regressions.append(f"{name}: wall {base['wall'] * 1000:.0f}ms -> {result['wall'] * 1000:.0f}ms")
+        if result["rss"] > base["rss"] * (1 + threshold):
+            regressions.append(f"{name}: rss {base['rss']}KiB -> {result['rss']}KiB")
+    return regressions
+
+
+def format_results(results: Dict[str, dict], baseline: Dict[str, dict]) -> str:
+    width = max([len(name) for name in results] + [8])
+    lines = [f"{'scenario':<{width}} {'wall(ms)':>9} {'min(ms)':>9} {'rss(KiB)':>9} {'base(ms)':>9} {'change':>8}"]
+    for name, r in results.items():
+        base = baseline.get(name)
+        base_wall = f"{base['wall'] * 1000:.1f}" if base else "-"
+        change = f"{(r['wall'] / base['wall'] - 1) * 100:+.1f}%" if base else "-"
+        lines.append(
+            f"{name:<{width}} {r['wall'] * 1000:>9.1f} {r['min'] * 1000:>9.1f} {r['rss']:>9} {base_wall:>9} {change:>8}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Startup time, peak RSS and import cost of the preptools CLI")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs of each scenario")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Ratio over the baseline reported as a regression")
+    parser.add_argument("--only", nargs="+", help="Run only the scenarios of these commands")
+    parser.add_argument("--importtime", nargs="*", metavar="ARG",
+                        help="Print the import time breakdown of `preptools ARG...` instead")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    if args.importtime is not None:
+        for name, self_us, cumulative_us in importtime(args.importtime or ["--help"]):
+            print(f"{cumulative_us / 1000:>9.1f}ms {self_us / 1000:>9.1f}ms  {name}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = run_scenarios(args.repeat, args.only)
+    if args.json:
+        print(json.dumps(results, indent=4))
+    else:
+        print(format_results(results, baseline))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({**baseline, **results}, f, indent=4)
+            f.write("\n")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput and latency of PRepToolsReader and PRepToolsWriter operations
+
+Operations run in this process against a local mock node, with the latency given by --latency.
+Besides ops/s and latency percentiles, every scenario reports how its time splits
+between signing, which is CPU bound, and JSON-RPC round trips.
+The mock node serves from this process too, so CPU time includes its share.
+
+    python -m benchmarks.throughput                              # every scenario
+    python -m benchmarks.throughput --latency 0.02 --concurrency 1 4 16 --only read-concurrent
+"""
+
+import argparse
+import functools
+import json
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from iconsdk.wallet.wallet import KeyWallet
+
+from preptools.core.prep import PRepToolsReader, PRepToolsWriter, create_icon_service
+from preptools.testing.mock_node import MockNode, MockState
+from preptools.utils import timings
+from preptools.utils.validation_checker import check_enough_balance
+
+DEFAULT_OPS = 200
+DEFAULT_CONCURRENCY = (8,)
+NID = 3
+# Step limit of the sends which skip estimation
+FIXED_STEP_LIMIT = 1_000_000
+
+SCENARIOS = (
+    "read-sequential",
+    "read-concurrent",
+    "read-batch",
+    "send-estimate",
+    "send-fixed-step",
+    "send-balance-check",
+    "send-pre-send",
+)
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def measure(op: Callable[[int], None], ops: int, concurrency: int = 1) -> dict:
+    """Run op(i) for i in range(ops) with concurrency threads
+
+    :return: ops/s, latency percentiles in seconds, and CPU, signing and JSON-RPC seconds per operation
+    """
+    latencies: List[float] = [0.0] * ops
+
+    def run(i: int):
+        started = time.perf_counter()
+        op(i)
+        latencies[i] = time.perf_counter() - started
+
+    timings.clear()
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    if concurrency == 1:
+        for i in range(ops):
+            run(i)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(run, i) for i in range(ops)]:
+                future.result()
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    phases = timings.get_phases()
+    sign = phases.get("sign", {}).get("total", 0.0)
+    rpc = sum(p["total"] for name, p in phases.items() if name.startswith("rpc "))
+    requests = sum(p["count"] for name, p in phases.items() if name.startswith("rpc "))
+    latencies.sort()
+    return {
+        "ops": ops,
+        "concurrency": concurrency,
+        "opsPerSec": ops / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "cpu": cpu / ops,
+        "sign": sign / ops,
+        "rpc": rpc / ops,
+        "requests": requests / ops,
+    }
+
+
+def _reader_ops(reader: PRepToolsReader, addresses: List[str]) -> Dict[str, Callable[[int], None]]:
+    def get_prep(i: int):
+        response = reader.get_prep(addresses[i % len(addresses)])
+        if "error" in response:
+            raise RuntimeError(response["error"])
+
+    def batch_call(i: int):
+        reader.batch_call(addresses[i % len(addresses):][:10], ("getPRep", "getStake", "getBond"))
+
+    return {"read-sequential": get_prep, "read-concurrent": get_prep, "read-batch": batch_call}
+
+
+def _writer_ops(url: str, wallet: KeyWallet) -> Dict[str, Callable[[int], None]]:
+    def create(step_limit: Optional[int], balance_check: bool, pre_send: bool) -> PRepToolsWriter:
+        writer = PRepToolsWriter(create_icon_service(url), NID, wallet, step_limit, 0)
+        listeners = [lambda content: True]
+        if pre_send:
+            info = writer.enable_pre_send()
+            listeners.append(functools.partial(check_enough_balance, url, pre_send=info))
+        elif balance_check:
+            listeners.append(functools.partial(check_enough_balance, url))
+        writer.set_listeners(listeners)
+        return writer
+
+    def send(writer: PRepToolsWriter, i: int):
+        if not isinstance(writer.set_stake({"value": hex(i)}), str):
+            raise RuntimeError("transaction is not sent")
+
+    return {
+        "send-estimate": functools.partial(send, create(None, False, False)),
+        "send-fixed-step": functools.partial(send, create(FIXED_STEP_LIMIT, False, False)),
+        "send-balance-check": functools.partial(send, create(None, True, False)),
+        "send-pre-send": functools.partial(send, create(None, True, True)),
+    }
+
+
+def run_scenarios(
+        ops: int,
+        concurrency: Sequence[int] = DEFAULT_CONCURRENCY,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        only: Optional[Sequence[str]] = None) -> Dict[str, dict]:
+    results = {}
+    state = MockState.synthetic()
+    addresses = [prep["address"] for prep in state.preps]
+
+    timings.enable()
+    try:
+        with MockNode(state, latency=latency, jitter=jitter) as node:
+            reader = PRepToolsReader(create_icon_service(node.url), NID)
+            reader.set_listeners([])
+            operations = {**_reader_ops(reader, addresses), **_writer_ops(node.url, KeyWallet.create())}
+
+            for name in SCENARIOS:
+                if only and name not in only:
+                    continue
+                # The first operation opens the connections
+                operations[name](0)
+                if name == "read-concurrent":
+                    for n in concurrency:
+                        results[f"{name} x{n}"] = measure(operations[name], ops, n)
+                else:
+                    results[name] = measure(operations[name], ops)
+    finally:
+        timings.disable()
+    return results
+
+
+def format_results(results: Dict[str, dict]) -> str:
+    width = max([len(name) for name in results] + [8])
+    lines = [
+        f"{'scenario':<{width}} {'ops/s':>9} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} "
+        f"{'cpu(ms)':>8} {'sign(ms)':>8} {'rpc(ms)':>8} {'rpc/op':>6}"
+    ]
+    for name, r in results.items():
+        lines.append(
+            f"{name:<{width}} {r['opsPerSec']:>9.1f} {r['p50'] * 1000:>8.2f} {r['p95'] * 1000:>8.2f} "
+            f"{r['p99'] * 1000:>8.2f} {r['cpu'] * 1000:>8.2f} {r['sign'] * 1000:>8.2f} {r['rpc'] * 1000:>8.2f} "
+            f"{r['requests']:>6.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Throughput and latency of preptools reader and writer operations")
+    parser.add_argument("--ops", type=int, default=DEFAULT_OPS, help="Operations in each scenario")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY),
+                        help="Threads of read-concurrent. Each one is run as its own scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mock node adds to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random seconds added on top of latency")
+    parser.add_argument("--only", nargs="+", choices=SCENARIOS, help="Run only these scenarios")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = run_scenarios(args.ops, args.concurrency, args.latency, args.jitter, args.only)
+    if args.json:
+        print(json.dumps(results, indent=4))
+    else:
+        print(format_results(results))
+        print("\ncpu: process CPU time, sign: time signing, rpc: time in JSON-RPC round trips, all per operation")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
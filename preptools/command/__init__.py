@@ -12,14 +12,88 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from . import (
-    bond_command,
-    common_command,
-    make_proposal_command,
-    prep_info_command,
-    prep_setting_command,
-    proposal_info_command,
-    proposal_setting_command,
-    register_proposal2_command,
-    tx_info_command,
+import importlib
+from typing import NamedTuple, Optional, Sequence
+
+
+class CommandInfo(NamedTuple):
+    name: str
+    help: str
+    # Module in this package whose init() adds the parser of the command
+    module: str
+
+
+# Only the names and help texts are known up front.
+# A module, and iconsdk with it, is imported only when one of its commands is selected.
+# Commands of a module are listed in the order its init() adds them.
+COMMANDS = (
+    CommandInfo("registerPRep", "Register P-Rep (WARNING: A registration fee of 2000 ICX is required)",
+                "prep_setting_command"),
+    CommandInfo("unregisterPRep",
+                "Unregister P-Rep (WARNING: Unregistering P-Rep does not return the registration fee)",
+                "prep_setting_command"),
+    CommandInfo("setPRep", "Update the P-Rep information", "prep_setting_command"),
+    CommandInfo("getPRep", "Get the P-Rep information", "prep_info_command"),
+    CommandInfo("getPReps", "Get status of all registered P-Rep candidates", "prep_info_command"),
+    CommandInfo("cancelProposal", "Cancel Proposal", "proposal_setting_command"),
+    CommandInfo("voteProposal", "Vote Proposal", "proposal_setting_command"),
+    CommandInfo("applyProposal", "Apply the approved network proposal indicated by id to the network",
+                "proposal_setting_command"),
+    CommandInfo("makeProposal", "Make contents of a given network proposal", "make_proposal_command"),
+    CommandInfo("registerProposal2",
+                "Register network proposals in a new format (WARNING: A submission fee of 100 ICX is required)",
+                "register_proposal2_command"),
+    CommandInfo("getProposal", "Query a proposal information with transaction hash", "proposal_info_command"),
+    CommandInfo("getProposals", "Query multiple network proposals.", "proposal_info_command"),
+    CommandInfo("setStake", "Set stake value", "bond_command"),
+    CommandInfo("getStake", "Get stake value", "bond_command"),
+    CommandInfo("setBond", "Set bond configuration", "bond_command"),
+    CommandInfo("getBond", "Get bond configuration", "bond_command"),
+    CommandInfo("setBonderList", "Set allowed bonder list of P-Rep", "bond_command"),
+    CommandInfo("getBonderList", "Get allowed bonder list of P-Rep", "bond_command"),
+    CommandInfo("txresult", "Get transaction result by hash", "tx_info_command"),
+    CommandInfo("txbyhash", "Get transaction by hash", "tx_info_command"),
+    CommandInfo("broadcast", "Send transactions signed with --sign-only option", "broadcast_command"),
+    CommandInfo("snapshot",
+                "Export P-Reps, their bonders and the stake and bond of accounts at a single block height",
+                "snapshot_command"),
+    CommandInfo("diff", "Show added, removed and changed P-Reps between two snapshots", "diff_command"),
+    CommandInfo("watch", "Run getPRep, getProposal or getProposals repeatedly and print only the changes",
+                "watch_command"),
+    CommandInfo("agent", "Run a signing agent which keeps an unlocked keystore in memory", "agent_command"),
+    CommandInfo("endpoints", "Probe the node urls and show them from the best one", "endpoint_command"),
+    CommandInfo("shell",
+                "Run commands interactively in a single process, keeping connections and unlocked keystores",
+                "shell_command"),
+    CommandInfo("keystore", "Create keystore file in the specified path.", "common_command"),
+    CommandInfo("genconf", "Create config file in the specified path.", "common_command"),
 )
+
+_COMMANDS_BY_NAME = {command.name: command for command in COMMANDS}
+
+
+def find_command(argv: Sequence[str]) -> Optional[CommandInfo]:
+    """Return the command selected by argv. The top level parser has no option with a value"""
+    for arg in argv:
+        if not arg.startswith("-"):
+            return _COMMANDS_BY_NAME.get(arg)
+    return None
+
+
+def init_commands(sub_parser, common_parent_parser, selected: Optional[str] = None):
+    """Add the parsers of the commands
+
+    The module of the selected command adds its real parsers.
+    Other commands get an empty parser with the help text only, so they are listed in the usage.
+
+    :param selected: module of the selected command. "*" imports every module
+    """
+    done = set()
+    for command in COMMANDS:
+        if command.module in done:
+            continue
+        if selected in (command.module, "*"):
+            importlib.import_module(f".{command.module}", __name__).init(sub_parser, common_parent_parser)
+            done.add(command.module)
+        else:
+            sub_parser.add_parser(command.name, help=command.help)
@@ -0,0 +1,143 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import getpass
+import os
+import time
+
+from iconsdk.wallet.wallet import KeyWallet
+
+from ..core.agent import DEFAULT_AGENT_SOCKET, DEFAULT_AGENT_TTL, AgentClient, SigningAgent, is_agent_running
+from ..core.prep import _get_common_args
+from ..exception import InvalidCommandException, InvalidKeyStoreException
+
+# Seconds to wait for a background agent to start listening
+_START_TIMEOUT = 5
+
+
+def init(sub_parser, common_parent_parser):
+    _init_for_agent(sub_parser, common_parent_parser)
+
+
+def _init_for_agent(sub_parser, common_parent_parser):
+    name = "agent"
+    desc = "Run a signing agent which keeps an unlocked keystore in memory"
+
+    parser = sub_parser.add_parser(
+        name,
+        parents=[common_parent_parser],
+        help=desc)
+
+    parser.add_argument(
+        "action",
+        choices=("start", "stop", "status", "lock"),
+        help="start: unlock the keystore and run the agent in background, "
+             "stop: stop the agent, status: list unlocked keys, lock: drop all keys"
+    )
+
+    parser.add_argument(
+        "--keystore", "-k",
+        type=str,
+        required=False,
+        help="keystore file path to unlock with start"
+    )
+
+    parser.add_argument(
+        "--password", "-p",
+        type=str,
+        required=False,
+        help="keystore password"
+    )
+
+    parser.add_argument(
+        "--ttl",
+        type=int,
+        default=DEFAULT_AGENT_TTL,
+        help=f"Seconds to keep the key unlocked. default({DEFAULT_AGENT_TTL})"
+    )
+
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=DEFAULT_AGENT_SOCKET,
+        help=f"Unix domain socket path of the agent. default({DEFAULT_AGENT_SOCKET})"
+    )
+
+    parser.add_argument(
+        "--foreground",
+        action="store_true",
+        help="Run the agent in foreground with start"
+    )
+
+    parser.set_defaults(func=_agent)
+
+
+def _agent(args):
+    client = AgentClient(args.socket)
+    if args.action == "status":
+        return {"socket": args.socket, "keys": client.list()}
+    if args.action == "lock":
+        client.lock()
+        return 0
+    if args.action == "stop":
+        client.stop()
+        return 0
+
+    return _start(args)
+
+
+def _start(args):
+    if is_agent_running(args.socket):
+        raise InvalidCommandException(f"An agent is already running on {args.socket}")
+
+    _, _, keystore_path = _get_common_args(args)
+    if keystore_path is None:
+        raise InvalidKeyStoreException("There's no keystore path in cmdline, configure.")
+
+    password = args.password
+    if password is None:
+        password = getpass.getpass("> Password: ")
+    agent = SigningAgent(args.socket, args.ttl)
+    agent.add(KeyWallet.load(keystore_path, password))
+
+    if args.foreground:
+        print(f"Agent is listening on {args.socket}")
+        agent.serve_forever()
+        return 0
+
+    if not hasattr(os, "fork"):
+        raise InvalidCommandException("Background agent is not supported on this platform, use --foreground")
+
+    pid = os.fork()
+    if pid == 0:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        try:
+            agent.serve_forever()
+        finally:
+            os._exit(0)
+
+    deadline = time.monotonic() + _START_TIMEOUT
+    while True:
+        try:
+            keys = AgentClient(args.socket).list()
+            break
+        except InvalidKeyStoreException:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+    return {"socket": args.socket, "pid": pid, "keys": keys}
@@ -14,8 +14,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from preptools.command.prep_setting_command import create_tx_parser
+import csv
+from typing import Dict, Iterable, List, Sequence
+
+from preptools.command.utils import create_tx_parser
 from preptools.core.prep import create_writer_by_args, create_reader_by_args
+from preptools.exception import InvalidArgumentException, InvalidFileReadException, JsonRpcException
+from preptools.utils.validation_checker import is_valid_address
+
+# Maximum number of bonds of an account
+MAX_BONDS = 100
+# Maximum number of row errors shown at once
+MAX_BOND_ERRORS = 20
 
 
 def init(sub_parser, common_parent_parser):
@@ -95,28 +105,136 @@ def _init_for_set_bond(sub_parser, common_parent_parser, tx_parent_parse):
     parser.add_argument(
         "bond",
         type=str,
-        nargs="+",
-        help="Bond configurations. PREP_ADDRESS,VALUE (Max: 100)"
+        nargs="*",
+        help=f"Bond configurations. PREP_ADDRESS,VALUE (Max: {MAX_BONDS})"
+    )
+
+    parser.add_argument(
+        "--from-csv",
+        type=str,
+        dest="from_csv",
+        metavar="PATH",
+        help="CSV file of PREP_ADDRESS,VALUE rows, added to the bond configurations of the arguments. "
+             "A header row is allowed"
     )
 
     parser.set_defaults(func=_set_bond)
 
 
 def _set_bond(args) -> str:
-    bonder_list = args.bond
-    bonds = []
-    for bond in bonder_list:
-        token = bond.split(",")
-        bonds.append({"address": token[0], "value": hex(int(token[1], 0))})
+    rows = [bond.split(",") for bond in args.bond]
+    if args.from_csv:
+        rows.extend(_read_csv(args.from_csv))
+    if not rows:
+        raise InvalidArgumentException("Bond configurations or --from-csv is required")
+    bonds = parse_bonds(rows)
 
     params = {
         "bonds": bonds
     }
 
     writer = create_writer_by_args(args)
+    if args.from_csv and not args.sign_only:
+        check_bonds_with_stake(create_reader_by_args(args), writer.address, bonds)
     return writer.set_bond(params)
 
 
+def _read_csv(path: str) -> List[List[str]]:
+    try:
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+    except (FileNotFoundError, IsADirectoryError, PermissionError, UnicodeDecodeError) as e:
+        raise InvalidFileReadException(f"Can't read file {path}. {e}")
+
+    if rows and [cell.strip().lower() for cell in rows[0]] in (["address", "value"], ["prep_address", "value"]):
+        rows = rows[1:]
+    return rows
+
+
+def parse_bonds(rows: Iterable[Sequence[str]]) -> List[dict]:
+    """Parse PREP_ADDRESS,VALUE rows into the bonds of setBond
+
+    Every row is checked before raising, so all the errors are reported at once.
+    Empty rows are skipped.
+    """
+    bonds = []
+    errors = []
+    lines = {}
+    for line, row in enumerate(rows, start=1):
+        row = [cell.strip() for cell in row]
+        if not any(row):
+            continue
+        if len(row) != 2:
+            errors.append(f"row {line}: should be PREP_ADDRESS,VALUE")
+            continue
+
+        address, value = row
+        if not (address.startswith("hx") and is_valid_address(address)):
+            errors.append(f"row {line}: invalid address {address}")
+        elif address in lines:
+            errors.append(f"row {line}: {address} is duplicated with row {lines[address]}")
+        else:
+            lines[address] = line
+
+        try:
+            amount = int(value, 0)
+            if amount < 0:
+                raise ValueError
+        except ValueError:
+            errors.append(f"row {line}: invalid value {value}")
+            continue
+        bonds.append({"address": address, "value": hex(amount)})
+
+    if len(lines) > MAX_BONDS:
+        errors.append(f"{len(lines)} bonds exceed the maximum {MAX_BONDS}")
+    if errors:
+        if len(errors) > MAX_BOND_ERRORS:
+            errors = errors[:MAX_BOND_ERRORS] + [f"... and {len(errors) - MAX_BOND_ERRORS} more"]
+        raise InvalidArgumentException("Invalid bonds\n" + "\n".join(errors))
+    return bonds
+
+
+def check_bonds_with_stake(reader, address: str, bonds: List[dict]):
+    """Check that bonds, unbonds and delegations of address after setBond of bonds fit its stake"""
+    responses = reader.batch_call([address], ("getStake", "getDelegation", "getBond"))[address]
+    for response in responses.values():
+        if "error" in response:
+            error = response["error"]
+            raise JsonRpcException(error.get("message"), error.get("code"))
+
+    stake = int(responses["getStake"]["result"]["stake"], 0)
+    delegated = int(responses["getDelegation"]["result"].get("totalDelegated", "0x0"), 0)
+    current = responses["getBond"]["result"]
+    unbonding = sum(get_unbonds_after_set_bond(current.get("bonds", []), current.get("unbonds", []), bonds).values())
+    bonded = sum(int(bond["value"], 0) for bond in bonds)
+    if bonded + unbonding + delegated > stake:
+        raise InvalidArgumentException(
+            f"Total bond({bonded}) + unbond({unbonding}) + delegation({delegated}) exceeds stake({stake})")
+
+
+def get_unbonds_after_set_bond(bonds: List[dict], unbonds: List[dict], new_bonds: List[dict]) -> Dict[str, int]:
+    """Return {P-Rep address: unbonding value} after setBond replaces bonds with new_bonds
+
+    A lowered or removed bond is added to the unbond of the P-Rep,
+    and a raised bond takes back the unbond of the P-Rep first.
+    """
+    def values(items: List[dict]) -> Dict[str, int]:
+        ret = {}
+        for item in items:
+            ret[item["address"]] = ret.get(item["address"], 0) + int(item["value"], 0)
+        return ret
+
+    old, new, pending = values(bonds), values(new_bonds), values(unbonds)
+    ret = {}
+    for prep in {**old, **new, **pending}:
+        change = new.get(prep, 0) - old.get(prep, 0)
+        unbond = pending.get(prep, 0)
+        unbond = unbond - min(unbond, change) if change > 0 else unbond - change
+        if unbond > 0:
+            ret[prep] = unbond
+    return ret
+
+
 def _init_for_get_bond(sub_parser, common_parent_parser):
     name = "getBond"
     desc = f"Get bond configuration"
@@ -0,0 +1,90 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import sys
+
+from ..core.broadcast import DEFAULT_BROADCAST_CONCURRENCY, broadcast, read_signed_transactions
+from ..core.prep import _get_common_args, create_icon_service
+from ..exception import InvalidFileReadException, InvalidFileWriteException, TransactionFailedException
+from ..utils import str_to_int
+
+
+def init(sub_parser, common_parent_parser):
+    _init_for_broadcast(sub_parser, common_parent_parser)
+
+
+def _init_for_broadcast(sub_parser, common_parent_parser):
+    name = "broadcast"
+    desc = "Send transactions signed with --sign-only option"
+
+    parser = sub_parser.add_parser(
+        name,
+        parents=[common_parent_parser],
+        help=desc)
+
+    parser.add_argument(
+        "path",
+        type=str,
+        help="JSONL file of signed transactions"
+    )
+
+    parser.add_argument(
+        "--output", "-o",
+        type=str,
+        required=False,
+        help="JSONL file to write {index, txHash} or {index, error} of each transaction. default(stdout)"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=str_to_int,
+        default=DEFAULT_BROADCAST_CONCURRENCY,
+        help=f"Number of transactions in flight. default({DEFAULT_BROADCAST_CONCURRENCY})"
+    )
+
+    parser.set_defaults(func=_broadcast)
+
+
+def _broadcast(args) -> dict:
+    url, _, _ = _get_common_args(args)
+    service = create_icon_service(url, pool_size=args.concurrency)
+
+    try:
+        out = open(args.output, "w") if args.output else sys.stdout
+    except (PermissionError, IsADirectoryError, FileNotFoundError) as e:
+        raise InvalidFileWriteException(f"Can't write file {args.output}. {e}")
+
+    sent, failed = 0, 0
+    try:
+        transactions = read_signed_transactions(args.path)
+        for index, tx_hash, error in broadcast(service.provider, transactions, args.concurrency):
+            if error is None:
+                sent += 1
+                line = {"index": index, "txHash": tx_hash}
+            else:
+                failed += 1
+                line = {"index": index, "error": error}
+            out.write(json.dumps(line))
+            out.write("\n")
+            out.flush()
+    except (FileNotFoundError, IsADirectoryError):
+        raise InvalidFileReadException(f"Cannot read signed transactions, file path : {args.path}")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if failed > 0:
+        raise TransactionFailedException({"sent": sent, "failed": failed})
+    return {"sent": sent, "failed": failed}
@@ -0,0 +1,115 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from ..core.diff import diff_preps, fetch_snapshot, load_snapshot, save_snapshot
+from ..core.prep import create_reader_by_args
+from ..exception import InvalidArgumentException
+from ..utils import str_to_int
+
+
+def init(sub_parser, common_parent_parser):
+    _init_for_diff(sub_parser, common_parent_parser)
+
+
+def _init_for_diff(sub_parser, common_parent_parser):
+    name = "diff"
+    desc = "Show added, removed and changed P-Reps between two snapshots"
+
+    parser = sub_parser.add_parser(
+        name,
+        parents=[common_parent_parser],
+        help=desc)
+
+    parser.add_argument(
+        "old",
+        type=str,
+        nargs="?",
+        help="Older snapshot file. getPReps response, JSON list or JSONL of P-Reps"
+    )
+
+    parser.add_argument(
+        "new",
+        type=str,
+        nargs="?",
+        help="Newer snapshot file. default(getPReps at --to-height)"
+    )
+
+    parser.add_argument(
+        "--from-height",
+        type=str_to_int,
+        required=False,
+        help="Block height of the older snapshot fetched from the network"
+    )
+
+    parser.add_argument(
+        "--to-height",
+        type=str_to_int,
+        required=False,
+        help="Block height of the newer snapshot fetched from the network. default(latest block)"
+    )
+
+    parser.add_argument(
+        "--state",
+        type=str,
+        required=False,
+        help="Incremental mode. Compare the latest P-Reps with the snapshot saved in this file, then replace it"
+    )
+
+    parser.add_argument(
+        "--fields",
+        type=str,
+        required=False,
+        help="Comma separated fields to compare like grade,bonded,delegated,power. default(all fields)"
+    )
+
+    parser.set_defaults(func=_diff)
+
+
+def _diff(args) -> dict:
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+    reader = None
+
+    def live(height):
+        nonlocal reader
+        if reader is None:
+            reader = create_reader_by_args(args)
+            if not args.verbose:
+                reader.set_listeners([])
+        return fetch_snapshot(reader, height)
+
+    if args.state:
+        if args.old or args.new or args.from_height is not None:
+            raise InvalidArgumentException("--state can't be used with snapshot files or --from-height")
+        old = load_snapshot(args.state) if os.path.exists(args.state) else None
+        new = live(args.to_height)
+        save_snapshot(args.state, new)
+        if old is None:
+            # The first run only saves the baseline
+            return {"fromBlockHeight": None, "toBlockHeight": new.block_height, "changes": []}
+    else:
+        if args.old:
+            old = load_snapshot(args.old)
+        elif args.from_height is not None:
+            old = live(args.from_height)
+        else:
+            raise InvalidArgumentException("Snapshot file, --from-height or --state is required")
+        new = load_snapshot(args.new) if args.new else live(args.to_height)
+
+    return {
+        "fromBlockHeight": old.block_height,
+        "toBlockHeight": new.block_height,
+        "changes": list(diff_preps(old.preps, new.preps, fields)),
+    }
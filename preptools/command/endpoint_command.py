@@ -0,0 +1,47 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ..core.prep import _get_common_args_with_urls
+from ..utils.endpoints import get_default_endpoint_manager
+
+
+def init(sub_parser, common_parent_parser):
+    _init_for_endpoints(sub_parser, common_parent_parser)
+
+
+def _init_for_endpoints(sub_parser, common_parent_parser):
+    name = "endpoints"
+    desc = "Probe the node urls and show them from the best one"
+
+    parser = sub_parser.add_parser(
+        name,
+        parents=[common_parent_parser],
+        help=desc)
+
+    parser.set_defaults(func=_endpoints)
+
+
+def _endpoints(args) -> dict:
+    urls, _, _ = _get_common_args_with_urls(args)
+    manager = get_default_endpoint_manager()
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        list(executor.map(manager.probe, urls))
+
+    ret = []
+    for url in manager.rank(urls, probe=False):
+        score = manager.score(url)
+        ret.append({"url": url, "latency": round(score["latency"], 4), "healthy": score["healthy"]})
+    return {"endpoints": ret}
@@ -12,18 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from . import (
-    text_command,
-    revision_command,
-    malicious_score_command,
-    prep_disqualification_command,
-    step_price_command,
-    step_costs_command,
-    reward_fund_command,
-    reward_funds_allocation_command,
-    network_score_designation_command,
-    network_score_update_command,
-    accumulated_validation_failure_slashing_rate_command,
-    missed_network_proposal_vote_slashing_rate_command,
-    call_method,
+# Modules of the proposal commands. Command.init_all() imports them, so they are loaded only for makeProposal
+PROPOSAL_MODULES = (
+    "text_command",
+    "revision_command",
+    "malicious_score_command",
+    "prep_disqualification_command",
+    "step_price_command",
+    "step_costs_command",
+    "reward_fund_command",
+    "reward_funds_allocation_command",
+    "network_score_designation_command",
+    "network_score_update_command",
+    "accumulated_validation_failure_slashing_rate_command",
+    "missed_network_proposal_vote_slashing_rate_command",
+    "call_method",
 )
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import importlib
 import json
 from abc import (
     ABCMeta,
@@ -23,6 +24,8 @@ from typing import Any, Dict, Optional
 
 from iconsdk.utils.typing.conversion import object_to_str
 
+from . import PROPOSAL_MODULES
+
 Value = Dict[str, Any]
 
 
@@ -52,7 +55,12 @@ class Command(metaclass=ABCMeta):
 
     @classmethod
     def init_all(cls, sub_parsers, parent_parser: ArgumentParser):
+        # Subclasses register themselves when their modules are imported
+        for module in PROPOSAL_MODULES:
+            importlib.import_module(f".{module}", __package__)
 
-        for subclass in cls._subclasses:
+        # Keep the order of PROPOSAL_MODULES even if some of them were imported earlier
+        order = {f"{__package__}.{module}": i for i, module in enumerate(PROPOSAL_MODULES)}
+        for subclass in sorted(cls._subclasses, key=lambda c: order.get(c.__module__, len(order))):
             cmd = subclass()
             cmd.init(sub_parsers, parent_parser)
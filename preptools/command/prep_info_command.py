@@ -14,7 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ..core.prep import create_reader_by_args
+import json
+
+from ..core.prep import PREPS_CHUNK_SIZE, create_reader_by_args
+from ..utils import str_to_int
 
 
 def init(sub_parser, common_parent_parser):
@@ -79,10 +82,26 @@ def _init_for_get_preps(sub_parser, common_parent_parser):
         help="Block height which ranking formed"
     )
 
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Fetch the P-Reps in chunks pinned to one block height and print each one as a JSON line"
+    )
+
+    parser.add_argument(
+        "--chunk-size",
+        type=str_to_int,
+        default=PREPS_CHUNK_SIZE,
+        help=f"Number of P-Reps in a single request with --stream option. default({PREPS_CHUNK_SIZE})"
+    )
+
     parser.set_defaults(func=_get_preps)
 
 
 def _get_preps(args):
+    if args.stream:
+        return _stream_preps(args)
+
     params = _check_get_preps_args(args)
 
     reader = create_reader_by_args(args)
@@ -91,6 +110,23 @@ def _get_preps(args):
     return response
 
 
+def _stream_preps(args) -> dict:
+    reader = create_reader_by_args(args)
+    if not args.verbose:
+        reader.set_listeners([])
+
+    count = 0
+    for prep in reader.iter_preps(
+            str_to_int(args.start_ranking) if args.start_ranking else 1,
+            str_to_int(args.end_ranking) if args.end_ranking else None,
+            str_to_int(args.block_height) if args.block_height else None,
+            args.chunk_size):
+        print(json.dumps(prep), flush=True)
+        count += 1
+
+    return {"count": count}
+
+
 def _check_get_preps_args(args):
     params = dict()
 
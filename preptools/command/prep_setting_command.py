@@ -13,12 +13,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import argparse
 import json
 
+from preptools.command.utils import create_tx_parser
 from preptools.core.prep import create_writer_by_args, confirm_callback_for_registerPRep
 from preptools.exception import InvalidFormatException, InvalidFileReadException
-from preptools.utils import str_to_int
 from preptools.utils.constants import fields_to_validate
 from preptools.utils.validation_checker import (
     validate_prep_data,
@@ -293,38 +292,3 @@ def _set_prep(args) -> str:
         _get_prep_dict_from_cli(params, set_prep=True)
 
     return writer.set_prep(params)
-
-
-def create_tx_parser() -> argparse.ArgumentParser:
-    """Common options for invoke commands
-
-    :return:
-    """
-
-    parent_parser = argparse.ArgumentParser(add_help=False)
-
-    parent_parser.add_argument(
-        "--password", "-p",
-        type=str,
-        required=False,
-        default=None,
-        help="keystore password"
-    )
-
-    parent_parser.add_argument(
-        "--keystore", "-k",
-        type=str,
-        required=False,
-        help="keystore file path"
-    )
-
-    parent_parser.add_argument(
-        "--step-limit", "-s",
-        type=str_to_int,
-        required=False,
-        default=None,
-        dest="step_limit",
-        help="step limit to set"
-    )
-
-    return parent_parser
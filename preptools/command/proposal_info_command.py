@@ -14,7 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from preptools.core.prep import create_reader_by_args
+from preptools.core.prep import DEFAULT_PAGE_CONCURRENCY, create_reader_by_args
 from preptools.exception import InvalidArgumentException
 from preptools.utils import str_to_int
 
@@ -93,10 +93,26 @@ def _init_for_get_proposals(sub_parser, common_parent_parser):
         help="Number of proposals to query. [1 ~ 10]",
     )
 
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Query every proposal, requesting several pages at once",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=str_to_int,
+        default=DEFAULT_PAGE_CONCURRENCY,
+        help=f"Number of page requests in flight with --all option. default({DEFAULT_PAGE_CONCURRENCY})",
+    )
+
     parser.set_defaults(func=_get_proposals)
 
 
 def _get_proposals(args) -> dict:
+    if args.all:
+        return _get_all_proposals(args)
+
     params = _check_get_proposal_list_args(args)
 
     reader = create_reader_by_args(args)
@@ -105,6 +121,17 @@ def _get_proposals(args) -> dict:
     return response
 
 
+def _get_all_proposals(args) -> dict:
+    if args.start is not None or args.size is not None:
+        raise InvalidArgumentException("--start and --size can't be used with --all")
+
+    reader = create_reader_by_args(args)
+    if not args.verbose:
+        reader.set_listeners([])
+
+    return {"proposals": list(reader.iter_proposals(args.type, args.status, args.concurrency))}
+
+
 def _check_get_proposal_list_args(args):
     params = {}
 
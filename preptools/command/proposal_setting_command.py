@@ -18,14 +18,17 @@ import json
 from typing import (
     Any,
     Dict,
+    Iterable,
+    List,
     Optional,
 )
 
 from iconsdk.utils.convert_type import convert_bytes_to_hex_str, convert_int_to_hex_str
 from iconsdk.utils.typing.conversion import object_to_str
 from .utils import create_tx_parser
-from ..core.prep import create_writer_by_args
-from ..exception import InvalidArgumentException
+from ..core.prep import DEFAULT_SEND_CONCURRENCY, create_bulk_writer_by_args, create_writer_by_args
+from ..core.receipt import check_tx_hash
+from ..exception import InvalidArgumentException, InvalidFileReadException, TransactionFailedException
 from ..utils.constants import proposal_param_by_type
 from ..utils.utils import print_proposal_value
 from ..utils.validation_checker import valid_proposal_param_by_type
@@ -236,21 +239,52 @@ def _init_for_vote_proposal(sub_parser, common_parent_parser, tx_parent_parser):
     parser.add_argument(
         "--id",
         type=str,
-        required=True,
+        required=False,
         help="hash of registerProposal TX"
     )
 
     parser.add_argument(
         "--vote",
         type=int,
-        required=True,
+        required=False,
         help="0 : disagree, 1 : agree"
     )
 
+    parser.add_argument(
+        "--votes",
+        type=str,
+        nargs="+",
+        metavar="ID,VOTE",
+        help="Vote on several proposals with a single confirmation. ID,VOTE pairs"
+    )
+
+    parser.add_argument(
+        "--votes-file",
+        type=str,
+        dest="votes_file",
+        metavar="PATH",
+        help="File of ID,VOTE lines to vote on with a single confirmation. Blank lines and lines from # are skipped"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_SEND_CONCURRENCY,
+        help=f"Number of votes estimated, signed and sent at once with --votes or --votes-file "
+             f"(default: {DEFAULT_SEND_CONCURRENCY})"
+    )
+
     parser.set_defaults(func=_vote_proposal)
 
 
 def _vote_proposal(args) -> dict:
+    if args.votes or args.votes_file:
+        if args.id is not None or args.vote is not None:
+            raise InvalidArgumentException("--id and --vote can't be used with --votes or --votes-file")
+        return _vote_proposals(args)
+    if args.id is None or args.vote is None:
+        raise InvalidArgumentException("--id and --vote, or --votes or --votes-file are required")
+
     params = {
         "id": args.id,
         "vote": args.vote
@@ -262,6 +296,62 @@ def _vote_proposal(args) -> dict:
     return response
 
 
+def _vote_proposals(args) -> Optional[dict]:
+    if args.concurrency < 1:
+        raise InvalidArgumentException("concurrency should be positive")
+
+    lines = list(args.votes or [])
+    if args.votes_file:
+        try:
+            with open(args.votes_file) as f:
+                lines.extend(f)
+        except (FileNotFoundError, IsADirectoryError, PermissionError) as e:
+            raise InvalidFileReadException(f"Can't read file {args.votes_file}. {e}")
+    votes = parse_votes(lines)
+
+    writer = create_bulk_writer_by_args(args, "voteProposal", votes)
+    if writer is None:
+        return None
+
+    transactions = [dict(vote) for vote in votes]
+    for index, tx_hash, error in writer.vote_proposals(votes, args.concurrency):
+        if tx_hash is None:
+            transactions[index]["error"] = error
+        else:
+            transactions[index]["txHash"] = tx_hash
+
+    if any("error" in tx for tx in transactions):
+        raise TransactionFailedException({"transactions": transactions})
+    return {"transactions": transactions}
+
+
+def parse_votes(lines: Iterable[str]) -> List[dict]:
+    """Parse ID,VOTE lines into params of voteProposal
+
+    Blank lines and lines from # are skipped.
+    """
+    votes = []
+    ids = set()
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        token = [t.strip() for t in line.split(",")]
+        if len(token) != 2 or token[1] not in ("0", "1"):
+            raise InvalidArgumentException(f"Vote should be ID,VOTE and VOTE should be 0 or 1: {line}")
+        check_tx_hash(token[0])
+        if token[0] in ids:
+            raise InvalidArgumentException(f"Duplicated proposal id: {token[0]}")
+
+        ids.add(token[0])
+        votes.append({"id": token[0], "vote": int(token[1])})
+
+    if not votes:
+        raise InvalidArgumentException("There's no vote")
+    return votes
+
+
 def _init_for_apply_proposal(sub_parser, common_parent_parser, tx_parent_parser):
     name = "applyProposal"
     desc = f"Apply the approved network proposal indicated by id to the network"
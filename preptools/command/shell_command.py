@@ -0,0 +1,57 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Iterator
+
+PROMPT = "preptools> "
+
+
+def init(sub_parser, common_parent_parser):
+    _init_for_shell(sub_parser, common_parent_parser)
+
+
+def _init_for_shell(sub_parser, common_parent_parser):
+    name = "shell"
+    desc = "Run commands interactively in a single process, keeping connections and unlocked keystores"
+
+    parser = sub_parser.add_parser(
+        name,
+        help=desc)
+
+    parser.set_defaults(func=shell)
+
+
+def shell(args) -> str:
+    # preptools_cli loads this module, so it is imported only when the shell runs
+    from ..preptools_cli import run_commands
+
+    try:
+        # Line editing and history, if available
+        import readline
+    except ImportError:
+        pass
+
+    run_commands(_read_lines())
+    return "exit"
+
+
+def _read_lines() -> Iterator[str]:
+    while True:
+        try:
+            yield input(PROMPT)
+        except KeyboardInterrupt:
+            print()
+        except EOFError:
+            print()
+            return
@@ -0,0 +1,154 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from typing import List
+
+from ..core.prep import create_reader_by_args
+from ..core.snapshot import (
+    ACCOUNT,
+    DEFAULT_SNAPSHOT_CONCURRENCY,
+    PREP,
+    SNAPSHOT_FORMATS,
+    iter_snapshot,
+    open_snapshot_writer,
+)
+from ..exception import InvalidArgumentException, InvalidFileReadException, InvalidFileWriteException
+from ..utils import str_to_int
+from ..utils.validation_checker import is_valid_address
+
+
+def init(sub_parser, common_parent_parser):
+    _init_for_snapshot(sub_parser, common_parent_parser)
+
+
+def _init_for_snapshot(sub_parser, common_parent_parser):
+    name = "snapshot"
+    desc = "Export P-Reps, their bonders and the stake and bond of accounts at a single block height"
+
+    parser = sub_parser.add_parser(
+        name,
+        parents=[common_parent_parser],
+        help=desc)
+
+    parser.add_argument(
+        "--output-dir", "-o",
+        type=str,
+        default=".",
+        help="Directory where preps.<format> and accounts.<format> are written. default(.)"
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=SNAPSHOT_FORMATS,
+        default="jsonl",
+        help="Output format. parquet requires pyarrow. default(jsonl)"
+    )
+
+    parser.add_argument(
+        "--block-height",
+        type=str_to_int,
+        required=False,
+        help="Block height of the snapshot. default(latest block)"
+    )
+
+    parser.add_argument(
+        "--addresses",
+        type=str,
+        required=False,
+        help="Comma separated addresses whose stake and bond are exported"
+    )
+
+    parser.add_argument(
+        "--addresses-file",
+        type=str,
+        required=False,
+        help="File with one address per line whose stake and bond are exported"
+    )
+
+    parser.add_argument(
+        "--no-bonders",
+        action="store_true",
+        help="Don't query getBonderList of each P-Rep"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=str_to_int,
+        default=DEFAULT_SNAPSHOT_CONCURRENCY,
+        help=f"Number of batch requests in flight. default({DEFAULT_SNAPSHOT_CONCURRENCY})"
+    )
+
+    parser.set_defaults(func=_snapshot)
+
+
+def _snapshot(args) -> dict:
+    if args.concurrency < 1:
+        raise InvalidArgumentException("concurrency should be positive")
+
+    addresses = _get_addresses(args)
+    try:
+        os.makedirs(args.output_dir, exist_ok=True)
+    except OSError as e:
+        raise InvalidFileWriteException(f"Can't create directory {args.output_dir}. {e}")
+
+    reader = create_reader_by_args(args)
+    if not args.verbose:
+        reader.set_listeners([])
+
+    paths = {
+        PREP: os.path.join(args.output_dir, f"preps.{args.format}"),
+        ACCOUNT: os.path.join(args.output_dir, f"accounts.{args.format}"),
+    }
+    writers = {}
+    counts = {PREP: 0, ACCOUNT: 0}
+    height = None
+    try:
+        for kind, record in iter_snapshot(
+                reader, args.block_height, addresses, not args.no_bonders, args.concurrency):
+            if kind not in writers:
+                writers[kind] = open_snapshot_writer(paths[kind], args.format, kind)
+            writers[kind].write(record)
+            counts[kind] += 1
+            height = record["blockHeight"]
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return {
+        "blockHeight": height,
+        "preps": counts[PREP],
+        "accounts": counts[ACCOUNT],
+        "files": [paths[kind] for kind in writers],
+    }
+
+
+def _get_addresses(args) -> List[str]:
+    addresses = []
+    if args.addresses:
+        addresses.extend(a.strip() for a in args.addresses.split(",") if a.strip())
+
+    if args.addresses_file:
+        try:
+            with open(args.addresses_file) as f:
+                addresses.extend(line.strip() for line in f if line.strip())
+        except (FileNotFoundError, IsADirectoryError, PermissionError):
+            raise InvalidFileReadException(f"Cannot read addresses, file path : {args.addresses_file}")
+
+    for address in addresses:
+        if not is_valid_address(address):
+            raise InvalidArgumentException(f"Invalid address: {address}")
+
+    return list(dict.fromkeys(addresses))
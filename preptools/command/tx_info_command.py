@@ -14,7 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+
 from ..core.prep import create_reader_by_args
+from ..core.receipt import DEFAULT_WAIT_TIMEOUT
+from ..core.step_model import get_default_history
 
 
 def init(sub_parser, common_parent_parser):
@@ -34,7 +38,21 @@ def _init_for_tx_result(sub_parser, common_parent_parser):
     parser.add_argument(
         "tx_hash",
         type=str,
-        help="transaction hash to get transaction result"
+        nargs="+",
+        help="transaction hashes to get transaction result"
+    )
+
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Wait until the transactions are finalized, printing each result as a JSON line as soon as it is ready"
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_WAIT_TIMEOUT,
+        help=f"Seconds to wait with --wait option. default({DEFAULT_WAIT_TIMEOUT})"
     )
 
     parser.set_defaults(func=_tx_result)
@@ -43,9 +61,28 @@ def _init_for_tx_result(sub_parser, common_parent_parser):
 def _tx_result(args):
 
     reader = create_reader_by_args(args)
-    response = reader.get_tx_result(args.tx_hash)
-
-    return response
+    if not args.wait and len(args.tx_hash) == 1:
+        tx_hash = args.tx_hash[0]
+        response = reader.get_tx_result(tx_hash)
+        if isinstance(response, dict) and "stepUsed" in response:
+            get_default_history().record_result(tx_hash, response["stepUsed"])
+        return response
+
+    timeout = args.timeout if args.wait else 0
+    history = get_default_history()
+    summary = {"success": 0, "failure": 0, "error": 0}
+    for tx_hash, result, error in reader.wait_tx_results(args.tx_hash, timeout):
+        if result is None:
+            summary["error"] += 1
+            line = {"txHash": tx_hash, "error": error}
+        else:
+            summary["success" if result.get("status") == "0x1" else "failure"] += 1
+            if "stepUsed" in result:
+                history.record_result(tx_hash, int(result["stepUsed"], 16))
+            line = {"txHash": tx_hash, "result": result}
+        print(json.dumps(line), flush=True)
+
+    return summary
 
 
 def _init_for_tx_by_hash(sub_parser, common_parent_parser):
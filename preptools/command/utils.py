@@ -59,4 +59,31 @@ def create_tx_parser() -> argparse.ArgumentParser:
              "Set step-limit value to estimated Step + this value(step-margin)"
     )
 
+    parent_parser.add_argument(
+        "--step-predict",
+        action="store_true",
+        dest="step_predict",
+        help="Predict step limit from the history of previous transactions instead of estimating it.\n"
+             "Falls back to estimation until enough history is collected"
+    )
+
+    parent_parser.add_argument(
+        "--sign-only",
+        type=str,
+        required=False,
+        default=None,
+        dest="sign_only",
+        metavar="PATH",
+        help="Sign the transaction without network access and append it to PATH as a line of JSON.\n"
+             "Step limit must be given. Use 'broadcast' command to send them.\n"
+             "The timestamp is set when signing and nodes reject transactions older than about 5 minutes"
+    )
+
+    parent_parser.add_argument(
+        "--no-agent",
+        action="store_true",
+        dest="no_agent",
+        help="Load the keystore even if a running signing agent holds its key"
+    )
+
     return parent_parser
@@ -0,0 +1,124 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from .proposal_info_command import _check_get_proposal_list_args
+from ..core.prep import create_reader_by_args
+from ..core.watch import DEFAULT_WATCH_INTERVAL, watch
+from ..exception import InvalidArgumentException
+from ..utils import str_to_int
+from ..utils.validation_checker import is_valid_address
+
+WATCH_METHODS = ("getPRep", "getProposal", "getProposals")
+
+
+def init(sub_parser, common_parent_parser):
+    _init_for_watch(sub_parser, common_parent_parser)
+
+
+def _init_for_watch(sub_parser, common_parent_parser):
+    name = "watch"
+    desc = "Run getPRep, getProposal or getProposals repeatedly and print only the changes"
+
+    parser = sub_parser.add_parser(
+        name,
+        parents=[common_parent_parser],
+        help=desc)
+
+    parser.add_argument(
+        "method",
+        type=str,
+        choices=WATCH_METHODS,
+        help="Query to watch"
+    )
+
+    parser.add_argument(
+        "target",
+        type=str,
+        nargs="?",
+        help="P-Rep address for getPRep, proposal id for getProposal"
+    )
+
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help=f"Seconds between queries. default({DEFAULT_WATCH_INTERVAL})"
+    )
+
+    parser.add_argument(
+        "--on-block",
+        action="store_true",
+        help="Query once for each new block instead of every interval"
+    )
+
+    parser.add_argument(
+        "--count",
+        type=str_to_int,
+        required=False,
+        help="Stop after this number of queries. default(until interrupted)"
+    )
+
+    parser.add_argument(
+        "--type",
+        type=str_to_int,
+        required=False,
+        help="Type of network proposal to filter with getProposals"
+    )
+
+    parser.add_argument(
+        "--status",
+        type=str_to_int,
+        choices=range(6),
+        required=False,
+        help="Status of network proposal to filter with getProposals"
+    )
+
+    parser.set_defaults(func=_watch)
+
+
+def _watch(args) -> dict:
+    if args.interval <= 0:
+        raise InvalidArgumentException("interval should be positive")
+
+    reader = create_reader_by_args(args)
+    if not args.verbose:
+        reader.set_listeners([])
+
+    if args.method == "getPRep":
+        if not is_valid_address(args.target):
+            raise InvalidArgumentException(f"Invalid address: {args.target}")
+        fetch = lambda: reader.get_prep(args.target)
+    elif args.method == "getProposal":
+        if not args.target:
+            raise InvalidArgumentException("Proposal id is required")
+        fetch = lambda: reader.get_proposal(args.target)
+    else:
+        params = _check_get_proposal_list_args(args)
+        fetch = lambda: reader.get_proposals(params)
+
+    events = 0
+    try:
+        for event in watch(
+                fetch,
+                args.interval,
+                reader.get_last_block_height if args.on_block else None,
+                args.count):
+            print(json.dumps(event), flush=True)
+            events += 1
+    except KeyboardInterrupt:
+        pass
+
+    return {"events": events}
@@ -0,0 +1,217 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from iconsdk.wallet.wallet import Wallet
+
+from ..exception import InvalidKeyStoreException, PRepToolsBaseException
+from ..utils.constants import PREPTOOLS_HOME
+
+DEFAULT_AGENT_SOCKET = os.environ.get("PREPTOOLS_AGENT_SOCK", os.path.join(PREPTOOLS_HOME, "agent.sock"))
+DEFAULT_AGENT_TTL = 3600
+AGENT_TIMEOUT = 5
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            request = {}
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    request = {}
+                    raise ValueError("Request should be a JSON object")
+                response = {"result": self.server.agent.dispatch(request.get("method"), request.get("params") or {})}
+            except (PRepToolsBaseException, ValueError, KeyError, TypeError) as e:
+                # Bad requests and unknown or expired wallets are answered, and the connection is kept
+                response = {"error": {"message": str(e)}}
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+            if request.get("method") == "stop":
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class _AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class SigningAgent:
+    """Keeps unlocked wallets in memory and signs data for clients on a Unix domain socket
+
+    Each wallet is dropped after ttl seconds. The socket is only accessible by its owner.
+    """
+
+    def __init__(self, path: str = DEFAULT_AGENT_SOCKET, ttl: float = DEFAULT_AGENT_TTL):
+        self._path = path
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        # address -> (wallet, expires_at)
+        self._wallets: Dict[str, Tuple[Wallet, float]] = {}
+        self._server: Optional[_AgentServer] = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def add(self, wallet: Wallet, ttl: Optional[float] = None):
+        expires_at = time.time() + (self._ttl if ttl is None else ttl)
+        with self._lock:
+            self._wallets[wallet.get_address()] = (wallet, expires_at)
+
+    def _get_wallet(self, address: str) -> Wallet:
+        with self._lock:
+            self._expire()
+            if address not in self._wallets:
+                raise InvalidKeyStoreException(f"No unlocked key for {address}")
+            return self._wallets[address][0]
+
+    def _expire(self):
+        now = time.time()
+        for address in [k for k, v in self._wallets.items() if v[1] < now]:
+            del self._wallets[address]
+
+    def dispatch(self, method: str, params: dict):
+        if method == "list":
+            with self._lock:
+                self._expire()
+                now = time.time()
+                return [{"address": k, "expiresIn": int(v[1] - now)} for k, v in self._wallets.items()]
+        if method == "sign":
+            wallet = self._get_wallet(params["address"])
+            return wallet.sign(bytes.fromhex(params["data"])).hex()
+        if method in ("lock", "stop"):
+            with self._lock:
+                self._wallets.clear()
+            return True
+        raise InvalidKeyStoreException(f"Unknown agent method: {method}")
+
+    def serve_forever(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), mode=0o700, exist_ok=True)
+        if os.path.exists(self._path):
+            if is_agent_running(self._path):
+                raise InvalidKeyStoreException(f"An agent is already running on {self._path}")
+            os.unlink(self._path)
+
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _AgentServer(self._path, _AgentHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.agent = self
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            with self._lock:
+                self._wallets.clear()
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class AgentClient:
+    def __init__(self, path: str = DEFAULT_AGENT_SOCKET, timeout: float = AGENT_TIMEOUT):
+        self._path = path
+        self._timeout = timeout
+
+    def request(self, method: str, params: Optional[dict] = None):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self._timeout)
+                sock.connect(self._path)
+                sock.sendall(json.dumps({"method": method, "params": params}).encode() + b"\n")
+                with sock.makefile("rb") as f:
+                    response = json.loads(f.readline())
+        except (OSError, ValueError) as e:
+            raise InvalidKeyStoreException(f"Cannot connect to the agent on {self._path}. {e}")
+
+        if "error" in response:
+            raise InvalidKeyStoreException(response["error"]["message"])
+        return response["result"]
+
+    def list(self) -> List[dict]:
+        return self.request("list")
+
+    def lock(self):
+        self.request("lock")
+
+    def stop(self):
+        self.request("stop")
+
+
+class AgentWallet(Wallet):
+    """Wallet which asks the agent to sign, so the private key never leaves the agent"""
+
+    def __init__(self, address: str, client: AgentClient):
+        self._address = address
+        self._client = client
+
+    def get_address(self) -> str:
+        return self._address
+
+    def sign(self, data: bytes) -> bytes:
+        return bytes.fromhex(self._client.request("sign", {"address": self._address, "data": data.hex()}))
+
+
+def is_agent_running(path: str) -> bool:
+    try:
+        AgentClient(path).list()
+        return True
+    except InvalidKeyStoreException:
+        return False
+
+
+def read_keystore_address(keystore_path: str) -> Optional[str]:
+    """Read the address of a keystore file without decrypting it"""
+    try:
+        with open(keystore_path) as f:
+            return json.load(f).get("address")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def get_agent_wallet(keystore_path: str, path: str = DEFAULT_AGENT_SOCKET) -> Optional[AgentWallet]:
+    """Return a wallet backed by the agent if it is running and holds the key of keystore_path"""
+    if not os.path.exists(path):
+        return None
+
+    address = read_keystore_address(keystore_path)
+    if address is None:
+        return None
+
+    client = AgentClient(path)
+    try:
+        keys = client.list()
+    except InvalidKeyStoreException:
+        return None
+
+    if any(key["address"] == address for key in keys):
+        return AgentWallet(address, client)
+    return None
@@ -0,0 +1,192 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import time
+from typing import Optional
+
+from iconsdk.builder.call_builder import CallBuilder
+from iconsdk.utils.converter import convert
+from iconsdk.utils.templates import TRANSACTION, TRANSACTION_RESULT
+
+try:
+    import aiohttp
+except ImportError as e:
+    raise ImportError("AsyncPRepToolsReader requires aiohttp. Install it with `pip install preptools[async]`") from e
+
+from .prep import PRepToolsListener, _call_to_params
+from .receipt import check_tx_hash
+from .transport import DEFAULT_TIMEOUT, RpcTiming, notify_response, rpc_url
+from ..exception import JsonRpcException
+from ..utils.constants import EOA_ADDRESS, GOVERNANCE_ADDRESS, ZERO_ADDRESS
+
+DEFAULT_CONCURRENCY = 32
+
+
+class AsyncPRepToolsReader(PRepToolsListener):
+    """asyncio version of PRepToolsReader
+
+    Every request goes through one aiohttp session, and at most `concurrency` requests are in flight at once.
+    So thousands of reads can be awaited together with asyncio.gather.
+
+    async with AsyncPRepToolsReader(url, nid) as reader:
+        preps = await asyncio.gather(*(reader.get_prep(address) for address in addresses))
+    """
+
+    def __init__(
+            self,
+            url: str,
+            nid: int,
+            address: str = EOA_ADDRESS,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            timeout: float = DEFAULT_TIMEOUT):
+        super().__init__()
+        self._listeners = []
+
+        self._url = url
+        self._nid = nid
+        self._from = address
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._id = 0
+
+    async def __aenter__(self) -> 'AsyncPRepToolsReader':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            session = self._session
+            self._session = None
+            await session.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Session and semaphore must be created inside the running event loop
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._concurrency),
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+                headers={"Content-Type": "application/json"},
+            )
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        return self._session
+
+    async def _request(self, method: str, params: dict = None, full_response: bool = False):
+        session = self._get_session()
+        self._id += 1
+        rpc_dict = {
+            'jsonrpc': '2.0',
+            'method': method,
+            'id': self._id,
+        }
+        if params:
+            rpc_dict['params'] = params
+
+        request_url = rpc_url(self._url, method.split('_')[0])
+        data = json.dumps(rpc_dict)
+        async with self._semaphore:
+            started = time.monotonic()
+            body = b""
+            error = None
+            try:
+                async with session.post(request_url, data=data) as response:
+                    body = await response.read()
+                    if response.status >= 400:
+                        error = f"HTTP {response.status}"
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                notify_response(RpcTiming(
+                    method, request_url, 1, len(data), len(body), time.monotonic() - started, error))
+
+        try:
+            content = json.loads(body)
+        except ValueError:
+            raise JsonRpcException(body.decode(), response.status)
+
+        if full_response:
+            return content
+        if "error" in content:
+            error = content["error"]
+            raise JsonRpcException(error.get("message"), error.get("code"))
+        return content["result"]
+
+    async def _call(self, method, params=None, to: str = ZERO_ADDRESS) -> dict:
+        call = CallBuilder() \
+            .from_(self._from) \
+            .to(to) \
+            .method(method) \
+            .params(params) \
+            .build()
+
+        for listener in self.listeners:
+            listener(call.to_dict())
+
+        return await self._request("icx_call", _call_to_params(call), True)
+
+    async def _tx_result(self, tx_hash: str) -> dict:
+        check_tx_hash(tx_hash)
+        result = await self._request("icx_getTransactionResult", {"txHash": tx_hash})
+        return convert(result, TRANSACTION_RESULT)
+
+    async def _tx_by_hash(self, tx_hash: str) -> dict:
+        check_tx_hash(tx_hash)
+        result = await self._request("icx_getTransactionByHash", {"txHash": tx_hash})
+        return convert(result, TRANSACTION)
+
+    async def get_prep(self, address: str) -> dict:
+        params = {"address": address}
+        return await self._call("getPRep", params)
+
+    async def get_bonder_list(self, address: str) -> dict:
+        params = {"address": address}
+        return await self._call("getBonderList", params)
+
+    async def get_preps(self, params) -> dict:
+        return await self._call("getPReps", params)
+
+    async def get_proposal(self, _id: str) -> dict:
+        params = {"id": _id}
+        return await self._call("getProposal", params, to=GOVERNANCE_ADDRESS)
+
+    async def get_proposals(self, params) -> dict:
+        return await self._call("getProposals", params, to=GOVERNANCE_ADDRESS)
+
+    async def get_tx_result(self, tx_hash: str) -> dict:
+        return await self._tx_result(tx_hash)
+
+    async def get_tx_by_hash(self, tx_hash: str) -> dict:
+        return await self._tx_by_hash(tx_hash)
+
+    async def get_stake(self, address: str) -> dict:
+        params = {"address": address}
+        return await self._call("getStake", params)
+
+    async def get_bond(self, address: str) -> dict:
+        params = {"address": address}
+        return await self._call("getBond", params)
+
+
+def create_async_reader(
+        url: str,
+        nid: int,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT) -> AsyncPRepToolsReader:
+    return AsyncPRepToolsReader(url, nid, concurrency=concurrency, timeout=timeout)
@@ -0,0 +1,75 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Optional, Tuple
+
+from ..exception import InvalidFileReadException
+
+DEFAULT_BROADCAST_CONCURRENCY = 8
+
+# index of the transaction in the input, tx hash, error message
+BroadcastResult = Tuple[int, Optional[str], Optional[str]]
+
+
+def read_signed_transactions(path: str) -> Iterator[dict]:
+    """Read signed transactions from a JSONL file lazily, skipping blank lines"""
+    with open(path) as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                signed_tx = json.loads(line)
+            except ValueError as e:
+                raise InvalidFileReadException(f"Invalid signed transaction at line {number} of {path}. {e}")
+            if not isinstance(signed_tx, dict):
+                raise InvalidFileReadException(f"Invalid signed transaction at line {number} of {path}")
+            yield signed_tx
+
+
+def _send(provider, index: int, signed_tx: dict) -> BroadcastResult:
+    try:
+        return index, provider.make_request("icx_sendTransaction", signed_tx), None
+    except Exception as e:
+        return index, None, f"{type(e).__name__}: {e}"
+
+
+def broadcast(
+        provider,
+        transactions: Iterable[dict],
+        concurrency: int = DEFAULT_BROADCAST_CONCURRENCY) -> Iterator[BroadcastResult]:
+    """Send pre-signed transactions with up to `concurrency` requests in flight
+
+    transactions is consumed lazily, so large files are streamed.
+    Results are yielded as soon as each request completes, not in input order.
+
+    :param provider: provider of the node
+    :param transactions: params of icx_sendTransaction which already have signature
+    :param concurrency: number of requests in flight
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = set()
+        for index, signed_tx in enumerate(transactions):
+            pending.add(executor.submit(_send, provider, index, signed_tx))
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
@@ -0,0 +1,170 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from hashlib import sha3_256
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from iconsdk.builder.call_builder import CallBuilder
+
+from ..utils.constants import PREPTOOLS_HOME, SYSTEM_SCORE_ADDRESS
+
+STEP_PRICE = "stepPrice"
+STEP_COSTS = "stepCosts"
+REVISION = "revision"
+
+DEFAULT_TTL = 600
+DEFAULT_CACHE_PATH = os.path.join(PREPTOOLS_HOME, "chain_constants.json")
+
+
+class ChainConstantsCache:
+    """Cache for chain values which only change through network proposals
+
+    Entries are kept per node url and expire after ttl seconds.
+    If path is given, entries are loaded from and saved to that file so they outlive the process.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, path: Optional[str] = None):
+        self._ttl = ttl
+        self._path = path
+        self._lock = threading.Lock()
+        # url -> key -> [expires_at, value]
+        self._entries: Dict[str, Dict[str, list]] = {}
+        self._load()
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def get(self, url: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(url, {}).get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[url][key]
+                return None
+            return entry[1]
+
+    def set(self, url: str, key: str, value: Any):
+        with self._lock:
+            self._entries.setdefault(url, {})[key] = [time.time() + self._ttl, value]
+            self._save()
+
+    def get_or_fetch(self, url: str, key: str, fetch: Callable[[], Any]) -> Any:
+        value = self.get(url, key)
+        if value is None:
+            value = fetch()
+            self.set(url, key, value)
+        return value
+
+    def invalidate(self, url: Optional[str] = None, key: Optional[str] = None):
+        """Drop cached entries
+
+        :param url: node url. None means every url
+        :param key: stepPrice, stepCosts, revision, ... None means every key
+        """
+        with self._lock:
+            urls = list(self._entries) if url is None else [url]
+            for u in urls:
+                entries = self._entries.get(u)
+                if entries is None:
+                    continue
+                if key is None:
+                    entries.clear()
+                else:
+                    entries.pop(key, None)
+                if len(entries) == 0:
+                    del self._entries[u]
+            self._save()
+
+    def _load(self):
+        if self._path is None:
+            return
+
+        try:
+            with open(self._path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        for url, values in entries.items():
+            for key, entry in values.items():
+                if entry[0] >= now:
+                    self._entries.setdefault(url, {})[key] = entry
+
+    def _save(self):
+        if self._path is None:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = f"{self._path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            # Persisting is best effort, the in-memory cache keeps working
+            pass
+
+
+# persist -> cache shared in this process
+_default_caches: Dict[bool, ChainConstantsCache] = {}
+
+
+def get_default_cache(persist: bool = True) -> ChainConstantsCache:
+    """Return the cache shared in this process
+
+    :param persist: load and save the entries at DEFAULT_CACHE_PATH. Otherwise they are kept in memory only
+    """
+    cache = _default_caches.get(persist)
+    if cache is None:
+        cache = ChainConstantsCache(path=DEFAULT_CACHE_PATH if persist else None)
+        _default_caches[persist] = cache
+    return cache
+
+
+def _call_chain(service, method: str) -> Any:
+    call = CallBuilder() \
+        .to(SYSTEM_SCORE_ADDRESS) \
+        .method(method) \
+        .build()
+    return service.call(call)
+
+
+def get_step_price(cache: ChainConstantsCache, url: str, service) -> int:
+    value = cache.get_or_fetch(url, STEP_PRICE, lambda: _call_chain(service, "getStepPrice"))
+    return int(value, 0)
+
+
+def get_step_costs(cache: ChainConstantsCache, url: str, service) -> Dict[str, int]:
+    value = cache.get_or_fetch(url, STEP_COSTS, lambda: _call_chain(service, "getStepCosts"))
+    return {k: int(v, 0) for k, v in value.items()}
+
+
+def get_revision(cache: ChainConstantsCache, url: str, service) -> int:
+    value = cache.get_or_fetch(url, REVISION, lambda: _call_chain(service, "getRevision"))
+    return int(value, 0)
+
+
+def get_step_version(cache: ChainConstantsCache, url: str, service) -> str:
+    """Fingerprint of the step costs and the revision, which decide the step of a transaction"""
+    step_costs = get_step_costs(cache, url, service)
+    revision = get_revision(cache, url, service)
+    data = json.dumps([revision, step_costs], sort_keys=True)
+    return sha3_256(data.encode()).hexdigest()[:16]
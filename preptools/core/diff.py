@@ -0,0 +1,154 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from .snapshot import get_snapshot_height
+from ..exception import InvalidFileReadException, InvalidFileWriteException, InvalidFormatException
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# Fields which differ between snapshots without any change of the P-Rep
+IGNORED_FIELDS = frozenset(("blockHeight",))
+
+
+class PRepSnapshot(NamedTuple):
+    block_height: Optional[str]
+    preps: List[dict]
+
+
+def diff_fields(old: dict, new: dict, fields: Optional[Sequence[str]] = None) -> Dict[str, dict]:
+    """Return {field: {"old", "new"}} of the fields which differ
+
+    :param fields: fields to compare. None means all fields
+    """
+    keys = fields if fields is not None else dict.fromkeys([*old, *new])
+    return {
+        key: {"old": old.get(key), "new": new.get(key)}
+        for key in keys
+        if key not in IGNORED_FIELDS and old.get(key) != new.get(key)
+    }
+
+
+def diff_records(
+        old: Iterable[dict],
+        new: Iterable[dict],
+        key: str,
+        record_key: str,
+        fields: Optional[Sequence[str]] = None) -> Iterator[dict]:
+    """Yield the differences between two lists of records, matched by the value of key
+
+    :param record_key: key of the whole record in added and removed entries
+    :return: {"type": "added"|"removed", key, record_key} or {"type": "changed", key, "changes"}
+        where changes is {field: {"old", "new"}}
+    """
+    old_index = {record[key]: record for record in old}
+    new_index = {record[key]: record for record in new}
+
+    for value, record in new_index.items():
+        old_record = old_index.get(value)
+        if old_record is None:
+            yield {"type": ADDED, key: value, record_key: record}
+            continue
+
+        changes = diff_fields(old_record, record, fields)
+        if changes:
+            yield {"type": CHANGED, key: value, "changes": changes}
+
+    for value, record in old_index.items():
+        if value not in new_index:
+            yield {"type": REMOVED, key: value, record_key: record}
+
+
+def diff_preps(old: Iterable[dict], new: Iterable[dict], fields: Optional[Sequence[str]] = None) -> Iterator[dict]:
+    """Yield added, removed and changed P-Reps between two lists of P-Reps, matched by address
+
+    :param old: P-Reps of the older snapshot
+    :param new: P-Reps of the newer snapshot
+    :param fields: fields to compare. None means the fields found in both snapshots,
+        as snapshots from files may have fields live getPReps doesn't, like bonderList
+    """
+    old, new = list(old), list(new)
+    if fields is None:
+        fields = shared_fields(old, new)
+    return diff_records(old, new, "address", "prep", fields)
+
+
+def shared_fields(old: Iterable[dict], new: Iterable[dict]) -> List[str]:
+    """Return the fields which appear in both lists of records"""
+    new_fields = {key for record in new for key in record}
+    return [key for key in dict.fromkeys(key for record in old for key in record) if key in new_fields]
+
+
+def fetch_snapshot(reader, block_height: Optional[int] = None) -> PRepSnapshot:
+    height = hex(block_height) if block_height is not None else get_snapshot_height(reader)
+    return PRepSnapshot(height, list(reader.iter_preps(block_height=int(height, 16))))
+
+
+def load_snapshot(path: str) -> PRepSnapshot:
+    """Load P-Reps from a getPReps response, a saved diff state or a JSONL file of the snapshot command"""
+    try:
+        with open(path) as f:
+            text = f.read()
+    except (FileNotFoundError, IsADirectoryError, PermissionError):
+        raise InvalidFileReadException(f"Cannot read snapshot, file path : {path}")
+
+    try:
+        if path.endswith(".jsonl"):
+            data = _load_lines(text)
+        else:
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                data = _load_lines(text)
+
+        if isinstance(data, dict) and "result" not in data and "preps" not in data:
+            # JSONL of a single P-Rep
+            data = [data]
+        if isinstance(data, dict):
+            data = data.get("result", data)
+            snapshot = PRepSnapshot(data.get("blockHeight"), data["preps"])
+        elif isinstance(data, list):
+            height = data[0].get("blockHeight") if data and isinstance(data[0], dict) else None
+            snapshot = PRepSnapshot(height, data)
+        else:
+            snapshot = None
+    except (json.JSONDecodeError, KeyError, AttributeError):
+        snapshot = None
+
+    if snapshot is None or not isinstance(snapshot.preps, list) \
+            or not all(isinstance(prep, dict) and "address" in prep for prep in snapshot.preps):
+        raise InvalidFormatException(f"Invalid snapshot, file path : {path}")
+    return snapshot
+
+
+def _load_lines(text: str) -> List[dict]:
+    """Parse JSONL, one P-Rep per line"""
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def save_snapshot(path: str, snapshot: PRepSnapshot):
+    tmp = f"{path}.tmp"
+    try:
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump({"blockHeight": snapshot.block_height, "preps": snapshot.preps}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        raise InvalidFileWriteException(f"Can't write file {path}. {e}")
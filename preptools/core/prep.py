@@ -15,30 +15,58 @@
 import functools
 import getpass
 import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from hashlib import sha3_256
 from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
+    Iterator,
     List,
+    Optional,
+    Sequence,
+    Tuple,
     Union,
 )
 
-from iconsdk.builder.call_builder import CallBuilder
+from iconsdk.builder.call_builder import Call, CallBuilder
 from iconsdk.builder.transaction_builder import CallTransactionBuilder
-from iconsdk.exception import DataTypeException
+from iconsdk.exception import DataTypeException, IconServiceBaseException
 from iconsdk.icon_service import IconService
-from iconsdk.providers.http_provider import HTTPProvider
+from iconsdk.libs.serializer import serialize
 from iconsdk.signed_transaction import SignedTransaction
 from iconsdk.wallet.wallet import KeyWallet
+from . import receipt, transport
+from .agent import get_agent_wallet
+from .chain_cache import STEP_PRICE, ChainConstantsCache, get_default_cache, get_step_version
+from .result_cache import TERMINAL_PROPOSAL_STATUS, ResultCache, get_default_result_cache
+from .step_model import StepHistory, get_default_history, payload_size
 from ..exception import (
+    InvalidArgumentException,
     InvalidKeyStoreException,
     InvalidFileReadException,
+    InvalidFileWriteException,
     InvalidDataTypeException,
+    JsonRpcException,
 )
-from ..utils.constants import EOA_ADDRESS, ZERO_ADDRESS, COLUMN, GOVERNANCE_ADDRESS
+from ..utils.constants import (
+    EOA_ADDRESS,
+    ZERO_ADDRESS,
+    COLUMN,
+    GOVERNANCE_ADDRESS,
+    SYSTEM_SCORE_ADDRESS,
+    get_predefined_nid,
+    resolve_urls,
+)
+from ..utils import timings
+from ..utils.endpoints import EndpointManager, get_default_endpoint_manager
 from ..utils.preptools_config import get_default_config
 from ..utils.utils import print_title, print_dict
-from ..utils.validation_checker import check_enough_balance
+from ..utils.validation_checker import BalanceBudget, check_enough_balance
 
 
 def _print_request(title: str, content: dict):
@@ -47,20 +75,48 @@ def _print_request(title: str, content: dict):
     print()
 
 
+class PreSendInfo:
+    """Chain values fetched right before a transaction is sent
+
+    TxHandler fills it up front and send listeners like check_enough_balance read it
+    instead of asking the node again.
+    """
+
+    def __init__(self):
+        self.estimated_step: Optional[int] = None
+        self.balance: Optional[int] = None
+        self.step_price: Optional[int] = None
+
+    def clear(self):
+        self.estimated_step = None
+        self.balance = None
+        self.step_price = None
+
+
 class TxHandler:
-    def __init__(self, service, nid: int, on_send_request: callable(dict)):
+    def __init__(
+            self,
+            service,
+            nid: int,
+            on_send_request: callable(dict),
+            pre_send: Optional[PreSendInfo] = None,
+            cache: Optional[ChainConstantsCache] = None,
+            history: Optional[StepHistory] = None):
         self._icon_service = service
         self._nid = nid
         self._on_send_request = on_send_request
+        self._pre_send = pre_send
+        self._cache = cache
+        self._history = history
 
     def _call_tx(self, transaction, owner) -> Union[str, dict]:
         ret = self._call_on_send_request(transaction.to_dict())
         if not ret:
             return
 
-        return self._icon_service.send_transaction(
-            SignedTransaction(transaction, owner), full_response=False
-        )
+        with timings.phase("sign"):
+            signed_tx = SignedTransaction(transaction, owner)
+        return self._icon_service.send_transaction(signed_tx, full_response=False)
 
     def _call_on_send_request(self, content: dict) -> bool:
         if self._on_send_request:
@@ -81,20 +137,146 @@ class TxHandler:
             .method(method) \
             .params(params) \
             .value(value)
+
+        url = self._get_url()
+        size = payload_size(params)
+        if limit is None and self._history is not None and self._check_step_version(url):
+            limit = self._history.predict(url, method, size)
+
         if limit is None:
-            step_omit_tx = transaction.build()
-            estimated_step: int = self._icon_service.estimate_step(step_omit_tx)
+            estimated_step: int = self._estimate_step(owner, transaction.build())
+            if self._history is not None:
+                self._history.record(url, method, size, estimated_step)
             if margin == 0:
                 margin = estimated_step // 10
             transaction.step_limit(estimated_step + margin)
         else:
+            if self._pre_send is not None:
+                self._fetch_pre_send(owner.get_address())
             transaction.step_limit(limit)
-        return self._call_tx(transaction.build(), owner)
+
+        tx_hash = self._call_tx(transaction.build(), owner)
+        if isinstance(tx_hash, str) and self._history is not None:
+            self._history.add_pending(tx_hash, url, method, size)
+        return tx_hash
+
+    def _get_url(self) -> str:
+        return _get_service_url(self._icon_service)
+
+    def _check_step_version(self, url: str) -> bool:
+        """Drop the step history of url if step costs or revision changed since it was recorded
+
+        :return: False if the step version is unknown, so the history should not be trusted
+        """
+        cache = self._cache if self._cache is not None else ChainConstantsCache()
+        try:
+            version = get_step_version(cache, url, self._icon_service)
+        except IconServiceBaseException:
+            return False
+        self._history.set_version(url, version)
+        return True
+
+    def _estimate_step(self, owner, step_omit_tx) -> int:
+        if self._pre_send is not None:
+            self._fetch_pre_send(owner.get_address(), step_omit_tx)
+            return self._pre_send.estimated_step
+        return self._icon_service.estimate_step(step_omit_tx)
+
+    def _fetch_pre_send(self, address: str, step_omit_tx=None):
+        """Fetch estimated step, balance and step price in a single round trip
+
+        debug_estimateStep is served by another endpoint(/api/v3d),
+        so it runs in parallel with the icx batch of icx_getBalance and getStepPrice.
+        getStepPrice is skipped while the step price is cached.
+        """
+        pre_send = self._pre_send
+        pre_send.clear()
+
+        url = self._get_url()
+        step_price: Optional[str] = None
+        if self._cache is not None:
+            step_price = self._cache.get(url, STEP_PRICE)
+
+        requests = [("icx_getBalance", {"address": address})]
+        if step_price is None:
+            step_price_params = {
+                "to": SYSTEM_SCORE_ADDRESS,
+                "dataType": "call",
+                "data": {"method": "getStepPrice"},
+            }
+            requests.append(("icx_call", step_price_params))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = None
+            if step_omit_tx is not None:
+                future = executor.submit(self._icon_service.estimate_step, step_omit_tx)
+            responses = self._icon_service.batch(requests)
+            if future is not None:
+                pre_send.estimated_step = future.result()
+
+        for response in responses:
+            if "error" in response:
+                error = response["error"]
+                raise JsonRpcException(error.get("message"), error.get("code"))
+
+        if step_price is None:
+            step_price = responses[1]["result"]
+            if self._cache is not None:
+                self._cache.set(url, STEP_PRICE, step_price)
+
+        pre_send.balance = int(responses[0]["result"], 0)
+        pre_send.step_price = int(step_price, 0)
+
+
+def get_tx_hash(signed_tx: dict) -> str:
+    """Compute the hash of a signed transaction locally, the same way the node does"""
+    tx = {k: v for k, v in signed_tx.items() if k != "signature"}
+    return f"0x{sha3_256(serialize(tx)).hexdigest()}"
+
+
+class SignOnlyTxHandler(TxHandler):
+    """TxHandler which appends signed transactions to a JSONL file instead of sending them
+
+    It never touches the network, so step limit must be given or predictable from the step history.
+    """
+
+    _file_lock = threading.Lock()
+
+    def __init__(self, nid: int, on_send_request, path: str, url: str = "", history=None):
+        super().__init__(None, nid, on_send_request, history=history)
+        self._path = path
+        self._url = url
+
+    def _get_url(self) -> str:
+        return self._url
+
+    def _estimate_step(self, owner, step_omit_tx) -> int:
+        raise InvalidArgumentException("step limit is required to sign a transaction offline")
+
+    def _check_step_version(self, url: str) -> bool:
+        # No network access, so the history is used as it is
+        return True
+
+    def _call_tx(self, transaction, owner) -> Optional[str]:
+        ret = self._call_on_send_request(transaction.to_dict())
+        if not ret:
+            return
+
+        with timings.phase("sign"):
+            signed_tx: dict = SignedTransaction(transaction, owner).signed_transaction_dict
+        try:
+            with self._file_lock, open(self._path, "a") as f:
+                f.write(json.dumps(signed_tx, separators=(",", ":")))
+                f.write("\n")
+        except (PermissionError, IsADirectoryError, FileNotFoundError) as e:
+            raise InvalidFileWriteException(f"Can't write file {self._path}. {e}")
+
+        return get_tx_hash(signed_tx)
 
 
 class PRepToolsListener(object):
     def __init__(self):
-        self._listeners = None
+        self._listeners: List[Callable[[dict], bool]] = []
 
     def set_listeners(self, func: List[Callable[[dict], bool]]):
         self._listeners = func
@@ -104,6 +286,12 @@ class PRepToolsListener(object):
         return self._listeners
 
 
+DEFAULT_SEND_CONCURRENCY = 4
+
+# index of the params in the input, tx hash, error message
+SendResult = Tuple[int, Optional[str], Optional[str]]
+
+
 class PRepToolsWriter(PRepToolsListener):
     def __init__(self, service, nid: int, owner, step_limit, step_margin):
         super().__init__()
@@ -113,6 +301,46 @@ class PRepToolsWriter(PRepToolsListener):
         self._nid = nid
         self._step_limit = step_limit
         self._step_margin = step_margin
+        self._pre_send: Optional[PreSendInfo] = None
+        self._cache: Optional[ChainConstantsCache] = None
+        self._history: Optional[StepHistory] = None
+        self._sign_only_path: Optional[str] = None
+        self._url = ""
+
+    @property
+    def address(self) -> str:
+        return self._owner.get_address()
+
+    @property
+    def pre_send(self) -> Optional[PreSendInfo]:
+        return self._pre_send
+
+    def enable_pre_send(self, cache: Optional[ChainConstantsCache] = None) -> PreSendInfo:
+        """Fetch estimated step, balance and step price together before each transaction is sent
+
+        :param cache: if given, step price is taken from it while it is valid
+        """
+        if self._pre_send is None:
+            self._pre_send = PreSendInfo()
+        self._cache = cache
+        return self._pre_send
+
+    def enable_sign_only(self, path: str, url: str = ""):
+        """Append signed transactions to path as JSONL instead of sending them
+
+        :param path: output file
+        :param url: node url the transactions are meant for. Used as the key of the step history
+        """
+        self._sign_only_path = path
+        self._url = url
+
+    def enable_step_prediction(self, history: StepHistory):
+        """Predict step limit from the history of each method instead of calling estimate_step
+
+        estimate_step is still used until the history has enough samples for a method.
+        It does nothing when step limit is given explicitly.
+        """
+        self._history = history
 
     def _call(self, method: str, params: dict, to: str = ZERO_ADDRESS, value: int = 0) -> str:
         tx_handler = self._create_tx_handler()
@@ -126,8 +354,58 @@ class PRepToolsWriter(PRepToolsListener):
             margin=self._step_margin
         )
 
-    def _create_tx_handler(self) -> TxHandler:
-        return TxHandler(self._icon_service, self._nid, self.listeners)
+    def _create_tx_handler(self, pre_send: bool = True) -> TxHandler:
+        if self._sign_only_path is not None:
+            return SignOnlyTxHandler(self._nid, self.listeners, self._sign_only_path, self._url, self._history)
+        return TxHandler(
+            self._icon_service, self._nid, self.listeners, self._pre_send if pre_send else None,
+            self._cache, self._history)
+
+    def call_many(
+            self,
+            method: str,
+            params_list: Sequence[dict],
+            to: str = ZERO_ADDRESS,
+            concurrency: int = DEFAULT_SEND_CONCURRENCY) -> Iterator[SendResult]:
+        """Send a transaction of method for each params, estimating, signing and sending several at once
+
+        Listeners are called from worker threads, so they should not prompt.
+        Use fetch_balance_budget instead of check_enough_balance to check the balance.
+        Results are yielded as soon as each transaction is sent, not in input order.
+
+        :return: (index, tx hash, error message). tx hash is None if a listener rejected the transaction
+        """
+        tx_handler = self._create_tx_handler(pre_send=False)
+
+        def send(index: int, params: dict) -> SendResult:
+            try:
+                tx_hash = tx_handler.call(
+                    owner=self._owner,
+                    to=to,
+                    limit=self._step_limit,
+                    method=method,
+                    params=params,
+                    margin=self._step_margin
+                )
+            except Exception as e:
+                return index, None, f"{type(e).__name__}: {e}"
+            if not isinstance(tx_hash, str):
+                return index, None, "Rejected"
+            return index, tx_hash, None
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(send, i, params) for i, params in enumerate(params_list)]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def fetch_balance_budget(self) -> BalanceBudget:
+        """Fetch balance of the owner and step price once for the transactions of call_many
+
+        Step price is taken from the cache given to enable_pre_send while it is valid.
+        """
+        pre_send = PreSendInfo()
+        TxHandler(self._icon_service, self._nid, None, pre_send, self._cache)._fetch_pre_send(self.address)
+        return BalanceBudget(pre_send.balance, pre_send.step_price)
 
     def register_prep(self, params) -> Union[str, Dict[str, Any]]:
         method = "registerPRep"
@@ -149,9 +427,23 @@ class PRepToolsWriter(PRepToolsListener):
         method = "voteProposal"
         return self._call(method, params, to=GOVERNANCE_ADDRESS)
 
+    def vote_proposals(
+            self,
+            params_list: Sequence[dict],
+            concurrency: int = DEFAULT_SEND_CONCURRENCY) -> Iterator[SendResult]:
+        return self.call_many("voteProposal", params_list, to=GOVERNANCE_ADDRESS, concurrency=concurrency)
+
     def apply_proposal(self, params) -> Union[str, dict]:
         method = "applyProposal"
-        return self._call(method, params, to=GOVERNANCE_ADDRESS)
+        ret = self._call(method, params, to=GOVERNANCE_ADDRESS)
+        if ret:
+            # Applied proposal may change step price, step costs or revision
+            url = _get_service_url(self._icon_service)
+            if self._cache is not None:
+                self._cache.invalidate(url)
+            if self._history is not None:
+                self._history.clear(url)
+        return ret
 
     def set_prep(self, params) -> Union[str, dict]:
         method = "setPRep"
@@ -170,6 +462,12 @@ class PRepToolsWriter(PRepToolsListener):
         return self._call(method, params)
 
 
+PREPS_CHUNK_SIZE = 100
+# Maximum size of getProposals
+PROPOSALS_PAGE_SIZE = 10
+DEFAULT_PAGE_CONCURRENCY = 4
+
+
 class PRepToolsReader(PRepToolsListener):
     def __init__(self, service, nid: int, address: str = EOA_ADDRESS):
         super().__init__()
@@ -177,32 +475,101 @@ class PRepToolsReader(PRepToolsListener):
         self._icon_service = service
         self._nid = nid
         self._from = address
+        self._result_cache: Optional[ResultCache] = None
 
-    def _call(self, method, params=None, to: str = ZERO_ADDRESS) -> dict:
+    def enable_result_cache(self, cache: ResultCache):
+        """Keep results which never change in cache and answer them from it
+
+        Those are getPReps at a block height, proposals in a terminal status,
+        transaction results and transactions included in a block.
+        """
+        self._result_cache = cache
+
+    def _cached(self, method: str, params: Any, fetch: Callable[[], Any], immutable: Callable[[Any], bool]):
+        if self._result_cache is None:
+            return fetch()
+
+        key = ResultCache.make_key(_get_service_url(self._icon_service), self._nid, method, params)
+        value = self._result_cache.get(key)
+        if value is None:
+            value = fetch()
+            if immutable(value):
+                self._result_cache.set(key, value)
+        return value
+
+    def _build_call(self, method, params=None, to: str = ZERO_ADDRESS, height: Optional[int] = None) -> Call:
         call = CallBuilder() \
             .from_(self._from) \
             .to(to) \
             .method(method) \
             .params(params) \
+            .height(height) \
             .build()
 
         for listener in self.listeners:
             listener(call.to_dict())
 
+        return call
+
+    def _call(self, method, params=None, to: str = ZERO_ADDRESS) -> dict:
+        call = self._build_call(method, params, to)
         return self._icon_service.call(call, True)
 
+    def batch_call(
+            self,
+            addresses: Iterable[str],
+            methods: Iterable[str] = ("getPRep",),
+            chunk_size: int = transport.BATCH_CHUNK_SIZE,
+            height: Optional[int] = None) -> Dict[str, Dict[str, dict]]:
+        """Query several addresses with one or more chain SCORE methods in JSON-RPC batches
+
+        :param addresses: addresses passed as {"address": address} to each method
+        :param methods: getPRep, getStake, getBond, getBonderList, ...
+        :param chunk_size: maximum number of calls in a single batch request
+        :param height: block height to query at. None means the latest block
+        :return: {address: {method: response}}. Each response has either "result" or "error"
+        """
+        items = [(address, method) for address in dict.fromkeys(addresses) for method in methods]
+        requests = [
+            ("icx_call", _call_to_params(self._build_call(method, {"address": address}, height=height)))
+            for address, method in items
+        ]
+
+        ret = {}
+        for i in range(0, len(requests), chunk_size):
+            responses = self._icon_service.batch(requests[i:i + chunk_size])
+            for (address, method), response in zip(items[i:i + chunk_size], responses):
+                response = {k: v for k, v in response.items() if k in ("result", "error")}
+                ret.setdefault(address, {})[method] = response
+
+        return ret
+
     def _tx_result(self, tx_hash: str):
         try:
-            return self._icon_service.get_transaction_result(tx_hash, False)
+            # A transaction result is only returned once the transaction is finalized
+            return self._cached(
+                "icx_getTransactionResult", tx_hash,
+                lambda: self._icon_service.get_transaction_result(tx_hash, False),
+                lambda result: isinstance(result, dict))
         except DataTypeException:
             raise InvalidDataTypeException("This hash value is unrecognized.")
 
     def _tx_by_hash(self, tx_hash):
         try:
-            return self._icon_service.get_transaction(tx_hash, False)
+            return self._cached(
+                "icx_getTransactionByHash", tx_hash,
+                lambda: self._icon_service.get_transaction(tx_hash, False),
+                lambda result: isinstance(result, dict) and result.get("blockHeight") is not None)
         except DataTypeException:
             raise InvalidDataTypeException("This hash value is unrecognized.")
 
+    def get_last_block_height(self) -> int:
+        response = self._icon_service.get_block("latest", full_response=True)
+        if "error" in response:
+            error = response["error"]
+            raise JsonRpcException(error.get("message"), error.get("code"))
+        return response["result"]["height"]
+
     def get_prep(self, address: str) -> dict:
         params = {"address": address}
         return self._call("getPRep", params)
@@ -212,21 +579,152 @@ class PRepToolsReader(PRepToolsListener):
         return self._call("getBonderList", params)
 
     def get_preps(self, params) -> dict:
-        return self._call("getPReps", params)
+        if not params or params.get("blockHeight") is None:
+            return self._call("getPReps", params)
+        return self._cached("getPReps", params, lambda: self._call("getPReps", params), _has_result)
+
+    def iter_preps(
+            self,
+            start_ranking: int = 1,
+            end_ranking: Optional[int] = None,
+            block_height: Optional[int] = None,
+            chunk_size: int = PREPS_CHUNK_SIZE) -> Iterator[dict]:
+        """Yield P-Reps one at a time, fetching getPReps in ranking chunks
+
+        Every chunk is pinned to the block height of the first one, so the ranking doesn't shift while paging.
+        Each chunk asks for one more P-Rep than it yields, which tells whether there is a next chunk,
+        so a chunk is only requested from a ranking which exists and every error is raised.
+        The next chunk is fetched while the caller processes the current one.
+
+        :param start_ranking: first ranking, 1-based
+        :param end_ranking: last ranking, inclusive. None means until the last P-Rep
+        :param block_height: block height of the ranking. None means the latest block
+        :param chunk_size: number of P-Reps in a single getPReps call
+        """
+        if start_ranking < 1 or chunk_size < 1:
+            raise InvalidArgumentException("start_ranking and chunk_size should be positive")
+
+        def fetch(start: int, height: Optional[str]) -> dict:
+            end = start + chunk_size
+            if end_ranking is not None:
+                end = min(end, end_ranking)
+            params = {"startRanking": hex(start), "endRanking": hex(end)}
+            if height is not None:
+                params["blockHeight"] = height
+            return self.get_preps(params)
+
+        height = None if block_height is None else hex(block_height)
+        start = start_ranking
+        if end_ranking is not None and start > end_ranking:
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            response = fetch(start, height)
+            while True:
+                if "error" in response:
+                    error = response["error"]
+                    raise JsonRpcException(error.get("message"), error.get("code"))
+
+                result = response["result"]
+                preps = result.get("preps", [])
+                height = height or result.get("blockHeight")
+                chunk = preps[:chunk_size]
+                start += len(chunk)
+
+                future = None
+                if len(preps) > chunk_size:
+                    future = executor.submit(fetch, start, height)
+
+                yield from chunk
+
+                if future is None:
+                    return
+                response = future.result()
 
     def get_proposal(self, _id: str) -> dict:
         params = {"id": _id}
-        return self._call("getProposal", params, to=GOVERNANCE_ADDRESS)
+        return self._cached(
+            "getProposal", params,
+            lambda: self._call("getProposal", params, to=GOVERNANCE_ADDRESS),
+            lambda response: _has_result(response)
+            and response["result"].get("status") in TERMINAL_PROPOSAL_STATUS)
 
     def get_proposals(self, params) -> dict:
         return self._call("getProposals", params, to=GOVERNANCE_ADDRESS)
 
+    def iter_proposals(
+            self,
+            type_: Optional[int] = None,
+            status: Optional[int] = None,
+            concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+            page_size: int = PROPOSALS_PAGE_SIZE) -> Iterator[dict]:
+        """Yield every proposal from the latest one, fetching several getProposals pages at once
+
+        Pages are requested ahead of the one being consumed and merged in order.
+        A proposal which shows up again because a new one shifted the pages is skipped.
+        Stop iterating to stop fetching.
+
+        :param type_: type of proposals to filter
+        :param status: status of proposals to filter
+        :param concurrency: number of page requests in flight
+        :param page_size: number of proposals in a page. [1 ~ 10]
+        """
+        if concurrency < 1 or not (1 <= page_size <= PROPOSALS_PAGE_SIZE):
+            raise InvalidArgumentException(
+                f"concurrency should be positive and page_size in [1 ~ {PROPOSALS_PAGE_SIZE}]")
+
+        def fetch(page: int) -> dict:
+            params = {"start": page * page_size, "size": page_size}
+            if type_:
+                params["type"] = type_
+            if status:
+                params["status"] = status
+            return self.get_proposals(params)
+
+        seen = set()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = deque(executor.submit(fetch, page) for page in range(concurrency))
+            next_page = concurrency
+            try:
+                while futures:
+                    response = futures.popleft().result()
+                    if "error" in response:
+                        error = response["error"]
+                        raise JsonRpcException(error.get("message"), error.get("code"))
+
+                    proposals = response["result"].get("proposals", [])
+                    if len(proposals) < page_size:
+                        futures.clear()
+                    else:
+                        futures.append(executor.submit(fetch, next_page))
+                        next_page += 1
+
+                    for proposal in proposals:
+                        if proposal.get("id") in seen:
+                            continue
+                        seen.add(proposal.get("id"))
+                        yield proposal
+            finally:
+                for future in futures:
+                    future.cancel()
+
     def get_tx_result(self, tx_hash: str) -> dict:
         return self._tx_result(tx_hash)
 
     def get_tx_by_hash(self, tx_hash: str) -> dict:
         return self._tx_by_hash(tx_hash)
 
+    def wait_tx_results(
+            self,
+            tx_hashes: Iterable[str],
+            timeout: float = receipt.DEFAULT_WAIT_TIMEOUT,
+            interval: float = receipt.DEFAULT_POLL_INTERVAL) -> Iterator[receipt.ReceiptResult]:
+        """Yield (tx_hash, result, error) of each transaction as soon as it is finalized
+
+        Results are raw JSON-RPC results. See receipt.wait_for_results
+        """
+        return receipt.wait_for_results(self._icon_service, tx_hashes, timeout, interval)
+
     def get_stake(self, address: str) -> dict:
         params = {"address": address}
         return self._call("getStake", params)
@@ -236,9 +734,43 @@ class PRepToolsReader(PRepToolsListener):
         return self._call("getBond", params)
 
 
+def _has_result(response) -> bool:
+    return isinstance(response, dict) and isinstance(response.get("result"), dict)
+
+
+def _get_service_url(service) -> str:
+    provider = getattr(service, "provider", None)
+    return getattr(provider, "url", "")
+
+
+def _call_to_params(call: Call) -> dict:
+    params = {
+        "to": call.to,
+        "dataType": "call",
+        "data": {
+            "method": call.method
+        }
+    }
+
+    if call.from_ is not None:
+        params["from"] = call.from_
+
+    if isinstance(call.params, dict):
+        params["data"]["params"] = call.params
+
+    if call.height is not None:
+        params["height"] = call.height
+
+    return params
+
+
 def create_reader_by_args(args) -> PRepToolsReader:
-    url, nid, _ = _get_common_args(args)
-    reader = create_reader(url, nid)
+    urls, nid, _ = _get_common_args_with_urls(args)
+    reader = create_reader(urls, nid, endpoints=get_default_endpoint_manager())
+    if not getattr(args, "no_cache", False):
+        result_cache = get_default_result_cache()
+        if result_cache is not None:
+            reader.enable_result_cache(result_cache)
 
     callback = functools.partial(_print_request, "Request")
     reader.set_listeners([callback])
@@ -246,8 +778,13 @@ def create_reader_by_args(args) -> PRepToolsReader:
     return reader
 
 
-def create_reader(url: str, nid: int) -> PRepToolsReader:
-    icon_service = IconService(HTTPProvider(url))
+def create_reader(
+        url: Union[str, List[str]],
+        nid: int,
+        pool_size: int = transport.DEFAULT_POOL_SIZE,
+        timeout: float = transport.DEFAULT_TIMEOUT,
+        endpoints: Optional[EndpointManager] = None) -> PRepToolsReader:
+    icon_service = create_icon_service(url, pool_size, timeout, endpoints)
     return PRepToolsReader(icon_service, nid)
 
 
@@ -263,6 +800,17 @@ def _confirm_callback(content: dict, yes: bool, verbose: bool) -> bool:
     return True
 
 
+# keystore path -> wallet unlocked earlier in this process. None means wallets are not kept
+_unlocked_wallets: Optional[Dict[str, KeyWallet]] = None
+
+
+def keep_unlocked_wallets():
+    """Keep the wallets unlocked by create_writer_by_args for the later commands of a long running process"""
+    global _unlocked_wallets
+    if _unlocked_wallets is None:
+        _unlocked_wallets = {}
+
+
 def create_writer_by_args(args, confirm_callback=_confirm_callback) -> PRepToolsWriter:
     url, nid, keystore_path = _get_common_args(args)
     password: str = args.password
@@ -270,27 +818,84 @@ def create_writer_by_args(args, confirm_callback=_confirm_callback) -> PRepTools
     if keystore_path is None:
         raise InvalidKeyStoreException("There's no keystore path in cmdline, configure.")
 
-    if password is None:
-        password = getpass.getpass("> Password: ")
-    writer = create_writer(
-        url, nid, keystore_path, password, getattr(args, "step_limit"), getattr(args, "step_margin", 0))
+    owner_wallet = _unlocked_wallets.get(os.path.abspath(keystore_path)) if _unlocked_wallets is not None else None
+    if owner_wallet is None and not getattr(args, "no_agent", False):
+        owner_wallet = get_agent_wallet(keystore_path)
+    if owner_wallet is None:
+        if password is None:
+            password = getpass.getpass("> Password: ")
+        with timings.phase("keystore"):
+            owner_wallet = KeyWallet.load(keystore_path, password)
+        if _unlocked_wallets is not None:
+            _unlocked_wallets[os.path.abspath(keystore_path)] = owner_wallet
+
+    service = create_icon_service(url)
+    writer = PRepToolsWriter(
+        service, nid, owner_wallet, getattr(args, "step_limit"), getattr(args, "step_margin", 0))
 
     callback1 = functools.partial(confirm_callback, yes=args.yes, verbose=args.verbose)
-    callback2 = functools.partial(check_enough_balance, url)
-    writer.set_listeners([callback1, callback2])
+    if getattr(args, "step_predict", False):
+        writer.enable_step_prediction(get_default_history())
+
+    sign_only: Optional[str] = getattr(args, "sign_only", None)
+    if sign_only:
+        writer.enable_sign_only(sign_only, url)
+        writer.set_listeners([callback1])
+    else:
+        pre_send = writer.enable_pre_send(get_default_cache(not getattr(args, "no_cache", False)))
+        callback2 = functools.partial(check_enough_balance, url, pre_send=pre_send)
+        writer.set_listeners([callback1, callback2])
+
+    return writer
+
+
+def create_bulk_writer_by_args(args, title: str, items: List[dict]) -> Optional[PRepToolsWriter]:
+    """Create a writer for PRepToolsWriter.call_many, confirming every transaction with a single prompt
+
+    The keystore is unlocked once. Each transaction is checked against the balance fetched before the first one,
+    and step price is reused from the chain constants cache.
+
+    :param title: title of the confirmation
+    :param items: what each transaction does, shown in the confirmation
+    :return: None if the user declines
+    """
+    writer = create_writer_by_args(args)
 
+    if not args.yes or args.verbose:
+        _print_request(title, {"count": len(items), "transactions": items})
+    if not args.yes:
+        ret: str = input(f"> Send {len(items)} transactions? [Y/n]")
+        if ret == "n":
+            return None
+
+    listeners = [functools.partial(_confirm_callback, yes=True, verbose=args.verbose)]
+    if writer.pre_send is not None:
+        listeners.append(writer.fetch_balance_budget())
+    writer.set_listeners(listeners)
     return writer
 
 
 def create_writer(
-        url: str, nid: int, keystore_path: str, password: str, step_limit: int, step_margin: int) -> PRepToolsWriter:
-    owner_wallet = KeyWallet.load(keystore_path, password)
-    service = IconService(HTTPProvider(url))
+        url: str,
+        nid: int,
+        keystore_path: str,
+        password: str,
+        step_limit: int,
+        step_margin: int,
+        pool_size: int = transport.DEFAULT_POOL_SIZE,
+        timeout: float = transport.DEFAULT_TIMEOUT) -> PRepToolsWriter:
+    with timings.phase("keystore"):
+        owner_wallet = KeyWallet.load(keystore_path, password)
+    service = create_icon_service(url, pool_size, timeout)
     return PRepToolsWriter(service, nid, owner_wallet, step_limit, step_margin)
 
 
-def create_icon_service(url: str) -> IconService:
-    return IconService(HTTPProvider(url))
+def create_icon_service(
+        url: Union[str, List[str]],
+        pool_size: int = transport.DEFAULT_POOL_SIZE,
+        timeout: float = transport.DEFAULT_TIMEOUT,
+        endpoints: Optional[EndpointManager] = None) -> IconService:
+    return transport.create_icon_service(url, pool_size, timeout, endpoints)
 
 
 def confirm_callback_for_registerPRep(content: dict, yes: bool, verbose: bool) -> bool:
@@ -306,6 +911,12 @@ def confirm_callback_for_registerPRep(content: dict, yes: bool, verbose: bool) -
 
 
 def _get_common_args(args):
+    """Return url, nid and keystore path. If several urls are given, url is the first one"""
+    urls, nid, keystore_path = _get_common_args_with_urls(args)
+    return urls[0], nid, keystore_path
+
+
+def _get_common_args_with_urls(args):
     conf = get_default_config()
 
     if hasattr(args, 'config') \
@@ -321,11 +932,20 @@ def _get_common_args(args):
             if args.config != 'preptools_config.json':
                 raise InvalidFileReadException(f"Cannot read configure file, file path : {args.config}")
 
-    url: str = _replace_attribute('url', args, conf)
+    url: Union[str, List[str]] = _replace_attribute('url', args, conf)
+    urls: List[str] = resolve_urls(url)
+    if len(urls) == 0:
+        raise InvalidArgumentException("There's no url in cmdline, configure.")
+    if len(urls) > 1:
+        urls = get_default_endpoint_manager().rank(urls)
+
     nid: int = _replace_attribute('nid', args, conf)
+    if getattr(args, 'nid', None) is None:
+        first = url.split(",")[0].strip() if isinstance(url, str) else url[0]
+        nid = get_predefined_nid(first) or nid
     keystore_path = _replace_attribute('keystore', args, conf)
 
-    return url, nid, keystore_path
+    return urls, nid, keystore_path
 
 
 def _replace_attribute(attr, args, conf):
@@ -0,0 +1,101 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from typing import Iterable, Iterator, Optional, Tuple
+
+from iconsdk.exception import DataTypeException
+from iconsdk.utils.validation import is_T_HASH
+
+from .transport import BATCH_CHUNK_SIZE
+from ..exception import InvalidDataTypeException
+
+DEFAULT_WAIT_TIMEOUT = 60
+DEFAULT_POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 5
+
+# Errors of icx_getTransactionResult while a transaction is not finalized yet
+PENDING_ERROR_CODES = frozenset((
+    -31002,  # pending
+    -31003,  # executing
+    -31004,  # not found. The transaction may not have reached this node yet
+))
+TIMEOUT_ERROR_CODE = -31006
+
+# tx hash, raw transaction result, error
+ReceiptResult = Tuple[str, Optional[dict], Optional[dict]]
+
+
+def check_tx_hash(tx_hash: str):
+    # is_T_HASH raises DataTypeException instead of returning False
+    try:
+        is_T_HASH(tx_hash)
+    except DataTypeException:
+        raise InvalidDataTypeException(f"This hash value is unrecognized: {tx_hash}")
+
+
+def wait_for_results(
+        service,
+        tx_hashes: Iterable[str],
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[ReceiptResult]:
+    """Wait for the results of many transactions at once
+
+    Pending transactions are polled with icx_getTransactionResult in JSON-RPC batches.
+    The poll interval doubles after each round up to max_interval.
+    Each result is yielded as soon as it is finalized, so the order differs from tx_hashes.
+    Transactions which are still pending at the deadline are yielded with a timeout error.
+
+    :param service: BatchIconService
+    :param tx_hashes: hashes of transactions to wait for
+    :param timeout: seconds to wait for all results. 0 means polling only once
+    :param interval: seconds between the first and the second poll
+    :param max_interval: upper bound of the poll interval
+    :param chunk_size: maximum number of hashes in a single batch request
+    """
+    pending = list(dict.fromkeys(tx_hashes))
+    for tx_hash in pending:
+        check_tx_hash(tx_hash)
+
+    deadline = time.monotonic() + timeout
+    while True:
+        not_finalized = []
+        for i in range(0, len(pending), chunk_size):
+            chunk = pending[i:i + chunk_size]
+            responses = service.batch([("icx_getTransactionResult", {"txHash": tx_hash}) for tx_hash in chunk])
+            for tx_hash, response in zip(chunk, responses):
+                if "result" in response:
+                    yield tx_hash, response["result"], None
+                elif response["error"].get("code") in PENDING_ERROR_CODES:
+                    not_finalized.append(tx_hash)
+                else:
+                    yield tx_hash, None, response["error"]
+
+        pending = not_finalized
+        if len(pending) == 0:
+            return
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            for tx_hash in pending:
+                yield tx_hash, None, {
+                    "code": TIMEOUT_ERROR_CODE,
+                    "message": "Timed out waiting for the transaction result",
+                }
+            return
+
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
@@ -0,0 +1,144 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from hashlib import sha3_256
+from typing import Any, Optional
+
+from ..utils.constants import PREPTOOLS_HOME
+
+DEFAULT_RESULT_CACHE_PATH = os.path.join(PREPTOOLS_HOME, "results.sqlite3")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Eviction frees space down to this ratio of max_bytes, so it doesn't run on every write
+EVICTION_RATIO = 0.9
+
+# Proposal status which never changes again: applied, disapproved, canceled, expired
+TERMINAL_PROPOSAL_STATUS = frozenset(("0x1", "0x2", "0x3", "0x5"))
+
+
+def _encode(value: Any) -> bytes:
+    def default(o):
+        if isinstance(o, bytes):
+            return {"__bytes__": o.hex()}
+        raise TypeError(f"{type(o).__name__} is not JSON serializable")
+
+    return zlib.compress(json.dumps(value, default=default, separators=(",", ":")).encode())
+
+
+def _decode(data: bytes) -> Any:
+    def object_hook(o: dict):
+        if len(o) == 1 and "__bytes__" in o:
+            return bytes.fromhex(o["__bytes__"])
+        return o
+
+    return json.loads(zlib.decompress(data), object_hook=object_hook)
+
+
+class ResultCache:
+    """Disk cache for query results which never change, like transaction results of finalized blocks
+
+    Values are stored compressed in SQLite under the hash of the query.
+    Least recently used values are evicted when the total size exceeds max_bytes.
+    """
+
+    def __init__(self, path: str = ":memory:", max_bytes: int = DEFAULT_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    @staticmethod
+    def make_key(url: str, nid: int, method: str, params: Any) -> str:
+        """Key of a query to the node of url. Networks may share a nid, so url is part of the key"""
+        query = json.dumps([url, nid, method, params], sort_keys=True, separators=(",", ":"))
+        return sha3_256(query.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        # The cache is best effort. A locked or broken database behaves as a miss
+        try:
+            with self._lock:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+            return _decode(row[0])
+        except (sqlite3.Error, ValueError, zlib.error):
+            return None
+
+    def set(self, key: str, value: Any):
+        data = _encode(value)
+        if len(data) > self._max_bytes:
+            return
+
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, data, len(data), time.time()),
+                )
+                self._evict()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+
+        target = total - int(self._max_bytes * EVICTION_RATIO)
+        freed = 0
+        keys = []
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY accessed"):
+            keys.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self._db.executemany("DELETE FROM results WHERE key = ?", keys)
+
+    def size(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def get_default_result_cache() -> Optional[ResultCache]:
+    """Return the cache in PREPTOOLS_HOME or None if it can't be opened"""
+    global _default_cache
+    if _default_cache is None:
+        try:
+            _default_cache = ResultCache(DEFAULT_RESULT_CACHE_PATH)
+        except (OSError, sqlite3.Error):
+            return None
+    return _default_cache
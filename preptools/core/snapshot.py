@@ -0,0 +1,252 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..exception import InvalidArgumentException, InvalidFileWriteException, JsonRpcException
+
+SNAPSHOT_FORMATS = ("jsonl", "csv", "parquet")
+DEFAULT_SNAPSHOT_CONCURRENCY = 8
+# Number of addresses queried in a single JSON-RPC batch by a worker
+SNAPSHOT_CHUNK_SIZE = 50
+PARQUET_ROW_GROUP_SIZE = 1000
+
+PREP = "prep"
+ACCOUNT = "account"
+
+# kind of the record (prep or account), record
+SnapshotRecord = Tuple[str, dict]
+
+# Fields of a record which are not in the columns of its kind, written as a JSON object
+EXTRA = "extra"
+# Columns of csv and parquet snapshots. getPRep fields, then getBonderList
+PREP_COLUMNS = (
+    "blockHeight", "address", "name", "country", "city", "email", "website", "details", "p2pEndpoint",
+    "nodeAddress", "status", "grade", "penalty", "lastState", "lastHeight", "power", "stake", "delegated",
+    "bonded", "totalBlocks", "validatedBlocks", "unvalidatedSequenceBlocks", "irep", "irepUpdateBlockHeight",
+    "lastGenerateBlockHeight", "hasPublicKey", "commissionRate", "maxCommissionRate", "maxCommissionChangeRate",
+    "minDoubleSignHeight", "jailFlags", "unjailRequestHeight", "bonderList", "error", EXTRA,
+)
+# getStake fields, then getBond fields
+ACCOUNT_COLUMNS = (
+    "blockHeight", "address", "stake", "unstakes", "bonds", "unbonds", "totalBonded", "error", EXTRA,
+)
+SNAPSHOT_COLUMNS = {PREP: PREP_COLUMNS, ACCOUNT: ACCOUNT_COLUMNS}
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def _ordered(jobs: Iterator[Tuple[Any, Any]], executor: ThreadPoolExecutor, concurrency: int, fn) -> Iterator:
+    """Run fn(*job) for each job with up to concurrency in flight and yield (job, result) in order"""
+    pending = deque()
+    for job in jobs:
+        pending.append((job, executor.submit(fn, *job)))
+        if len(pending) >= concurrency:
+            job, future = pending.popleft()
+            yield job, future.result()
+    while pending:
+        job, future = pending.popleft()
+        yield job, future.result()
+
+
+def _error_message(response: dict) -> str:
+    error = response.get("error", {})
+    return f"{error.get('code')}: {error.get('message')}"
+
+
+def get_snapshot_height(reader) -> str:
+    """Return the latest block height as a hex string, taken from a minimal getPReps"""
+    response = reader.get_preps({"startRanking": "0x1", "endRanking": "0x1"})
+    if "error" in response:
+        error = response["error"]
+        raise JsonRpcException(error.get("message"), error.get("code"))
+    return response["result"]["blockHeight"]
+
+
+def iter_snapshot(
+        reader,
+        block_height: Optional[int] = None,
+        addresses: Iterable[str] = (),
+        with_bonders: bool = True,
+        concurrency: int = DEFAULT_SNAPSHOT_CONCURRENCY) -> Iterator[SnapshotRecord]:
+    """Yield the state of the network at a single block height
+
+    Every P-Rep from getPReps, with its getBonderList, is yielded as a prep record.
+    Then getStake and getBond of each address are merged into an account record.
+    Queries are sent as JSON-RPC batches by a pool of workers, all pinned to the same block height.
+
+    :param reader: PRepToolsReader
+    :param block_height: None means the latest block
+    :param addresses: addresses to query getStake and getBond
+    :param with_bonders: query getBonderList for each P-Rep
+    :param concurrency: number of batches in flight
+    """
+    height = hex(block_height) if block_height is not None else get_snapshot_height(reader)
+    height_int = int(height, 16)
+
+    def fetch(chunk: List[str], methods: Tuple[str, ...]) -> Dict[str, Dict[str, dict]]:
+        return reader.batch_call(chunk, methods, height=height_int)
+
+    def fetch_bonders(chunk: List[dict], methods: Tuple[str, ...]) -> Dict[str, Dict[str, dict]]:
+        return fetch([prep["address"] for prep in chunk], methods)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        preps = reader.iter_preps(block_height=height_int)
+        if with_bonders:
+            jobs = ((chunk, ("getBonderList",)) for chunk in _chunks(preps, SNAPSHOT_CHUNK_SIZE))
+            for (chunk, _), responses in _ordered(jobs, executor, concurrency, fetch_bonders):
+                for prep in chunk:
+                    response = responses[prep["address"]]["getBonderList"]
+                    record = {"blockHeight": height, **prep}
+                    if "result" in response:
+                        record["bonderList"] = response["result"].get("bonderList", [])
+                    else:
+                        record["error"] = _error_message(response)
+                    yield PREP, record
+        else:
+            for prep in preps:
+                yield PREP, {"blockHeight": height, **prep}
+
+        jobs = ((chunk, ("getStake", "getBond")) for chunk in _chunks(dict.fromkeys(addresses), SNAPSHOT_CHUNK_SIZE))
+        for (chunk, methods), responses in _ordered(jobs, executor, concurrency, fetch):
+            for address in chunk:
+                record = {"blockHeight": height, "address": address}
+                for method in methods:
+                    response = responses[address][method]
+                    if "result" in response:
+                        record.update(response["result"])
+                    else:
+                        record["error"] = _error_message(response)
+                yield ACCOUNT, record
+
+
+def _flatten(record: dict, columns: Tuple[str, ...]) -> Dict[str, Any]:
+    """Return the values of columns, nested ones as JSON. Fields out of columns go to the extra column"""
+    def dump(value):
+        return json.dumps(value, separators=(",", ":")) if isinstance(value, (dict, list)) else value
+
+    row = {k: dump(v) for k, v in record.items() if k in columns and k != EXTRA}
+    extra = {k: v for k, v in record.items() if k not in row}
+    if extra:
+        row[EXTRA] = dump(extra)
+    return row
+
+
+class SnapshotWriter(ABC):
+    @abstractmethod
+    def write(self, record: dict):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+class JsonlSnapshotWriter(SnapshotWriter):
+    def __init__(self, path: str):
+        self._file = open(path, "w")
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, separators=(",", ":")))
+        self._file.write("\n")
+
+    def close(self):
+        self._file.close()
+
+
+class CsvSnapshotWriter(SnapshotWriter):
+    """Rows have the columns of the kind of the records.
+    Nested values are written as JSON and missing ones as empty cells
+    """
+
+    def __init__(self, path: str, columns: Tuple[str, ...]):
+        self._file = open(path, "w", newline="")
+        self._columns = columns
+        self._writer = csv.DictWriter(self._file, fieldnames=columns)
+        self._writer.writeheader()
+
+    def write(self, record: dict):
+        self._writer.writerow(_flatten(record, self._columns))
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSnapshotWriter(SnapshotWriter):
+    """Rows have the columns of the kind of the records, stored as strings. Requires pyarrow
+
+    Rows are written in row groups of row_group_size.
+    """
+
+    def __init__(self, path: str, columns: Tuple[str, ...], row_group_size: int = PARQUET_ROW_GROUP_SIZE):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise InvalidArgumentException("parquet format requires pyarrow. Install it with 'pip install pyarrow'")
+
+        self._pa = pyarrow
+        self._columns = columns
+        self._schema = pyarrow.schema([(column, pyarrow.string()) for column in columns])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+        self._row_group_size = row_group_size
+        self._rows: List[dict] = []
+
+    def write(self, record: dict):
+        self._rows.append(_flatten(record, self._columns))
+        if len(self._rows) >= self._row_group_size:
+            self._flush()
+
+    def _flush(self):
+        table = self._pa.table(
+            {c: [None if r.get(c) is None else str(r.get(c)) for r in self._rows] for c in self._columns},
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+        self._rows.clear()
+
+    def close(self):
+        try:
+            if self._rows:
+                self._flush()
+        finally:
+            self._writer.close()
+
+
+def open_snapshot_writer(path: str, fmt: str, kind: str) -> SnapshotWriter:
+    """Open a writer of the records of kind, prep or account"""
+    if fmt not in SNAPSHOT_FORMATS:
+        raise InvalidArgumentException(f"Unknown snapshot format: {fmt}")
+
+    try:
+        if fmt == "jsonl":
+            return JsonlSnapshotWriter(path)
+        if fmt == "csv":
+            return CsvSnapshotWriter(path, SNAPSHOT_COLUMNS[kind])
+        return ParquetSnapshotWriter(path, SNAPSHOT_COLUMNS[kind])
+    except (PermissionError, IsADirectoryError, FileNotFoundError) as e:
+        raise InvalidFileWriteException(f"Can't write file {path}. {e}")
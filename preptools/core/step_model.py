@@ -0,0 +1,187 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from ..utils.constants import PREPTOOLS_HOME
+
+DEFAULT_HISTORY_PATH = os.path.join(PREPTOOLS_HOME, "step_history.json")
+
+MIN_SAMPLES = 3
+MAX_SAMPLES = 64
+MAX_PENDING = 1024
+# Never extrapolate further than this ratio beyond the largest payload seen
+MAX_SIZE_RATIO = 2
+DEFAULT_MARGIN_RATIO = 0.1
+
+
+def payload_size(params: Optional[dict]) -> int:
+    if not params:
+        return 0
+    return len(json.dumps(params, separators=(",", ":")))
+
+
+class StepHistory:
+    """History of steps per node url and method, used to predict a step limit without estimate_step
+
+    Samples are (payload size, step) pairs coming from estimated steps and from stepUsed of transaction results.
+    Samples of a node url are dropped when its step version (step costs and revision) changes.
+    """
+
+    def __init__(self, path: Optional[str] = None, margin_ratio: float = DEFAULT_MARGIN_RATIO):
+        self._path = path
+        self._margin_ratio = margin_ratio
+        self._lock = threading.Lock()
+        # "url method" -> [[size, step], ...]
+        self._samples: Dict[str, List[List[int]]] = {}
+        # tx hash -> [key, size]
+        self._pending: Dict[str, list] = {}
+        # url -> step version the samples of url were recorded with
+        self._versions: Dict[str, str] = {}
+        self._load()
+
+    @staticmethod
+    def _key(url: str, method: str) -> str:
+        return f"{url} {method}"
+
+    def record(self, url: str, method: str, size: int, step: int):
+        with self._lock:
+            self._add_sample(self._key(url, method), size, step)
+            self._save()
+
+    def _add_sample(self, key: str, size: int, step: int):
+        samples = self._samples.setdefault(key, [])
+        samples.append([size, step])
+        del samples[:-MAX_SAMPLES]
+
+    def add_pending(self, tx_hash: str, url: str, method: str, size: int):
+        """Remember a sent transaction so that stepUsed of its result can be recorded later"""
+        with self._lock:
+            self._pending[tx_hash] = [self._key(url, method), size]
+            while len(self._pending) > MAX_PENDING:
+                del self._pending[next(iter(self._pending))]
+            self._save()
+
+    def record_result(self, tx_hash: str, step_used: int) -> bool:
+        with self._lock:
+            pending = self._pending.pop(tx_hash, None)
+            if pending is None:
+                return False
+            key, size = pending
+            self._add_sample(key, size, step_used)
+            self._save()
+            return True
+
+    def predict(self, url: str, method: str, size: int) -> Optional[int]:
+        """Predict a safe step limit
+
+        Fits step = a + b * size over the history and adds the largest positive residual and a margin.
+
+        :return: step limit or None if the history is not enough to predict
+        """
+        with self._lock:
+            samples = list(self._samples.get(self._key(url, method), ()))
+
+        if len(samples) < MIN_SAMPLES:
+            return None
+
+        sizes = [s[0] for s in samples]
+        if size > max(sizes) * MAX_SIZE_RATIO:
+            return None
+
+        n = len(samples)
+        mean_size = sum(sizes) / n
+        mean_step = sum(s[1] for s in samples) / n
+        var = sum((s - mean_size) ** 2 for s in sizes)
+        if var == 0:
+            slope = 0.0
+        else:
+            slope = max(0.0, sum((s[0] - mean_size) * (s[1] - mean_step) for s in samples) / var)
+        intercept = mean_step - slope * mean_size
+
+        residual = max(0.0, max(s[1] - (intercept + slope * s[0]) for s in samples))
+        step = intercept + slope * size + residual
+        return int(step * (1 + self._margin_ratio)) + 1
+
+    def set_version(self, url: str, version: str) -> bool:
+        """Drop the samples of url if they were recorded with another step version
+
+        :return: True if samples were dropped
+        """
+        with self._lock:
+            if self._versions.get(url) == version:
+                return False
+            self._versions[url] = version
+            cleared = self._clear(url)
+            self._save()
+            return cleared
+
+    def clear(self, url: Optional[str] = None):
+        with self._lock:
+            if url is None:
+                self._samples.clear()
+                self._pending.clear()
+                self._versions.clear()
+            else:
+                self._clear(url)
+                self._versions.pop(url, None)
+            self._save()
+
+    def _clear(self, url: str) -> bool:
+        prefix = f"{url} "
+        keys = [k for k in self._samples if k.startswith(prefix)]
+        for key in keys:
+            del self._samples[key]
+        for tx_hash in [h for h, pending in self._pending.items() if pending[0].startswith(prefix)]:
+            del self._pending[tx_hash]
+        return len(keys) > 0
+
+    def _load(self):
+        if self._path is None:
+            return
+
+        try:
+            with open(self._path) as f:
+                data = json.load(f)
+            self._samples = data.get("samples", {})
+            self._pending = data.get("pending", {})
+            self._versions = data.get("versions", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def _save(self):
+        if self._path is None:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = f"{self._path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"samples": self._samples, "pending": self._pending, "versions": self._versions}, f)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            pass
+
+
+_default_history: Optional[StepHistory] = None
+
+
+def get_default_history() -> StepHistory:
+    global _default_history
+    if _default_history is None:
+        _default_history = StepHistory(DEFAULT_HISTORY_PATH)
+    return _default_history
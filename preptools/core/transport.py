@@ -0,0 +1,372 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from json import JSONDecodeError
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from iconsdk.icon_service import IconService
+from iconsdk.providers.http_provider import HTTPProvider
+
+from ..exception import InvalidArgumentException, JsonRpcException
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 10
+# Maximum number of requests in a single JSON-RPC batch
+BATCH_CHUNK_SIZE = 100
+
+HEDGE_PERCENTILE = 0.95
+# Hedge delay used until enough latencies of an endpoint are known
+DEFAULT_HEDGE_DELAY = 0.3
+MIN_HEDGE_DELAY = 0.05
+MIN_LATENCY_SAMPLES = 5
+MAX_LATENCY_SAMPLES = 64
+
+_URL_PATH_PATTERN = re.compile(r'^(?P<prefix>/api/v\d+)(?P<channel>/[^/]+)?/?$')
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+class RpcTiming(NamedTuple):
+    method: str
+    url: str
+    # number of requests in the JSON-RPC batch, 1 for a single request
+    count: int
+    request_bytes: int
+    response_bytes: int
+    elapsed: float
+    # class name of the exception, "HTTP <status>" for an error response or None
+    error: Optional[str]
+
+
+_response_listeners: List[Callable[[RpcTiming], None]] = []
+
+
+def add_response_listener(listener: Callable[[RpcTiming], None]):
+    """Register a hook called with RpcTiming after every JSON-RPC request sent by this module"""
+    _response_listeners.append(listener)
+
+
+def remove_response_listener(listener: Callable[[RpcTiming], None]):
+    if listener in _response_listeners:
+        _response_listeners.remove(listener)
+
+
+def notify_response(timing: RpcTiming):
+    for listener in list(_response_listeners):
+        listener(timing)
+
+
+def rpc_url(url: str, namespace: str = "icx") -> str:
+    """Return the endpoint serving the given JSON-RPC namespace
+
+    debug_* methods are served by /api/v3d instead of /api/v3
+
+    :param url: node url as like <scheme>://<host>:<port>/api/v3[/<channel>]
+    :param namespace: icx, btp or debug
+    """
+    if namespace != "debug":
+        return url
+
+    ps = urlparse(url)
+    mo = _URL_PATH_PATTERN.match(ps.path)
+    if mo is None:
+        return url
+    return f"{ps.scheme}://{ps.netloc}{mo.group('prefix')}d{mo.group('channel') or ''}"
+
+
+def _session_key(url: str) -> str:
+    ps = urlparse(url)
+    return f"{ps.scheme}://{ps.netloc}"
+
+
+def get_session(url: str, pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Return the keep-alive session shared by every caller talking to the host of url
+
+    Sessions are keyed by scheme and netloc, so /api/v3 and /api/v3d of the same node
+    reuse the same connections. pool_size only takes effect for the first caller.
+
+    :param url: node url
+    :param pool_size: maximum number of connections kept alive for the host
+    :return: requests.Session
+    """
+    key = _session_key(url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json"})
+            _sessions[key] = session
+        return session
+
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def timed_post(session: requests.Session, url: str, data, **kwargs) -> requests.Response:
+    """Post a JSON-RPC request or batch and notify the response listeners"""
+    body = json.dumps(data)
+    response = None
+    error = None
+    started = time.monotonic()
+    try:
+        response = session.post(url=url, data=body, **kwargs)
+        if not response.ok:
+            error = f"HTTP {response.status_code}"
+        return response
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        if _response_listeners:
+            if isinstance(data, list):
+                method, count = (data[0]["method"] if data else ""), len(data)
+            else:
+                method, count = data.get("method", ""), 1
+            notify_response(RpcTiming(
+                method=method,
+                url=url,
+                count=count,
+                request_bytes=len(body),
+                response_bytes=0 if response is None else len(response.content),
+                elapsed=time.monotonic() - started,
+                error=error,
+            ))
+
+
+def post(url: str, data, timeout: Optional[float] = DEFAULT_TIMEOUT) -> requests.Response:
+    return timed_post(get_session(url), url, data, timeout=timeout)
+
+
+class PooledHTTPProvider(HTTPProvider):
+    """HTTPProvider which sends every request over the shared session of its host"""
+
+    def __init__(self, url: str, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT):
+        super().__init__(url, {"timeout": timeout})
+        self._full_path_url = url
+        self._session = get_session(url, pool_size)
+
+    @property
+    def url(self) -> str:
+        return self._full_path_url
+
+    def _make_post_request(self, request_url: str, data, **kwargs) -> requests.Response:
+        return timed_post(self._session, request_url, data, **kwargs)
+
+    def make_batch_request(self, requests_: List[Tuple[str, Optional[dict]]]) -> List[dict]:
+        """Send several JSON-RPC requests as one batch
+
+        :param requests_: list of (method, params). All methods must share the same namespace (icx, debug, ...)
+        :return: full responses in the same order as requests_.
+            Each one has either "result" or "error"
+        """
+        if len(requests_) == 0:
+            return []
+
+        namespaces = {method.split('_')[0] for method, _ in requests_}
+        if len(namespaces) != 1:
+            raise InvalidArgumentException(f"Cannot mix namespaces in a batch: {sorted(namespaces)}")
+
+        batch = []
+        for i, (method, params) in enumerate(requests_):
+            rpc_dict = {'jsonrpc': '2.0', 'method': method, 'id': i}
+            if params:
+                rpc_dict['params'] = params
+            batch.append(rpc_dict)
+
+        request_url = rpc_url(self._full_path_url, namespaces.pop())
+        response = self._make_post_request(request_url, batch, **self._get_request_kwargs())
+        try:
+            content = json.loads(response.content)
+        except JSONDecodeError:
+            raise JsonRpcException(response.content.decode(), response.status_code)
+
+        if not isinstance(content, list):
+            error = content.get("error", {}) if isinstance(content, dict) else {}
+            raise JsonRpcException(error.get("message", "Invalid batch response"), error.get("code", -32000))
+
+        responses = {res.get("id"): res for res in content if isinstance(res, dict)}
+        return [
+            responses.get(i, {
+                'jsonrpc': '2.0',
+                'id': i,
+                'error': {'code': -32000, 'message': "No response in batch"},
+            })
+            for i in range(len(batch))
+        ]
+
+
+def _run_in_thread(fn, *args) -> Future:
+    # Daemon threads, so a slow request which lost the race never blocks the exit
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+class HedgedHTTPProvider(PooledHTTPProvider):
+    """Provider which sends each request to the fastest of several endpoints
+
+    If the endpoint does not answer within the percentile of its recent latencies,
+    or fails, the same request is sent to the next endpoint and the first answer is taken.
+    """
+
+    def __init__(
+            self,
+            urls: Sequence[str],
+            pool_size: int = DEFAULT_POOL_SIZE,
+            timeout: float = DEFAULT_TIMEOUT,
+            percentile: float = HEDGE_PERCENTILE,
+            endpoints=None):
+        """
+        :param endpoints: EndpointManager which ranks the endpoints and is fed with latencies of requests.
+            Without it, endpoints are ranked by their median latency in this process
+        """
+        if len(urls) == 0:
+            raise InvalidArgumentException("No endpoint to send requests")
+
+        super().__init__(urls[0], pool_size, timeout)
+        self._urls = list(urls)
+        self._timeout = timeout
+        self._percentile = percentile
+        self._endpoints = endpoints
+        self._latencies: Dict[str, Deque[float]] = {url: deque(maxlen=MAX_LATENCY_SAMPLES) for url in self._urls}
+        self._latencies_lock = threading.Lock()
+        for url in self._urls[1:]:
+            get_session(url, pool_size)
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self._urls)
+
+    def ranked_urls(self) -> List[str]:
+        """Endpoints ordered by median latency. Endpoints without enough samples keep their order after them"""
+        if self._endpoints is not None:
+            self._endpoints.refresh_async(self._urls)
+            return self._endpoints.rank(self._urls, probe=False)
+
+        with self._latencies_lock:
+            samples = {url: sorted(latencies) for url, latencies in self._latencies.items()}
+
+        known = [url for url in self._urls if len(samples[url]) >= MIN_LATENCY_SAMPLES]
+        known.sort(key=lambda url: samples[url][len(samples[url]) // 2])
+        return known + [url for url in self._urls if url not in known]
+
+    def hedge_delay(self, url: str) -> float:
+        with self._latencies_lock:
+            latencies = sorted(self._latencies[url])
+
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+        delay = latencies[min(len(latencies) - 1, int(len(latencies) * self._percentile))]
+        return min(max(delay, MIN_HEDGE_DELAY), self._timeout)
+
+    def _post(self, url: str, namespace: str, data, kwargs: dict) -> requests.Response:
+        started = time.monotonic()
+        try:
+            response = timed_post(get_session(url), rpc_url(url, namespace), data, **kwargs)
+        except Exception:
+            self._add_latency(url, None)
+            raise
+        self._add_latency(url, time.monotonic() - started)
+        return response
+
+    def _add_latency(self, url: str, latency: Optional[float]):
+        with self._latencies_lock:
+            self._latencies[url].append(self._timeout if latency is None else latency)
+        if self._endpoints is not None:
+            self._endpoints.record(url, latency)
+
+    def _make_post_request(self, request_url: str, data, **kwargs) -> requests.Response:
+        if len(self._urls) == 1:
+            return super()._make_post_request(request_url, data, **kwargs)
+
+        method = data[0]["method"] if isinstance(data, list) else data["method"]
+        namespace = method.split("_")[0]
+        urls = self.ranked_urls()
+
+        first = _run_in_thread(self._post, urls[0], namespace, data, kwargs)
+        done, _ = wait([first], timeout=self.hedge_delay(urls[0]))
+        if len(done) == 1 and first.exception() is None:
+            return first.result()
+
+        second = _run_in_thread(self._post, urls[1], namespace, data, kwargs)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+
+class BatchIconService(IconService):
+    """IconService which can also send JSON-RPC batch requests through its provider"""
+
+    def __init__(self, provider: PooledHTTPProvider):
+        super().__init__(provider)
+        self._provider = provider
+
+    @property
+    def provider(self) -> PooledHTTPProvider:
+        return self._provider
+
+    def batch(self, requests_: List[Tuple[str, Optional[dict]]]) -> List[dict]:
+        return self._provider.make_batch_request(requests_)
+
+
+def create_provider(
+        url: Union[str, Sequence[str]],
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        endpoints=None) -> PooledHTTPProvider:
+    """Create a provider for url. A list of several urls creates a HedgedHTTPProvider"""
+    if isinstance(url, str):
+        return PooledHTTPProvider(url, pool_size, timeout)
+    if len(url) == 1:
+        return PooledHTTPProvider(url[0], pool_size, timeout)
+    return HedgedHTTPProvider(url, pool_size, timeout, endpoints=endpoints)
+
+
+def create_icon_service(
+        url: Union[str, Sequence[str]],
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        endpoints=None) -> BatchIconService:
+    return BatchIconService(create_provider(url, pool_size, timeout, endpoints))
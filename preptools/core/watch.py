@@ -0,0 +1,108 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import time
+from hashlib import sha3_256
+from typing import Any, Callable, Iterator, Optional
+
+import requests
+from iconsdk.exception import IconServiceBaseException
+
+from .diff import diff_fields, diff_records
+from ..exception import JsonRpcException
+
+DEFAULT_WATCH_INTERVAL = 30
+# Block interval of ICON is 2 seconds
+BLOCK_POLL_INTERVAL = 1
+
+
+def response_hash(value: Any) -> str:
+    return sha3_256(json.dumps(value, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def diff_value(old: Any, new: Any) -> Any:
+    """Diff two results of getPRep, getProposal or getProposals"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        if isinstance(old.get("proposals"), list) and isinstance(new.get("proposals"), list):
+            return list(diff_records(old["proposals"], new["proposals"], "id", "proposal"))
+        return diff_fields(old, new)
+    return {"old": old, "new": new}
+
+
+def _fetch_value(fetch: Callable[[], dict]) -> Any:
+    try:
+        response = fetch()
+    except (IconServiceBaseException, requests.RequestException) as e:
+        return {"error": str(e)}
+
+    if "result" in response:
+        return response["result"]
+    return {"error": response.get("error", response)}
+
+
+def watch(
+        fetch: Callable[[], dict],
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        get_block_height: Optional[Callable[[], int]] = None,
+        count: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep) -> Iterator[dict]:
+    """Run fetch repeatedly and yield an event only when its result changed
+
+    The first event has the whole result. Later ones have the diff from the previous result.
+    Results are compared by hash first, so an unchanged result costs no diff.
+
+    :param fetch: returns a JSON-RPC response with "result" or "error"
+    :param interval: seconds between runs without get_block_height
+    :param get_block_height: if set, run once for each new block instead of every interval
+    :param count: number of runs. None means forever
+    """
+    last_hash = None
+    last_value = None
+    last_height = None
+    runs = 0
+    while count is None or runs < count:
+        height = None
+        if get_block_height is not None:
+            height = _wait_block(get_block_height, last_height, sleep)
+            last_height = height
+        elif runs > 0:
+            sleep(interval)
+
+        value = _fetch_value(fetch)
+        runs += 1
+        digest = response_hash(value)
+        if digest == last_hash:
+            continue
+
+        event = {"time": int(time.time())}
+        if height is not None:
+            event["blockHeight"] = hex(height)
+        if last_hash is None:
+            event["result"] = value
+        else:
+            event["changes"] = diff_value(last_value, value)
+        last_hash, last_value = digest, value
+        yield event
+
+
+def _wait_block(get_block_height: Callable[[], int], last_height: Optional[int], sleep) -> int:
+    while True:
+        try:
+            height = get_block_height()
+            if last_height is None or height > last_height:
+                return height
+        except (IconServiceBaseException, JsonRpcException, requests.RequestException):
+            pass
+        sleep(BLOCK_POLL_INTERVAL)
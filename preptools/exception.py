@@ -39,6 +39,7 @@ class PRepToolsExceptionCode(IntEnum):
     FILE_WRITE_ERROR = 11
     FILE_READ_ERROR = 12
     LACK_OF_BALANCE = 13
+    TRANSACTION_ERROR = 14
 
     def __str__(self) -> str:
         return str(self.name).capitalize().replace('_', ' ')
@@ -120,3 +121,9 @@ class LackOfBalanceException(PRepToolsBaseException):
     """Lack of balance"""
     def __init__(self, message: Optional[str]):
         super().__init__(message, PRepToolsExceptionCode.LACK_OF_BALANCE)
+
+
+class TransactionFailedException(PRepToolsBaseException):
+    """Some of the transactions are not sent. message is the report of every transaction"""
+    def __init__(self, message: Optional[dict]):
+        super().__init__(message, PRepToolsExceptionCode.TRANSACTION_ERROR)
@@ -15,52 +15,85 @@
 # limitations under the License.
 
 import argparse
+import shlex
 import sys
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Iterable, Optional, Sequence, Tuple
 
-from .command import *
+# Taken before importing the commands, so that --timings can report their import time as startup
+_STARTED = time.perf_counter()
+
+from .command import find_command, init_commands
 from .exception import PRepToolsExceptionCode, PRepToolsBaseException
+from .utils import timings
 from .utils.constants import DEFAULT_NID, DEFAULT_URL
 from .utils.utils import print_response
 from .version import get_version
 
 
 def main() -> Optional:
-    handlers = (
-        prep_setting_command.init,
-        prep_info_command.init,
-
-        proposal_setting_command.init,
-        make_proposal_command.init,
-        register_proposal2_command.init,
-        proposal_info_command.init,
-
-        bond_command.init,
-        tx_info_command.init,
-        common_command.init,
-    )
+    argv = sys.argv[1:]
+    parser = create_parser(argv)
+    args = parser.parse_args(argv)
+    if args.stdin_commands:
+        sys.exit(run_commands(sys.stdin))
+
+    if not hasattr(args, "func"):
+        parser.print_help(sys.stderr)
+        sys.exit(PRepToolsExceptionCode.OK.value)
+
+    if getattr(args, "timings", False):
+        timings.enable()
+        timings.record("startup", time.perf_counter() - _STARTED)
+
+    response, exit_code = execute(args)
+    print_response(response)
+    if timings.is_enabled():
+        print(timings.format_report(), file=sys.stderr)
+    sys.exit(exit_code)
+
 
+def create_parser(argv: Optional[Sequence[str]] = None) -> argparse.ArgumentParser:
+    """Create the parser for argv
+
+    Only the module of the command selected by argv is imported and builds its parser.
+    None builds the parsers of every command.
+    """
     version = get_version()
     parser = argparse.ArgumentParser(
         prog="preptools",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         description=f"P-Rep management command line interface v{version}")
 
+    parser.add_argument(
+        "--stdin-commands",
+        action="store_true",
+        help="Run the commands read from stdin, one per line, in a single process"
+    )
+
     sub_parser = parser.add_subparsers(title="Available commands", metavar="command")
 
     common_parent_parser = create_common_parser()
 
-    for handler in handlers:
-        handler(sub_parser, common_parent_parser)
+    if argv is None:
+        selected = "*"
+    else:
+        command = find_command(argv)
+        selected = command.module if command is not None else None
+    init_commands(sub_parser, common_parent_parser, selected)
+
+    return parser
+
 
+def execute(args) -> Tuple[Any, int]:
+    """Run the command of parsed args
+
+    :return: response, exit code
+    """
     exit_code: int = PRepToolsExceptionCode.OK.value
     try:
-        args = parser.parse_args()
-        if not hasattr(args, "func"):
-            parser.print_help(sys.stderr)
-            sys.exit(exit_code)
-
-        response: Optional[dict, int, str] = args.func(args)
+        with timings.phase("command"):
+            response: Optional[dict, int, str] = args.func(args)
     except PRepToolsBaseException as e:
         response: Dict[str, Any] = e.message
         exit_code = e.code.value
@@ -71,8 +104,71 @@ def main() -> Optional:
         response = "\nexit"
         exit_code = PRepToolsExceptionCode.COMMAND_ERROR.value
 
-    print_response(response)
-    sys.exit(exit_code)
+    return response, exit_code
+
+
+def run_commands(lines: Iterable[str]) -> int:
+    """Run commands, one per line, in this process
+
+    The parsers, the pooled connections, the caches and the unlocked wallets are shared by the commands.
+    Empty lines and lines starting with # are skipped. "exit" or "quit" stops.
+
+    :return: exit code of the last failed command or OK
+    """
+    from .core.prep import keep_unlocked_wallets
+
+    keep_unlocked_wallets()
+    # module of the selected command -> parser
+    parsers: Dict[Optional[str], argparse.ArgumentParser] = {}
+    exit_code: int = PRepToolsExceptionCode.OK.value
+    for line in lines:
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as e:
+            print_response(str(e))
+            exit_code = PRepToolsExceptionCode.COMMAND_ERROR.value
+            continue
+
+        if len(argv) == 0:
+            continue
+        if argv[0] in ("exit", "quit"):
+            break
+
+        command = find_command(argv)
+        if "--stdin-commands" in argv or (command is not None and command.name == "shell"):
+            print_response("Can't start commands from stdin or a shell inside another one")
+            continue
+
+        module = command.module if command is not None else None
+        if module not in parsers:
+            parsers[module] = create_parser(argv)
+        parser = parsers[module]
+
+        try:
+            args = parser.parse_args(argv)
+        except SystemExit as e:
+            # argparse exits on --help and on invalid arguments
+            if e.code:
+                exit_code = PRepToolsExceptionCode.ARGUMENT_ERROR.value
+            continue
+
+        if not hasattr(args, "func"):
+            parser.print_help(sys.stderr)
+            continue
+
+        if getattr(args, "timings", False):
+            timings.enable()
+        response, code = execute(args)
+        print_response(response)
+        if timings.is_enabled():
+            print(timings.format_report(), file=sys.stderr)
+            timings.disable()
+            timings.clear()
+
+        if code != PRepToolsExceptionCode.OK.value:
+            exit_code = code
+
+    return exit_code
 
 
 def create_common_parser() -> argparse.ArgumentParser:
@@ -81,7 +177,8 @@ def create_common_parser() -> argparse.ArgumentParser:
         "--url", "-u",
         type=str,
         required=False,
-        help=f"node url default({DEFAULT_URL})"
+        help=f"node url default({DEFAULT_URL}). Predefined names (mainnet, lisbon, berlin) can be used.\n"
+             f"Several urls separated by commas hedge read requests across them"
     )
     parent_parser.add_argument(
         "--nid", "-n",
@@ -108,6 +205,19 @@ def create_common_parser() -> argparse.ArgumentParser:
         action='store_true',
         dest='verbose'
     )
+    parent_parser.add_argument(
+        "--no-cache",
+        help="Don't read or store results which never change (old blocks, finalized transactions) "
+             "and chain constants (step price) in the disk cache",
+        action='store_true',
+        dest='no_cache'
+    )
+    parent_parser.add_argument(
+        "--timings",
+        help="Print the time spent in each phase and JSON-RPC method to stderr at exit",
+        action='store_true',
+        dest='timings'
+    )
 
     return parent_parser
 
@@ -0,0 +1,543 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local stand-in for an ICON node, for load and latency tests without network
+
+It serves the JSON-RPC methods used by preptools from an in-memory state, including batch requests.
+Transactions are not verified. They are included in the next block and their effects on stake, bond
+and bonder list are applied, so readers see them.
+
+    python -m preptools.testing.mock_node --port 9000 --preps 150 --latency 0.02 --error-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from hashlib import sha3_256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from ..utils.constants import GOVERNANCE_ADDRESS, SYSTEM_SCORE_ADDRESS
+
+DEFAULT_BLOCK_INTERVAL = 2.0
+DEFAULT_STEP_PRICE = 12_500_000_000
+DEFAULT_BALANCE = 10 ** 24
+# Step of icx_estimateStep: base step plus step per byte of the data
+BASE_STEP = 100_000
+STEP_PER_BYTE = 25
+MAIN_PREPS = 22
+REVISION = 24
+
+INVALID_PARAMS_ERROR_CODE = -32602
+METHOD_NOT_FOUND_ERROR_CODE = -32601
+SERVER_ERROR_CODE = -32000
+SCORE_NOT_FOUND_ERROR_CODE = -30032
+PENDING_ERROR_CODE = -31002
+TX_NOT_FOUND_ERROR_CODE = -31004
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def _address(prefix: str, seed: int, i: int) -> str:
+    return "hx" + sha3_256(f"{prefix}:{seed}:{i}".encode()).hexdigest()[:40]
+
+
+def _hash(value: Any) -> str:
+    return "0x" + sha3_256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+class MockState:
+    """P-Reps, proposals and accounts served by MockNode
+
+    preps are in ranking order and proposals are oldest first.
+    accounts is {address: {"balance": int, "stake": hex, "delegations": [...], "bonds": [...], "bonderList": [...]}}
+    """
+
+    def __init__(
+            self,
+            preps: Optional[List[dict]] = None,
+            proposals: Optional[List[dict]] = None,
+            accounts: Optional[Dict[str, dict]] = None,
+            step_price: int = DEFAULT_STEP_PRICE,
+            default_balance: int = DEFAULT_BALANCE):
+        self.preps: List[dict] = preps or []
+        self.proposals: List[dict] = proposals or []
+        self.accounts: Dict[str, dict] = accounts or {}
+        self.step_price = step_price
+        self.default_balance = default_balance
+        self._prep_index = {prep["address"]: prep for prep in self.preps}
+        self._proposal_index = {proposal["id"]: proposal for proposal in self.proposals}
+
+    @classmethod
+    def synthetic(cls, preps: int = 100, proposals: int = 20, accounts: int = 0, seed: int = 0) -> "MockState":
+        rand = random.Random(seed)
+        prep_list = []
+        for i in range(preps):
+            address = _address("prep", seed, i)
+            power = (preps - i) * 10 ** 24 + rand.randrange(10 ** 23)
+            prep_list.append({
+                "address": address,
+                "name": f"node{i}",
+                "country": "KOR",
+                "city": "Seoul",
+                "email": f"node{i}@example.com",
+                "website": f"https://node{i}.example.com",
+                "details": f"https://node{i}.example.com/json",
+                "p2pEndpoint": f"node{i}.example.com:7100",
+                "nodeAddress": address,
+                "status": "0x0",
+                "grade": "0x0" if i < MAIN_PREPS else "0x1" if i < 100 else "0x2",
+                "penalty": "0x0",
+                "power": hex(power),
+                "bonded": hex(power // 20),
+                "delegated": hex(power - power // 20),
+                "lastHeight": hex(1000 + i),
+                "totalBlocks": hex(10000),
+                "validatedBlocks": hex(10000 - rand.randrange(100)),
+            })
+
+        proposal_list = []
+        for i in range(proposals):
+            proposer = prep_list[i % len(prep_list)] if prep_list else {"address": _address("prep", seed, 0)}
+            proposal_list.append({
+                "id": _hash(["proposal", seed, i]),
+                "proposer": proposer["address"],
+                "proposerName": proposer.get("name", ""),
+                "status": hex(i % 6),
+                "startBlockHeight": hex(1000 + i * 100),
+                "endBlockHeight": hex(1000 + i * 100 + 43200),
+                "contents": {
+                    "title": f"proposal {i}",
+                    "description": f"description of proposal {i}",
+                    "type": hex(i % 10),
+                    "value": {"text": f"proposal {i}"},
+                },
+                "vote": {
+                    "agree": {"count": "0x0", "amount": "0x0", "list": []},
+                    "disagree": {"count": "0x0", "amount": "0x0", "list": []},
+                    "noVote": {"count": hex(min(len(prep_list), MAIN_PREPS)), "amount": "0x0", "list": []},
+                },
+            })
+
+        account_map = {}
+        for i in range(accounts):
+            bonds = []
+            if prep_list:
+                prep = prep_list[rand.randrange(len(prep_list))]
+                bonds.append({"address": prep["address"], "value": hex(rand.randrange(1, 10 ** 6) * 10 ** 18)})
+            account_map[_address("account", seed, i)] = {
+                "balance": rand.randrange(10 ** 6) * 10 ** 18,
+                "stake": hex(rand.randrange(10 ** 6) * 10 ** 18),
+                "bonds": bonds,
+            }
+        for prep in prep_list:
+            account_map.setdefault(prep["address"], {})["bonderList"] = [prep["address"]]
+
+        return cls(prep_list, proposal_list, account_map)
+
+    @classmethod
+    def load(cls, path: str) -> "MockState":
+        with open(path) as f:
+            data = json.load(f)
+        accounts = {address: dict(account) for address, account in data.get("accounts", {}).items()}
+        for account in accounts.values():
+            if isinstance(account.get("balance"), str):
+                account["balance"] = int(account["balance"], 0)
+        return cls(
+            data.get("preps"),
+            data.get("proposals"),
+            accounts,
+            int(data.get("stepPrice", hex(DEFAULT_STEP_PRICE)), 0),
+        )
+
+    def to_dict(self) -> dict:
+        accounts = {
+            address: {**account, "balance": hex(account["balance"])} if "balance" in account else account
+            for address, account in self.accounts.items()
+        }
+        return {"preps": self.preps, "proposals": self.proposals, "accounts": accounts,
+                "stepPrice": hex(self.step_price)}
+
+    def account(self, address: str) -> dict:
+        account = self.accounts.setdefault(address, {})
+        account.setdefault("balance", self.default_balance)
+        return account
+
+    def prep(self, address: str) -> Optional[dict]:
+        return self._prep_index.get(address)
+
+    def proposal(self, _id: str) -> Optional[dict]:
+        return self._proposal_index.get(_id)
+
+
+class MockNode:
+    """HTTP server answering ICON JSON-RPC requests from a MockState
+
+    :param latency: seconds added to every HTTP request
+    :param jitter: random seconds, up to this value, added on top of latency
+    :param error_rate: ratio of HTTP requests answered with an HTTP 500 and a JSON-RPC server error
+    :param block_interval: seconds between blocks. Transactions are included in the next block.
+        With 0, every transaction is included at once in a block of its own
+    """
+
+    def __init__(
+            self,
+            state: Optional[MockState] = None,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            block_interval: float = DEFAULT_BLOCK_INTERVAL,
+            seed: Optional[int] = None):
+        self.state = state if state is not None else MockState.synthetic()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        if block_interval < 0:
+            raise ValueError(f"block_interval must not be negative: {block_interval}")
+        self.block_interval = block_interval
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        # Height of the last block when block_interval is 0
+        self._height = 1
+        # tx hash -> (transaction, height of the block including it)
+        self._transactions: Dict[str, tuple] = {}
+        self._results: Dict[str, dict] = {}
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.node = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v3"
+
+    @property
+    def block_height(self) -> int:
+        if self.block_interval == 0:
+            return self._height
+        return 1 + int((time.monotonic() - self._started) / self.block_interval)
+
+    def start(self) -> "MockNode":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> "MockNode":
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def handle(self, request: dict) -> dict:
+        """Return the JSON-RPC response of a single request"""
+        method = request.get("method")
+        with self._lock:
+            self.requests[method] += 1
+        try:
+            result = self._dispatch(method, request.get("params") or {})
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+        except RpcError as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": e.code, "message": e.message}}
+
+    def inject(self) -> bool:
+        """Sleep the injected latency and return True if this request has to fail"""
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter > 0 else 0)
+        if delay > 0:
+            time.sleep(delay)
+        return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def _dispatch(self, method: str, params: dict) -> Any:
+        if method == "icx_call":
+            return self._call(params)
+        if method in ("icx_estimateStep", "debug_estimateStep"):
+            return hex(BASE_STEP + STEP_PER_BYTE * len(json.dumps(params.get("data", ""))))
+        if method == "icx_sendTransaction":
+            return self._send_transaction(params)
+        if method == "icx_getTransactionResult":
+            return self._transaction_result(params.get("txHash"))
+        if method == "icx_getTransactionByHash":
+            return self._transaction(params.get("txHash"))
+        if method == "icx_getBalance":
+            with self._lock:
+                return hex(self.state.account(params["address"])["balance"])
+        if method in ("icx_getLastBlock", "icx_getBlockByHeight"):
+            height = int(params["height"], 16) if "height" in params else self.block_height
+            return {"height": height, "block_hash": _hash(["block", height])[2:], "time_stamp": int(time.time() * 10 ** 6),
+                    "confirmed_transaction_list": []}
+        raise RpcError(METHOD_NOT_FOUND_ERROR_CODE, f"MethodNotFound: {method}")
+
+    def _call(self, params: dict) -> Any:
+        data = params.get("data") or {}
+        method = data.get("method")
+        args = data.get("params") or {}
+        state = self.state
+
+        with self._lock:
+            if params.get("to") == GOVERNANCE_ADDRESS:
+                if method == "getProposal":
+                    proposal = state.proposal(args.get("id"))
+                    if proposal is None:
+                        raise RpcError(SCORE_NOT_FOUND_ERROR_CODE, "Proposal not found")
+                    return proposal
+                if method == "getProposals":
+                    return {"proposals": self._proposals(args)}
+            elif method == "getPRep":
+                prep = state.prep(args.get("address"))
+                if prep is None:
+                    raise RpcError(SCORE_NOT_FOUND_ERROR_CODE, f"PRep not found: {args.get('address')}")
+                return prep
+            elif method == "getPReps":
+                return self._preps(args)
+            elif method == "getStake":
+                account = state.account(args["address"])
+                return {"stake": account.get("stake", "0x0"), "unstakes": account.get("unstakes", [])}
+            elif method == "getBond":
+                account = state.account(args["address"])
+                bonds = account.get("bonds", [])
+                return {
+                    "bonds": bonds,
+                    "unbonds": account.get("unbonds", []),
+                    "totalBonded": hex(sum(int(bond["value"], 16) for bond in bonds)),
+                }
+            elif method == "getDelegation":
+                account = state.account(args["address"])
+                delegations = account.get("delegations", [])
+                total = sum(int(delegation["value"], 16) for delegation in delegations)
+                return {
+                    "delegations": delegations,
+                    "totalDelegated": hex(total),
+                    "votingPower": hex(int(account.get("stake", "0x0"), 16) - total),
+                }
+            elif method == "getBonderList":
+                if state.prep(args.get("address")) is None:
+                    raise RpcError(SCORE_NOT_FOUND_ERROR_CODE, f"PRep not found: {args.get('address')}")
+                return {"bonderList": state.account(args["address"]).get("bonderList", [])}
+            elif method == "getStepPrice":
+                return hex(state.step_price)
+            elif method == "getStepCosts":
+                return {"default": hex(BASE_STEP), "input": hex(STEP_PER_BYTE)}
+            elif method == "getRevision":
+                return hex(REVISION)
+
+        raise RpcError(SCORE_NOT_FOUND_ERROR_CODE, f"Method not found: {method}")
+
+    def _preps(self, args: dict) -> dict:
+        preps = self.state.preps
+        start = int(args.get("startRanking", "0x1"), 0)
+        end = int(args.get("endRanking", hex(len(preps))), 0)
+        if start < 1 or start > max(len(preps), 1) or end < start:
+            raise RpcError(INVALID_PARAMS_ERROR_CODE, "Invalid ranking")
+        return {
+            "blockHeight": args.get("blockHeight", hex(self.block_height)),
+            "startRanking": hex(start),
+            "totalDelegated": hex(sum(int(p.get("delegated", "0x0"), 16) for p in preps)),
+            "totalStake": hex(sum(int(p.get("power", "0x0"), 16) for p in preps)),
+            "preps": preps[start - 1:end],
+        }
+
+    def _proposals(self, args: dict) -> List[dict]:
+        type_ = args.get("type")
+        status = args.get("status")
+        start = int(str(args.get("start", 0)), 0)
+        size = int(str(args.get("size", 10)), 0)
+        # The latest one comes first, and status 0 means all
+        proposals = [
+            p for p in reversed(self.state.proposals)
+            if (type_ is None or int(p["contents"]["type"], 16) == int(str(type_), 0))
+            and (status is None or int(str(status), 0) == 0 or int(p["status"], 16) == int(str(status), 0))
+        ]
+        return proposals[start:start + size]
+
+    def _send_transaction(self, params: dict) -> str:
+        for key in ("from", "to", "stepLimit", "nid", "signature"):
+            if key not in params:
+                raise RpcError(INVALID_PARAMS_ERROR_CODE, f"Missing {key}")
+
+        tx_hash = _hash(params)
+        with self._lock:
+            if self.block_interval == 0:
+                self._height += 1
+                self._transactions[tx_hash] = (params, self._height)
+            else:
+                self._transactions[tx_hash] = (params, self.block_height + 1)
+        return tx_hash
+
+    def _transaction(self, tx_hash: str) -> dict:
+        with self._lock:
+            if tx_hash not in self._transactions:
+                raise RpcError(TX_NOT_FOUND_ERROR_CODE, f"NotFound: {tx_hash}")
+            params, height = self._transactions[tx_hash]
+        tx = {**params, "txHash": tx_hash}
+        if height <= self.block_height:
+            tx.update({"blockHeight": hex(height), "blockHash": _hash(["block", height]), "txIndex": "0x0"})
+        return tx
+
+    def _transaction_result(self, tx_hash: str) -> dict:
+        with self._lock:
+            if tx_hash not in self._transactions:
+                raise RpcError(TX_NOT_FOUND_ERROR_CODE, f"NotFound: {tx_hash}")
+            params, height = self._transactions[tx_hash]
+            if height > self.block_height:
+                raise RpcError(PENDING_ERROR_CODE, "Pending")
+
+            result = self._results.get(tx_hash)
+            if result is None:
+                result = self._execute(tx_hash, params, height)
+            return result
+
+    def _execute(self, tx_hash: str, params: dict, height: int) -> dict:
+        """Apply the transaction to the state once and keep its result"""
+        data = params.get("data") or {}
+        step_used = BASE_STEP + STEP_PER_BYTE * len(json.dumps(data))
+        account = self.state.account(params["from"])
+        account["balance"] = max(0, account["balance"] - step_used * self.state.step_price)
+
+        failure = None
+        if params.get("to") == SYSTEM_SCORE_ADDRESS and isinstance(data, dict):
+            method, args = data.get("method"), data.get("params") or {}
+            if method == "setStake":
+                account["stake"] = args.get("value", "0x0")
+            elif method == "setBond":
+                account["bonds"] = args.get("bonds", [])
+            elif method == "setBonderList":
+                if self.state.prep(params["from"]) is None:
+                    failure = {"code": "0x20", "message": "PRep not found"}
+                else:
+                    account["bonderList"] = args.get("bonderList", [])
+
+        result = {
+            "txHash": tx_hash,
+            "status": "0x0" if failure else "0x1",
+            "blockHeight": hex(height),
+            "blockHash": _hash(["block", height]),
+            "txIndex": "0x0",
+            "to": params.get("to"),
+            "stepUsed": hex(step_used),
+            "stepPrice": hex(self.state.step_price),
+            "cumulativeStepUsed": hex(step_used),
+            "eventLogs": [],
+            "logsBloom": "0x" + "0" * 512,
+        }
+        if failure:
+            result["failure"] = failure
+        self._results[tx_hash] = result
+        return result
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients reuse their connections like with a real node
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which Nagle's algorithm would delay until the client ACKs
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        node: MockNode = self.server.node
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if node.inject():
+            self._send(500, {"jsonrpc": "2.0", "id": None,
+                             "error": {"code": SERVER_ERROR_CODE, "message": "Injected error"}})
+            return
+
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._send(400, {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}})
+            return
+
+        if isinstance(request, list):
+            self._send(200, [node.handle(r) for r in request])
+        else:
+            self._send(200, node.handle(request))
+
+    def _send(self, status: int, response: Any):
+        data = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _non_negative(value: str) -> float:
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for an ICON node")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--state", help="JSON file of preps, proposals, accounts and stepPrice")
+    parser.add_argument("--preps", type=int, default=100, help="Number of synthetic P-Reps without --state")
+    parser.add_argument("--proposals", type=int, default=20, help="Number of synthetic proposals without --state")
+    parser.add_argument("--accounts", type=int, default=0, help="Number of synthetic accounts without --state")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random seconds added on top of latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Ratio of requests failing with HTTP 500")
+    parser.add_argument("--block-interval", type=_non_negative, default=DEFAULT_BLOCK_INTERVAL,
+                        help="Seconds between blocks. 0 includes every transaction at once")
+    parser.add_argument("--dump-state", help="Write the synthetic state to this file and exit")
+    args = parser.parse_args()
+
+    if args.state:
+        state = MockState.load(args.state)
+    else:
+        state = MockState.synthetic(args.preps, args.proposals, args.accounts, args.seed)
+
+    if args.dump_state:
+        with open(args.dump_state, "w") as f:
+            json.dump(state.to_dict(), f, indent=4)
+        return
+
+    node = MockNode(state, args.host, args.port, args.latency, args.jitter, args.error_rate,
+                    args.block_interval, args.seed)
+    print(f"Serving {node.url}", flush=True)
+    try:
+        node.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -14,10 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
-from typing import Optional
+from typing import List, Optional, Union
 
 DIR_PATH = os.path.abspath(os.path.dirname(__file__))
 PROJECT_ROOT_PATH = os.path.abspath(os.path.join(DIR_PATH, '..', '..'))
+PREPTOOLS_HOME = os.environ.get("PREPTOOLS_HOME", os.path.join(os.path.expanduser("~"), ".preptools"))
 
 EOA_ADDRESS = "hx1234567890123456789012345678901234567890"
 GOVERNANCE_ADDRESS = "cx0000000000000000000000000000000000000001"
@@ -111,3 +112,10 @@ def resolve_url(url: str) -> str:
     if new_url:
         return new_url
     return url
+
+
+def resolve_urls(url: Union[str, List[str]]) -> List[str]:
+    """Resolve a list of urls or predefined names. A string may hold several of them separated by commas"""
+    if isinstance(url, str):
+        url = url.split(",")
+    return [resolve_url(u.strip()) for u in url if u.strip()]
@@ -0,0 +1,190 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from preptools.core import transport
+from preptools.utils.constants import PREPTOOLS_HOME
+
+DEFAULT_ENDPOINTS_PATH = os.path.join(PREPTOOLS_HOME, "endpoints.json")
+
+EWMA_ALPHA = 0.3
+# Seconds after which an endpoint is probed again
+PROBE_INTERVAL = 300
+# Unhealthy endpoints are retried sooner so a recovered node comes back quickly
+UNHEALTHY_PROBE_INTERVAL = 60
+PROBE_TIMEOUT = 2
+SAVE_INTERVAL = 5
+
+
+class EndpointManager:
+    """Ranks node endpoints by an exponentially weighted moving average of their latency
+
+    Endpoints are probed with icx_getLastBlock when their score is older than PROBE_INTERVAL.
+    Latencies of real requests can be fed with record(), and scores are saved to path,
+    so a short-lived command starts from the ranking of the previous ones.
+    """
+
+    def __init__(self, path: Optional[str] = None, alpha: float = EWMA_ALPHA, probe_interval: float = PROBE_INTERVAL):
+        self._path = path
+        self._alpha = alpha
+        self._probe_interval = probe_interval
+        self._lock = threading.Lock()
+        # url -> {"latency": float, "healthy": bool, "updatedAt": float}
+        self._scores: Dict[str, dict] = {}
+        self._saved_at = 0.0
+        self._dirty = False
+        self._refreshing = False
+        self._load()
+
+    def score(self, url: str) -> Optional[dict]:
+        with self._lock:
+            score = self._scores.get(url)
+            return None if score is None else dict(score)
+
+    def record(self, url: str, latency: Optional[float]):
+        """Update the score of url
+
+        :param url: node url
+        :param latency: seconds taken by a request. None means the request failed
+        """
+        now = time.time()
+        with self._lock:
+            score = self._scores.get(url)
+            if latency is None:
+                if score is None:
+                    score = self._scores[url] = {"latency": PROBE_TIMEOUT}
+                score["healthy"] = False
+            elif score is None or not score.get("healthy", False):
+                score = self._scores[url] = {"latency": latency, "healthy": True}
+            else:
+                score["latency"] = self._alpha * latency + (1 - self._alpha) * score["latency"]
+            score["updatedAt"] = now
+            self._dirty = True
+
+            if now - self._saved_at > SAVE_INTERVAL:
+                self._save()
+
+    def probe(self, url: str) -> Optional[float]:
+        started = time.monotonic()
+        try:
+            response = transport.post(url, {"jsonrpc": "2.0", "method": "icx_getLastBlock", "id": 1}, PROBE_TIMEOUT)
+            ok = response.ok and "result" in response.json()
+        except Exception:
+            ok = False
+
+        latency = time.monotonic() - started if ok else None
+        self.record(url, latency)
+        return latency
+
+    def _is_stale(self, url: str, now: float) -> bool:
+        score = self._scores.get(url)
+        if score is None:
+            return True
+        interval = self._probe_interval if score.get("healthy") else UNHEALTHY_PROBE_INTERVAL
+        return now - score.get("updatedAt", 0) > interval
+
+    def rank(self, urls: List[str], probe: bool = True) -> List[str]:
+        """Order urls from the best one. Healthy endpoints come first, by latency
+
+        :param urls: candidate endpoints
+        :param probe: probe endpoints whose score is stale before ranking
+        """
+        if probe:
+            now = time.time()
+            with self._lock:
+                stale = [url for url in urls if self._is_stale(url, now)]
+            if len(stale) > 0:
+                with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+                    list(executor.map(self.probe, stale))
+
+        with self._lock:
+            scores = {url: self._scores.get(url) for url in urls}
+
+        def key(url: str):
+            score = scores[url]
+            if score is None:
+                return 1, 0.0
+            return (0 if score.get("healthy") else 2), score["latency"]
+
+        # sorted() is stable, so endpoints without score keep the given order
+        return sorted(urls, key=key)
+
+    def refresh_async(self, urls: List[str]):
+        """Probe stale endpoints in background, so long running commands keep re-ranking them"""
+        now = time.time()
+        with self._lock:
+            if self._refreshing:
+                return
+            stale = [url for url in urls if self._is_stale(url, now)]
+            if len(stale) == 0:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                for url in stale:
+                    self.probe(url)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def save(self):
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _load(self):
+        if self._path is None:
+            return
+
+        try:
+            with open(self._path) as f:
+                self._scores = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def _save(self):
+        self._saved_at = time.time()
+        self._dirty = False
+        if self._path is None:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = f"{self._path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._scores, f)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            pass
+
+
+_default_manager: Optional[EndpointManager] = None
+
+
+def get_default_endpoint_manager() -> EndpointManager:
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = EndpointManager(DEFAULT_ENDPOINTS_PATH)
+        atexit.register(_default_manager.save)
+    return _default_manager
@@ -0,0 +1,109 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from preptools.core.transport import RpcTiming
+
+_enabled = False
+_lock = threading.Lock()
+# phase -> [count, total seconds, max seconds, request bytes, response bytes, errors]
+_phases: Dict[str, List[float]] = {}
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    """Start collecting the time spent in each phase and in each JSON-RPC method"""
+    # Imported here, so that the CLI doesn't load requests and iconsdk before a command needs them
+    from preptools.core import transport
+
+    global _enabled
+    if not _enabled:
+        _enabled = True
+        transport.add_response_listener(_on_response)
+
+
+def disable():
+    from preptools.core import transport
+
+    global _enabled
+    _enabled = False
+    transport.remove_response_listener(_on_response)
+
+
+def clear():
+    with _lock:
+        _phases.clear()
+
+
+def record(name: str, elapsed: float, request_bytes: int = 0, response_bytes: int = 0, error: bool = False):
+    if not _enabled:
+        return
+
+    with _lock:
+        entry = _phases.setdefault(name, [0, 0.0, 0.0, 0, 0, 0])
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] = max(entry[2], elapsed)
+        entry[3] += request_bytes
+        entry[4] += response_bytes
+        entry[5] += int(error)
+
+
+@contextmanager
+def phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def _on_response(timing: "RpcTiming"):
+    name = f"rpc {timing.method}" if timing.count == 1 else f"rpc batch {timing.method}"
+    record(name, timing.elapsed, timing.request_bytes, timing.response_bytes, timing.error is not None)
+
+
+def get_phases() -> Dict[str, dict]:
+    with _lock:
+        return {
+            name: {
+                "count": int(e[0]),
+                "total": e[1],
+                "max": e[2],
+                "requestBytes": int(e[3]),
+                "responseBytes": int(e[4]),
+                "errors": int(e[5]),
+            }
+            for name, e in _phases.items()
+        }
+
+
+def format_report() -> str:
+    phases = get_phases()
+    width = max([len(name) for name in phases] + [5])
+    lines = [f"{'phase':<{width}} {'count':>6} {'total(ms)':>10} {'max(ms)':>10} {'sent':>9} {'recv':>9} {'errors':>6}"]
+    for name, p in sorted(phases.items(), key=lambda item: -item[1]["total"]):
+        lines.append(
+            f"{name:<{width}} {p['count']:>6} {p['total'] * 1000:>10.1f} {p['max'] * 1000:>10.1f} "
+            f"{p['requestBytes']:>9} {p['responseBytes']:>9} {p['errors']:>6}"
+        )
+    return "\n".join(lines)
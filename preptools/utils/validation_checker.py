@@ -12,15 +12,19 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import json
 import re
+import threading
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import iso3166
-import requests
 
+from preptools.core import transport
 from preptools.exception import InvalidFormatException, JsonRpcException, InvalidArgumentException
 from preptools.utils.constants import fields_to_validate, ConstantKeys
 
+if TYPE_CHECKING:
+    from preptools.core.prep import PreSendInfo
+
 scheme_pattern = r'^(http:\/\/|https:\/\/)'
 path_pattern = r'(\/\S*)?$'
 port_regex = r'(:[0-9]{1,5})?'
@@ -286,10 +290,48 @@ def _is_lowercase_hex_string(value: str) -> bool:
     return False
 
 
-def check_enough_balance(url: str, data: dict) -> bool:
+def check_enough_balance(url: str, data: dict, pre_send: Optional['PreSendInfo'] = None) -> bool:
     address = data["from_"]
     value = data.get("value", 0)
     step_limit = data["step_limit"]
+    if pre_send is not None and pre_send.balance is not None and pre_send.step_price is not None:
+        balance, step_price = pre_send.balance, pre_send.step_price
+    else:
+        balance, step_price = _get_balance_and_step_price(url, address)
+
+    if balance - (step_price * step_limit + value) > 0:
+        return True
+    else:
+        print(f"Your balance({balance}) < cost(stepPrice * stepLimit + value): ({step_price * step_limit + value})")
+        return False
+
+
+class BalanceBudget:
+    """Send listener checking many transactions against a balance fetched once
+
+    Every accepted transaction reserves its cost(stepPrice * stepLimit + value),
+    so the following ones are checked against what is left.
+    """
+
+    def __init__(self, balance: int, step_price: int):
+        self._balance = balance
+        self._step_price = step_price
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, data: dict) -> bool:
+        cost = self._step_price * data["step_limit"] + data.get("value", 0)
+        with self._lock:
+            left = self._balance - self._reserved
+            if left - cost > 0:
+                self._reserved += cost
+                return True
+
+        print(f"Your balance left({left}) < cost(stepPrice * stepLimit + value): ({cost})")
+        return False
+
+
+def _get_balance_and_step_price(url: str, address: str) -> Tuple[int, int]:
     balance_id, step_price_id = 1, 2
     balance_request = {
         'jsonrpc': '2.0',
@@ -310,8 +352,7 @@ def check_enough_balance(url: str, data: dict) -> bool:
         }
     }
     batch_request = [balance_request, step_price_request]
-    with requests.Session() as session:
-        response = session.post(url=url, data=json.dumps(batch_request))
+    response = transport.post(url, batch_request)
     if response.ok:
         balance_res, step_res = None, None
         res_list = response.json()
@@ -320,13 +361,7 @@ def check_enough_balance(url: str, data: dict) -> bool:
                 balance_res = res
             else:
                 step_res = res
-        balance = int(balance_res["result"], 0)
-        step_price = int(step_res["result"], 0)
-        if balance - (step_price * step_limit + value) > 0:
-            return True
-        else:
-            print(f"Your balance({balance}) < cost(stepPrice * stepLimit + value): ({step_price * step_limit + value})")
-            return False
+        return int(balance_res["result"], 0), int(step_res["result"], 0)
     raise JsonRpcException("Error while checking balance")
 
 
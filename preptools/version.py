@@ -1,11 +1,18 @@
-import pkg_resources
-
 __version__ = "1.3.2"
 
 
 def get_version() -> str:
+    # Imported here, as pkg_resources takes long to import and this runs on every command
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        import pkg_resources
+        try:
+            return pkg_resources.get_distribution('preptools').version
+        except pkg_resources.DistributionNotFound:
+            return __version__
+
     try:
-        version = pkg_resources.get_distribution('preptools').version
-    except pkg_resources.DistributionNotFound:
-        version = __version__
-    return version
+        return version('preptools')
+    except PackageNotFoundError:
+        return __version__
@@ -5,7 +5,9 @@ with open("requirements.txt") as requirements:
     requires = list(requirements)
 
 extras_requires = {
-    'tests': ['pytest~=6.2.5']
+    'tests': ['pytest~=6.2.5', 'aiohttp>=3.8.0'],
+    'parquet': ['pyarrow'],
+    'async': ['aiohttp>=3.8.0'],
 }
 
 setup_options = {
@@ -14,7 +16,7 @@ setup_options = {
     'description': 'P-Rep management command line interface',
     'author': 'ICON Foundation',
     'author_email': 'foo@icon.foundation',
-    'packages': find_packages(exclude=['tests*', 'docs']),
+    'packages': find_packages(exclude=['tests*', 'benchmarks*', 'docs']),
     'url': 'https://github.com/icon-project/preptools',
     'long_description_content_type': 'text/markdown',
     'long_description': open('README.md').read(),
@@ -42,6 +42,12 @@ class IconService:
     def estimate_step(self, transaction):
         return 10000000
 
+    def batch(self, requests) -> list:
+        return [
+            {'jsonrpc': '2.0', 'id': i, 'result': self.make_request(method, params)}
+            for i, (method, params) in enumerate(requests)
+        ]
+
     def make_request(self, method, params) -> dict:
 
         rpc_dict = {
@@ -0,0 +1,50 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from benchmarks.startup import compare, parse_importtime
+from benchmarks.throughput import percentile
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_percentile(self):
+        self.assertEqual(0.0, percentile([], 50))
+        self.assertEqual([7, 7, 7], [percentile([7], p) for p in (50, 95, 99)])
+        self.assertEqual([1, 2, 2], [percentile([1, 2], p) for p in (50, 95, 99)])
+
+        values = list(range(1, 21))
+        self.assertEqual([1, 10, 19, 20, 20], [percentile(values, p) for p in (0, 50, 95, 99, 100)])
+
+    def test_parse_importtime(self):
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   json.decoder",
+            "import time:       200 |        300 | json",
+            "import time:        50 |       1000 | preptools",
+            "unrelated line",
+        ])
+        self.assertEqual(
+            [("preptools", 50, 1000), ("json", 200, 300), ("json.decoder", 100, 100)],
+            parse_importtime(output))
+
+    def test_compare(self):
+        baseline = {"a": {"wall": 0.1, "rss": 1000}, "b": {"wall": 0.1, "rss": 1000}}
+        results = {
+            "a": {"wall": 0.119, "rss": 1200},
+            "b": {"wall": 0.121, "rss": 1201},
+            "c": {"wall": 1.0, "rss": 10000},
+        }
+        self.assertEqual(["b: wall 100ms -> 121ms", "b: rss 1000KiB -> 1201KiB"], compare(results, baseline, 0.2))
@@ -0,0 +1,141 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from preptools.command.bond_command import MAX_BONDS, get_unbonds_after_set_bond, parse_bonds
+from preptools.exception import InvalidArgumentException, PRepToolsExceptionCode
+from preptools.preptools_cli import create_parser, execute
+from preptools.testing.mock_node import MockNode, MockState
+from tests.commons.constants import TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD
+
+OWNER = "hxef73db5d0ad02eb1fadb37d0041be96bfa56d4e6"
+
+
+def _address(i: int) -> str:
+    return f"hx{i:040x}"
+
+
+class TestSetBond(unittest.TestCase):
+
+    def test_parse_bonds(self):
+        bonds = parse_bonds([[_address(1), "0x10"], [], [f" {_address(2)} ", "100"]])
+        self.assertEqual([{"address": _address(1), "value": "0x10"}, {"address": _address(2), "value": "0x64"}], bonds)
+
+        with self.assertRaises(InvalidArgumentException) as cm:
+            parse_bonds([
+                [_address(1), "1"],
+                ["cx" + "1" * 40, "1"],
+                [_address(1), "-1"],
+                [_address(3)],
+            ])
+        message = str(cm.exception.message)
+        self.assertIn("row 2: invalid address", message)
+        self.assertIn("row 3: hx0000000000000000000000000000000000000001 is duplicated with row 1", message)
+        self.assertIn("row 3: invalid value -1", message)
+        self.assertIn("row 4: should be PREP_ADDRESS,VALUE", message)
+
+        with self.assertRaises(InvalidArgumentException):
+            parse_bonds([[_address(i), "1"] for i in range(MAX_BONDS + 1)])
+
+    def test_get_unbonds_after_set_bond(self):
+        def items(*values):
+            return [{"address": _address(i), "value": hex(v)} for i, v in values]
+
+        bonds = items((1, 50), (2, 30), (3, 20))
+        unbonds = items((2, 10), (4, 5))
+        # 1 is lowered, 2 is raised and takes back its unbond, 3 is removed, 4 keeps its unbond
+        self.assertEqual(
+            {_address(1): 40, _address(3): 20, _address(4): 5},
+            get_unbonds_after_set_bond(bonds, unbonds, items((1, 10), (2, 40))))
+        # 2 is raised by less than its unbond
+        self.assertEqual({_address(2): 6}, get_unbonds_after_set_bond(items((2, 30)), items((2, 10)), items((2, 34))))
+        self.assertEqual({}, get_unbonds_after_set_bond([], [], items((1, 10))))
+
+    def test_set_bond_lowering_bonds(self):
+        state = MockState.synthetic(preps=3, proposals=0)
+        preps = [prep["address"] for prep in state.preps]
+        state.accounts[OWNER] = {
+            "stake": hex(110),
+            "delegations": [{"address": _address(9), "value": hex(40)}],
+            "bonds": [{"address": preps[0], "value": hex(50)}],
+            "unbonds": [{"address": preps[1], "value": hex(10), "expireBlockHeight": "0x100"}],
+        }
+
+        with MockNode(state, block_interval=0.05) as node, tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "bonds.csv")
+
+            def set_bond(*rows):
+                with open(path, "w") as f:
+                    f.write("".join(f"{a},{v}\n" for a, v in rows))
+                argv = [
+                    "setBond", "--from-csv", path,
+                    "-u", node.url, "-n", "3", "-k", TEST_KEYSTORE_PATH, "-p", TEST_KEYSTORE_PASSWORD,
+                    "--no-agent", "--yes",
+                ]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return execute(create_parser(argv).parse_args(argv))
+
+            # Lowering the bond of preps[0] to 10 unbonds 40
+            response, exit_code = set_bond((preps[0], 10), (preps[2], 11))
+            self.assertEqual(PRepToolsExceptionCode.DATA_TYPE_ERROR.value, exit_code)
+            self.assertIn("Total bond(21) + unbond(50) + delegation(40) exceeds stake(110)", str(response))
+
+            # Bonding preps[1] takes back its unbond
+            response, exit_code = set_bond((preps[0], 50), (preps[1], 20))
+            self.assertEqual(0, exit_code)
+            self.assertEqual(1, node.requests["icx_sendTransaction"])
+
+    def test_set_bond_from_csv(self):
+        state = MockState.synthetic(preps=3, proposals=0)
+        state.accounts[OWNER] = {
+            "stake": hex(110),
+            "delegations": [{"address": _address(9), "value": hex(40)}],
+            "unbonds": [{"address": _address(8), "value": hex(10), "expireBlockHeight": "0x100"}],
+        }
+        preps = [prep["address"] for prep in state.preps]
+
+        with MockNode(state, block_interval=0.05) as node, tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "bonds.csv")
+
+            def set_bond(*rows, from_csv=True):
+                with open(path, "w") as f:
+                    f.write("address,value\n" + "".join(f"{a},{v}\n" for a, v in rows))
+                bonds = ["--from-csv", path] if from_csv else [f"{a},{v}" for a, v in rows]
+                argv = [
+                    "setBond", f"{preps[0]},10", *bonds,
+                    "-u", node.url, "-n", "3", "-k", TEST_KEYSTORE_PATH, "-p", TEST_KEYSTORE_PASSWORD,
+                    "--no-agent", "--yes",
+                ]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return execute(create_parser(argv).parse_args(argv))
+
+            response, exit_code = set_bond((preps[1], 20), (preps[2], 31))
+            self.assertEqual(PRepToolsExceptionCode.DATA_TYPE_ERROR.value, exit_code)
+            self.assertIn("unbond(10) + delegation(40) exceeds stake(110)", str(response))
+            self.assertEqual(0, node.requests["icx_sendTransaction"])
+
+            response, exit_code = set_bond((preps[1], 20), (preps[2], 29))
+            self.assertEqual(0, exit_code)
+            self.assertTrue(response.startswith("0x"))
+            self.assertEqual(1, node.requests["icx_sendTransaction"])
+
+            # Bonds of the arguments are sent without the check
+            response, exit_code = set_bond((preps[1], 20), (preps[2], 31), from_csv=False)
+            self.assertEqual(0, exit_code)
+            self.assertEqual(2, node.requests["icx_sendTransaction"])
@@ -0,0 +1,54 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from iconsdk.wallet.wallet import KeyWallet
+
+from preptools.core.prep import PRepToolsWriter
+from preptools.exception import PRepToolsExceptionCode
+from preptools.preptools_cli import create_parser, execute
+from preptools.testing.mock_node import MockNode, MockState
+from tests.commons.constants import TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD
+
+
+class TestBroadcastCommand(unittest.TestCase):
+
+    def test_broadcast(self):
+        with MockNode(MockState.synthetic(preps=3, proposals=0)) as node, tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "signed.jsonl")
+            writer = PRepToolsWriter(None, 3, KeyWallet.load(TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD), 0x100000, 0)
+            writer.set_listeners([lambda x: True])
+            writer.enable_sign_only(path)
+            writer.set_stake({"value": "0x1"})
+
+            def broadcast():
+                argv = ["broadcast", path, "-u", node.url, "-n", "3", "-o", os.path.join(d, "out.jsonl")]
+                return execute(create_parser(argv).parse_args(argv))
+
+            response, exit_code = broadcast()
+            self.assertEqual(0, exit_code)
+            self.assertEqual({"sent": 1, "failed": 0}, response)
+
+            # The node rejects a transaction without from
+            with open(path, "a") as f:
+                f.write('{"signature": "sig"}\n')
+            with contextlib.redirect_stdout(io.StringIO()):
+                response, exit_code = broadcast()
+            self.assertEqual(PRepToolsExceptionCode.TRANSACTION_ERROR, exit_code)
+            self.assertEqual({"sent": 1, "failed": 1}, response)
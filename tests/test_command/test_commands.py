@@ -0,0 +1,55 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import subprocess
+import sys
+import unittest
+
+from preptools.command import COMMANDS, find_command
+from preptools.preptools_cli import create_parser
+
+
+def _sub_parsers(parser: argparse.ArgumentParser) -> argparse._SubParsersAction:
+    return next(a for a in parser._actions if isinstance(a, argparse._SubParsersAction))
+
+
+class TestCommands(unittest.TestCase):
+
+    def test_registry_matches_parsers(self):
+        # The help texts in the registry have to follow the ones of the modules
+        actions = _sub_parsers(create_parser())._choices_actions
+        self.assertEqual([(c.name, c.help) for c in COMMANDS], [(a.dest, a.help) for a in actions])
+
+        for command in COMMANDS:
+            actions = _sub_parsers(create_parser([command.name]))._choices_actions
+            self.assertEqual([c.name for c in COMMANDS], [a.dest for a in actions])
+
+    def test_find_command(self):
+        self.assertEqual("prep_info_command", find_command(["getPRep", "hx..."]).module)
+        self.assertEqual("bond_command", find_command(["--stdin-commands", "setBond"]).module)
+        self.assertIsNone(find_command(["--help"]))
+        self.assertIsNone(find_command(["unknown"]))
+
+    def test_lazy_import(self):
+        code = (
+            "import sys\n"
+            "from preptools.preptools_cli import create_parser\n"
+            "create_parser([])\n"
+            "print(sorted(m for m in ('iconsdk', 'requests', 'iso3166') if m in sys.modules))\n"
+            "create_parser(['getPRep'])\n"
+            "print(sorted(m for m in sys.modules if m.startswith('preptools.command.')))\n"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(["[]", "['preptools.command.prep_info_command']"], output.splitlines())
@@ -0,0 +1,102 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from iconsdk.wallet.wallet import KeyWallet
+
+from preptools.command.proposal_setting_command import parse_votes
+from preptools.exception import InvalidArgumentException, InvalidDataTypeException, PRepToolsExceptionCode
+from preptools.preptools_cli import create_parser, execute
+from preptools.testing.mock_node import MockNode, MockState
+from tests.commons.constants import TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD
+
+ID1 = "0x" + "1" * 64
+ID2 = "0x" + "2" * 64
+
+
+class TestVoteProposal(unittest.TestCase):
+
+    def test_parse_votes(self):
+        votes = parse_votes([f"{ID1},1\n", "\n", "# comment\n", f" {ID2} , 0 "])
+        self.assertEqual([{"id": ID1, "vote": 1}, {"id": ID2, "vote": 0}], votes)
+
+        with self.assertRaises(InvalidArgumentException):
+            parse_votes([f"{ID1},1", f"{ID1},0"])
+        with self.assertRaises(InvalidArgumentException):
+            parse_votes([f"{ID1},2"])
+        with self.assertRaises(InvalidDataTypeException):
+            parse_votes(["0x1234,1"])
+        with self.assertRaises(InvalidArgumentException):
+            parse_votes(["# nothing"])
+
+    def test_vote_proposals(self):
+        state = MockState.synthetic(preps=3, proposals=3)
+        ids = [proposal["id"] for proposal in state.proposals]
+
+        with MockNode(state, block_interval=0.05) as node, tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "votes.csv")
+            with open(path, "w") as f:
+                f.write(f"{ids[1]},0\n{ids[2]},1\n")
+
+            argv = [
+                "voteProposal", "--votes", f"{ids[0]},1", "--votes-file", path,
+                "-u", node.url, "-n", "3", "-k", TEST_KEYSTORE_PATH, "-p", TEST_KEYSTORE_PASSWORD,
+                "--no-agent", "--yes",
+            ]
+            with contextlib.redirect_stdout(io.StringIO()):
+                response, exit_code = execute(create_parser(argv).parse_args(argv))
+
+        self.assertEqual(0, exit_code)
+        transactions = response["transactions"]
+        self.assertEqual(ids, [tx["id"] for tx in transactions])
+        self.assertEqual([1, 0, 1], [tx["vote"] for tx in transactions])
+        self.assertTrue(all(tx["txHash"].startswith("0x") for tx in transactions))
+        self.assertEqual(3, node.requests["icx_sendTransaction"])
+        self.assertEqual(1, node.requests["icx_getBalance"])
+
+    def test_vote_proposals_failed(self):
+        state = MockState.synthetic(preps=3, proposals=2)
+        ids = [proposal["id"] for proposal in state.proposals]
+        owner = KeyWallet.load(TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD).get_address()
+        state.account(owner)["balance"] = 0
+
+        with MockNode(state, block_interval=0.05) as node:
+            argv = [
+                "voteProposal", "--votes", f"{ids[0]},1", f"{ids[1]},0",
+                "-u", node.url, "-n", "3", "-k", TEST_KEYSTORE_PATH, "-p", TEST_KEYSTORE_PASSWORD,
+                "--no-agent", "--yes",
+            ]
+            with contextlib.redirect_stdout(io.StringIO()):
+                response, exit_code = execute(create_parser(argv).parse_args(argv))
+
+        self.assertEqual(PRepToolsExceptionCode.TRANSACTION_ERROR, exit_code)
+        self.assertEqual(ids, [tx["id"] for tx in response["transactions"]])
+        self.assertTrue(all("error" in tx and "txHash" not in tx for tx in response["transactions"]))
+        self.assertEqual(0, node.requests["icx_sendTransaction"])
+
+    def test_vote_proposal_arguments(self):
+        argv = ["voteProposal", "--id", ID1, "--vote", "1", "--votes", f"{ID2},0", "--no-agent", "--yes"]
+        response, exit_code = execute(create_parser(argv).parse_args(argv))
+        self.assertEqual(PRepToolsExceptionCode.DATA_TYPE_ERROR, exit_code)
+        self.assertIn("--votes", response)
+
+        argv = ["voteProposal", "--votes", f"{ID2},0", "--concurrency", "0", "--no-agent", "--yes"]
+        response, exit_code = execute(create_parser(argv).parse_args(argv))
+        self.assertEqual(PRepToolsExceptionCode.DATA_TYPE_ERROR, exit_code)
+        self.assertIn("concurrency", response)
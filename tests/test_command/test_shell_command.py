@@ -0,0 +1,74 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from iconsdk.wallet.wallet import KeyWallet
+
+from preptools.core import prep
+from preptools.exception import PRepToolsExceptionCode
+from preptools.preptools_cli import run_commands
+from tests.commons.constants import TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD
+
+
+class Container(object):
+    pass
+
+
+class TestShell(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        prep._unlocked_wallets = None
+
+    def test_run_commands(self):
+        with tempfile.TemporaryDirectory() as d:
+            lines = [
+                f"keystore {d}/a.json -p qwer1234%",
+                "",
+                "# comment",
+                "getPRep",
+                "shell",
+                "exit",
+                f"keystore {d}/b.json -p qwer1234%",
+            ]
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                exit_code = run_commands(lines)
+
+            self.assertEqual(PRepToolsExceptionCode.ARGUMENT_ERROR.value, exit_code)
+            self.assertTrue(os.path.exists(f"{d}/a.json"))
+            self.assertFalse(os.path.exists(f"{d}/b.json"))
+
+    def test_keep_unlocked_wallets(self):
+        args = Container()
+        args.url = "http://127.0.0.1:9000/api/v3"
+        args.nid = 3
+        args.config = None
+        args.keystore = TEST_KEYSTORE_PATH
+        args.password = TEST_KEYSTORE_PASSWORD
+        args.no_agent = True
+        args.step_limit = 0x10000
+        args.yes = True
+        args.verbose = False
+
+        prep.keep_unlocked_wallets()
+        with patch.object(KeyWallet, "load", wraps=KeyWallet.load) as load:
+            prep.create_writer_by_args(args)
+            args.password = None
+            prep.create_writer_by_args(args)
+        self.assertEqual(1, load.call_count)
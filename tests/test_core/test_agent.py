@@ -0,0 +1,87 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from hashlib import sha3_256
+
+from iconsdk.wallet.wallet import KeyWallet
+
+from preptools.core.agent import AgentClient, SigningAgent, get_agent_wallet
+from preptools.exception import InvalidKeyStoreException
+
+
+class TestSigningAgent(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "agent.sock")
+        self.agent = SigningAgent(self.path, ttl=60)
+        self.wallet = KeyWallet.create()
+        self.agent.add(self.wallet)
+
+        self.thread = threading.Thread(target=self.agent.serve_forever, daemon=True)
+        self.thread.start()
+        while not os.path.exists(self.path):
+            time.sleep(0.01)
+
+    def tearDown(self) -> None:
+        self.agent.shutdown()
+        self.thread.join()
+        self.dir.cleanup()
+
+    def test_sign(self):
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+
+        keystore_path = os.path.join(self.dir.name, "keystore.json")
+        self.wallet.store(keystore_path, "qwer1234%")
+        wallet = get_agent_wallet(keystore_path, self.path)
+        self.assertEqual(self.wallet.get_address(), wallet.get_address())
+
+        data = sha3_256(b"transaction").digest()
+        self.assertEqual(self.wallet.sign(data), wallet.sign(data))
+
+    def test_ttl_and_lock(self):
+        client = AgentClient(self.path)
+        other = KeyWallet.create()
+        self.agent.add(other, ttl=-1)
+        self.assertEqual([self.wallet.get_address()], [key["address"] for key in client.list()])
+
+        client.lock()
+        self.assertEqual([], client.list())
+        with self.assertRaises(InvalidKeyStoreException):
+            client.request("sign", {"address": self.wallet.get_address(), "data": "00"})
+
+    def test_bad_requests(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(self.path)
+            sock.sendall(b'{bad\n[1]\n{"method": "sign", "params": {}}\n{"method": "list"}\n')
+            with sock.makefile("rb") as f:
+                responses = [json.loads(f.readline()) for _ in range(4)]
+
+        self.assertTrue(all("error" in response for response in responses[:3]))
+        self.assertEqual(self.wallet.get_address(), responses[3]["result"][0]["address"])
+
+    def test_stop(self):
+        AgentClient(self.path).stop()
+        self.thread.join(5)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(get_agent_wallet("keystore.json", self.path))
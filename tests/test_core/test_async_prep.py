@@ -0,0 +1,83 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# aiohttp is an optional dependency of preptools[async]
+pytest.importorskip("aiohttp")
+
+from preptools.core.async_prep import create_async_reader  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(0.02)
+        data = json.dumps({"jsonrpc": "2.0", "id": body["id"], "result": body["params"]["data"]}).encode()
+
+        with self.server.lock:
+            self.server.in_flight -= 1
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncPRepToolsReader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.lock = threading.Lock()
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/v3"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_gather(self):
+        addresses = [f"hx{i:040x}" for i in range(20)]
+
+        async def run():
+            async with create_async_reader(self.url, 3, concurrency=4) as reader:
+                return await asyncio.gather(
+                    *(reader.get_bond(address) for address in addresses),
+                    reader.get_proposal("0x" + "0" * 64),
+                )
+
+        responses = asyncio.run(run())
+        for address, response in zip(addresses, responses):
+            self.assertEqual({"method": "getBond", "params": {"address": address}}, response["result"])
+        self.assertEqual("getProposal", responses[-1]["result"]["method"])
+        self.assertLessEqual(self.server.max_in_flight, 4)
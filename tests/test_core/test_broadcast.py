@@ -0,0 +1,94 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import threading
+import unittest
+
+from iconsdk.wallet.wallet import KeyWallet
+
+from preptools.core.broadcast import broadcast, read_signed_transactions
+from preptools.core.prep import PRepToolsWriter, get_tx_hash
+from preptools.exception import InvalidArgumentException, InvalidFileReadException
+from tests.commons.constants import TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD
+
+
+class _Provider:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = []
+
+    def make_request(self, method, params=None, full_response=False):
+        if params["nonce"] == "0x2":
+            raise Exception("rejected")
+        with self.lock:
+            self.sent.append(params)
+        return get_tx_hash(params)
+
+
+class TestBroadcast(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "signed.jsonl")
+        wallet = KeyWallet.load(TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD)
+        self.writer = PRepToolsWriter(None, 3, wallet, 0x100000, 0)
+        self.writer.set_listeners([lambda x: True])
+        self.writer.enable_sign_only(self.path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_sign_only(self):
+        hashes = [self.writer.vote_proposal({"id": f"0x{i:064x}", "vote": "0x1"}) for i in range(5)]
+
+        transactions = list(read_signed_transactions(self.path))
+        self.assertEqual(5, len(transactions))
+        self.assertEqual(hashes, [get_tx_hash(tx) for tx in transactions])
+        for tx in transactions:
+            self.assertEqual("voteProposal", tx["data"]["method"])
+            self.assertIn("signature", tx)
+
+    def test_read_malformed_line(self):
+        with open(self.path, "w") as f:
+            f.write('{"signature": "sig"}\n\n{"signature": \n')
+
+        transactions = read_signed_transactions(self.path)
+        self.assertEqual({"signature": "sig"}, next(transactions))
+        with self.assertRaises(InvalidFileReadException) as cm:
+            next(transactions)
+        self.assertIn(f"line 3 of {self.path}", cm.exception.message)
+
+    def test_sign_only_without_step_limit(self):
+        wallet = KeyWallet.load(TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD)
+        writer = PRepToolsWriter(None, 3, wallet, None, 0)
+        writer.set_listeners([lambda x: True])
+        writer.enable_sign_only(self.path)
+        self.assertRaises(InvalidArgumentException, writer.set_stake, {"value": "0x1"})
+
+    def test_broadcast(self):
+        transactions = [{"nonce": hex(i), "signature": "sig"} for i in range(10)]
+        provider = _Provider()
+
+        results = sorted(broadcast(provider, iter(transactions), concurrency=3))
+        self.assertEqual(list(range(10)), [index for index, _, _ in results])
+        for index, tx_hash, error in results:
+            if index == 2:
+                self.assertIsNone(tx_hash)
+                self.assertIn("rejected", error)
+            else:
+                self.assertEqual(get_tx_hash(transactions[index]), tx_hash)
+                self.assertIsNone(error)
+        self.assertEqual(9, len(provider.sent))
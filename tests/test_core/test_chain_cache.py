@@ -0,0 +1,86 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from preptools.core import chain_cache
+from preptools.core.chain_cache import REVISION, STEP_PRICE, ChainConstantsCache, get_default_cache
+
+URL1 = "http://127.0.0.1:9000/api/v3"
+URL2 = "http://127.0.0.1:9001/api/v3"
+
+
+class TestChainConstantsCache(unittest.TestCase):
+
+    def test_ttl(self):
+        cache = ChainConstantsCache(ttl=0.05)
+        cache.set(URL1, STEP_PRICE, "0x2e90edd00")
+        self.assertEqual("0x2e90edd00", cache.get(URL1, STEP_PRICE))
+        self.assertIsNone(cache.get(URL2, STEP_PRICE))
+
+        time.sleep(0.1)
+        self.assertIsNone(cache.get(URL1, STEP_PRICE))
+
+    def test_get_or_fetch(self):
+        cache = ChainConstantsCache()
+        fetched = []
+
+        def fetch():
+            fetched.append(1)
+            return "0x1"
+
+        self.assertEqual("0x1", cache.get_or_fetch(URL1, REVISION, fetch))
+        self.assertEqual("0x1", cache.get_or_fetch(URL1, REVISION, fetch))
+        self.assertEqual(1, len(fetched))
+
+    def test_invalidate(self):
+        cache = ChainConstantsCache()
+        for url in (URL1, URL2):
+            cache.set(url, STEP_PRICE, "0x1")
+            cache.set(url, REVISION, "0x2")
+
+        cache.invalidate(URL1, STEP_PRICE)
+        self.assertIsNone(cache.get(URL1, STEP_PRICE))
+        self.assertEqual("0x2", cache.get(URL1, REVISION))
+
+        cache.invalidate(URL1)
+        self.assertIsNone(cache.get(URL1, REVISION))
+        self.assertEqual("0x1", cache.get(URL2, STEP_PRICE))
+
+        cache.invalidate()
+        self.assertIsNone(cache.get(URL2, STEP_PRICE))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "cache", "chain_constants.json")
+            ChainConstantsCache(path=path).set(URL1, STEP_PRICE, "0x1")
+            self.assertEqual("0x1", ChainConstantsCache(path=path).get(URL1, STEP_PRICE))
+
+            ChainConstantsCache(path=path).invalidate(URL1)
+            self.assertIsNone(ChainConstantsCache(path=path).get(URL1, STEP_PRICE))
+
+    def test_default_cache_without_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                patch.dict(chain_cache._default_caches, clear=True), \
+                patch.object(chain_cache, "DEFAULT_CACHE_PATH", os.path.join(tmp_dir, "chain_constants.json")):
+            cache = get_default_cache(persist=False)
+            cache.set(URL1, STEP_PRICE, "0x1")
+
+            self.assertIs(cache, get_default_cache(persist=False))
+            self.assertIsNot(cache, get_default_cache())
+            self.assertFalse(os.path.exists(chain_cache.DEFAULT_CACHE_PATH))
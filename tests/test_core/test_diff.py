@@ -0,0 +1,84 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import tempfile
+import unittest
+
+from preptools.core.diff import PRepSnapshot, diff_preps, load_snapshot, save_snapshot
+from preptools.exception import InvalidFormatException
+
+
+def _prep(i: int, **kwargs) -> dict:
+    return {"address": f"hx{i:040x}", "grade": "0x0", "power": hex(i), **kwargs}
+
+
+class TestDiff(unittest.TestCase):
+
+    def test_diff_preps(self):
+        old = [_prep(1), _prep(2), _prep(3, blockHeight="0x1")]
+        new = [_prep(4), _prep(3, blockHeight="0x2"), _prep(2, grade="0x1", power="0x10")]
+
+        changes = list(diff_preps(old, new))
+        self.assertEqual(
+            [("added", _prep(4)["address"]), ("changed", _prep(2)["address"]), ("removed", _prep(1)["address"])],
+            [(c["type"], c["address"]) for c in changes])
+        self.assertEqual(_prep(4), changes[0]["prep"])
+        self.assertEqual(_prep(1), changes[2]["prep"])
+        self.assertEqual(
+            {"grade": {"old": "0x0", "new": "0x1"}, "power": {"old": "0x2", "new": "0x10"}},
+            changes[1]["changes"])
+
+        # bonderList of a snapshot file is not compared with a live getPReps
+        self.assertEqual([], list(diff_preps([_prep(1, bonderList=[])], [_prep(1)])))
+        changes = list(diff_preps([_prep(1, bonderList=[])], [_prep(1)], fields=["bonderList"]))
+        self.assertEqual({"bonderList": {"old": [], "new": None}}, changes[0]["changes"])
+
+        changes = list(diff_preps(old, new, fields=["grade"]))
+        self.assertEqual({"grade": {"old": "0x0", "new": "0x1"}}, changes[1]["changes"])
+        self.assertEqual([], list(diff_preps(new, new)))
+
+    def test_load_snapshot(self):
+        preps = [_prep(1), _prep(2)]
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "getpreps.json")
+            with open(path, "w") as f:
+                json.dump({"jsonrpc": "2.0", "id": 1, "result": {"blockHeight": "0x64", "preps": preps}}, f)
+            self.assertEqual(PRepSnapshot("0x64", preps), load_snapshot(path))
+
+            path = os.path.join(d, "preps.jsonl")
+            with open(path, "w") as f:
+                f.writelines(json.dumps({"blockHeight": "0x65", **p}) + "\n" for p in preps)
+            snapshot = load_snapshot(path)
+            self.assertEqual("0x65", snapshot.block_height)
+            self.assertEqual([], list(diff_preps(preps, snapshot.preps)))
+
+            for name in ("prep.jsonl", "prep.txt"):
+                path = os.path.join(d, name)
+                with open(path, "w") as f:
+                    f.write(json.dumps({"blockHeight": "0x65", **preps[0]}) + "\n")
+                snapshot = load_snapshot(path)
+                self.assertEqual("0x65", snapshot.block_height)
+                self.assertEqual([], list(diff_preps(preps[:1], snapshot.preps)))
+
+            for text in ("{}", "[1]", '{"preps": [{"name": "no address"}]}', '{"preps": {}}'):
+                path = os.path.join(d, "invalid.json")
+                with open(path, "w") as f:
+                    f.write(text)
+                self.assertRaises(InvalidFormatException, load_snapshot, path)
+
+            path = os.path.join(d, "state.json")
+            save_snapshot(path, PRepSnapshot("0x66", preps))
+            self.assertEqual(PRepSnapshot("0x66", preps), load_snapshot(path))
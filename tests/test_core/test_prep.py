@@ -17,9 +17,13 @@
 import json
 import unittest
 from typing import Union
+from unittest.mock import patch
 
 from preptools.command.prep_setting_command import _get_prep_input
+from preptools.core import prep
 from preptools.core.prep import _get_common_args
+from preptools.exception import JsonRpcException
+from preptools.testing.mock_node import MockNode, MockState
 from tests.commons.constants import (
     TEST_KEYSTORE_PATH,
     TEST_KEYSTORE_PASSWORD,
@@ -129,6 +133,101 @@ class TestPRep(unittest.TestCase):
         response = reader.get_preps({})
         self.assertTrue(is_request_equal(response, GET_PREPS_SAMPLE))
 
+    def test_iter_preps(self):
+        total = 250
+
+        def make_request(method, params):
+            data = params["data"]["params"]
+            start, end = int(data["startRanking"], 16), int(data["endRanking"], 16)
+            if start > total:
+                return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32602, "message": "Invalid ranking"}}
+            preps = [{"address": f"hx{i:040x}"} for i in range(start, min(end, total) + 1)]
+            return {"jsonrpc": "2.0", "id": 1, "result": {"blockHeight": data.get("blockHeight", "0x64"), "preps": preps}}
+
+        reader = create_reader()
+        requests = []
+        reader.set_listeners([lambda call: requests.append(call["params"])])
+        with patch.object(reader._icon_service, "make_request", side_effect=make_request):
+            preps = list(reader.iter_preps(chunk_size=100))
+            self.assertEqual([f"hx{i:040x}" for i in range(1, total + 1)], [p["address"] for p in preps])
+            self.assertEqual(["0x1", "0x65", "0xc9"], [r["startRanking"] for r in requests])
+            self.assertEqual(["0x65", "0xc9", "0x12d"], [r["endRanking"] for r in requests])
+            self.assertEqual([None, "0x64", "0x64"], [r.get("blockHeight") for r in requests])
+
+            requests.clear()
+            preps = list(reader.iter_preps(start_ranking=150, end_ranking=200, block_height=10, chunk_size=40))
+            self.assertEqual(51, len(preps))
+            self.assertEqual([("0x96", "0xbe"), ("0xbe", "0xc8")], [(r["startRanking"], r["endRanking"]) for r in requests])
+
+            # A full last chunk doesn't make a request beyond the last ranking
+            requests.clear()
+            self.assertEqual(total, len(list(reader.iter_preps(chunk_size=50))))
+            self.assertEqual(5, len(requests))
+
+    def test_iter_preps_error_in_the_middle(self):
+        def make_request(method, params):
+            data = params["data"]["params"]
+            start, end = int(data["startRanking"], 16), int(data["endRanking"], 16)
+            if start > 1:
+                return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "Timeout"}}
+            preps = [{"address": f"hx{i:040x}"} for i in range(start, end + 1)]
+            return {"jsonrpc": "2.0", "id": 1, "result": {"blockHeight": "0x64", "preps": preps}}
+
+        reader = create_reader()
+        reader.set_listeners([])
+        with patch.object(reader._icon_service, "make_request", side_effect=make_request):
+            preps = reader.iter_preps(chunk_size=10)
+            self.assertEqual(10, len([next(preps) for _ in range(10)]))
+            with self.assertRaises(JsonRpcException):
+                next(preps)
+
+    def test_iter_proposals(self):
+        total = 37
+
+        def make_request(method, params):
+            data = params["data"]["params"]
+            start, size = int(data["start"], 16), int(data["size"], 16)
+            proposals = [{"id": f"0x{i:064x}"} for i in range(total - start, max(total - start - size, 0), -1)]
+            return {"jsonrpc": "2.0", "id": 1, "result": {"proposals": proposals}}
+
+        reader = create_reader()
+        requests = []
+        reader.set_listeners([lambda call: requests.append(call["params"])])
+        with patch.object(reader._icon_service, "make_request", side_effect=make_request):
+            proposals = list(reader.iter_proposals(status=1, concurrency=3))
+            self.assertEqual([f"0x{i:064x}" for i in range(total, 0, -1)], [p["id"] for p in proposals])
+            self.assertEqual({"0x1"}, {r["status"] for r in requests})
+
+            requests.clear()
+            for i, _ in enumerate(reader.iter_proposals(concurrency=2)):
+                if i == 4:
+                    break
+            self.assertLessEqual(len(requests), 3)
+
+    def test_batch_call(self):
+        addresses = [f"hx{'0' * 39}{(i + 1):x}" for i in range(5)]
+        methods = ("getPRep", "getBond")
+        reader = create_reader()
+        response = reader.batch_call(addresses, methods, chunk_size=3)
+
+        self.assertEqual(addresses, list(response.keys()))
+        for address in addresses:
+            self.assertEqual(list(methods), list(response[address].keys()))
+            for method in methods:
+                result = response[address][method]["result"]
+                self.assertEqual("icx_call", result["method"])
+                self.assertEqual(method, result["params"]["data"]["method"])
+                self.assertEqual({"address": address}, result["params"]["data"]["params"])
+
+    def test_batch_call_without_listeners(self):
+        state = MockState.synthetic(preps=3, proposals=0)
+        address = state.preps[0]["address"]
+        with MockNode(state) as node:
+            reader = prep.create_reader(node.url, 3)
+            response = reader.batch_call([address], ("getPRep",))
+            self.assertEqual(state.preps[0], response[address]["getPRep"]["result"])
+            self.assertEqual(3, len(list(reader.iter_preps())))
+
     def test_get_common_args(self):
         # when args value exists, have to maintain args value.
         self.args.config = TEST_WRONG_CONFIG_PATH
@@ -0,0 +1,72 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from preptools.core.receipt import TIMEOUT_ERROR_CODE, wait_for_results
+from preptools.exception import InvalidDataTypeException
+
+
+class _Service:
+    """Finalizes each transaction after the given number of polls"""
+
+    def __init__(self, polls: dict):
+        self.polls = polls
+        self.batches = []
+
+    def batch(self, requests_):
+        self.batches.append(len(requests_))
+        responses = []
+        for method, params in requests_:
+            tx_hash = params["txHash"]
+            self.polls[tx_hash] -= 1
+            if self.polls[tx_hash] > 0:
+                responses.append({"error": {"code": -31002, "message": "Pending"}})
+            elif self.polls[tx_hash] == 0:
+                responses.append({"result": {"txHash": tx_hash, "status": "0x1"}})
+            else:
+                responses.append({"error": {"code": -32602, "message": "Invalid params"}})
+        return responses
+
+
+def _hash(i: int) -> str:
+    return f"0x{i:064x}"
+
+
+class TestReceipt(unittest.TestCase):
+
+    def test_wait_for_results(self):
+        polls = {_hash(1): 1, _hash(2): 3, _hash(3): 2, _hash(4): -1}
+        service = _Service(polls)
+
+        results = list(wait_for_results(service, polls, timeout=5, interval=0.01, chunk_size=3))
+
+        self.assertEqual([_hash(1), _hash(4), _hash(3), _hash(2)], [r[0] for r in results])
+        self.assertEqual({"txHash": _hash(1), "status": "0x1"}, results[0][1])
+        self.assertEqual(-32602, results[1][2]["code"])
+        # 4 hashes in chunks of 3, then the 2 pending ones, then the last one
+        self.assertEqual([3, 1, 2, 1], service.batches)
+
+    def test_timeout(self):
+        service = _Service({_hash(1): 1, _hash(2): 100})
+
+        results = list(wait_for_results(service, [_hash(1), _hash(2)], timeout=0))
+
+        self.assertEqual((_hash(1), {"txHash": _hash(1), "status": "0x1"}, None), results[0])
+        self.assertEqual(_hash(2), results[1][0])
+        self.assertEqual(TIMEOUT_ERROR_CODE, results[1][2]["code"])
+
+    def test_invalid_hash(self):
+        with self.assertRaises(InvalidDataTypeException):
+            list(wait_for_results(_Service({}), ["0x1234"]))
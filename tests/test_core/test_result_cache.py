@@ -0,0 +1,92 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from preptools.core.result_cache import ResultCache
+from tests.commons.core_for_test import create_reader
+
+MAINNET = "https://api.icon.community/api/v3"
+TESTNET = "https://lisbon.net.solidwallet.io/api/v3"
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_persist(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "results.sqlite3")
+            cache = ResultCache(path)
+            key = ResultCache.make_key(MAINNET, 1, "icx_getTransactionResult", "0x01")
+            value = {"status": 1, "data": b"\x01\x02", "logs": [{"indexed": ["a"]}]}
+            cache.set(key, value)
+            cache.close()
+
+            cache = ResultCache(path)
+            self.assertEqual(value, cache.get(key))
+            self.assertIsNone(cache.get(ResultCache.make_key(MAINNET, 2, "icx_getTransactionResult", "0x01")))
+            self.assertIsNone(cache.get(ResultCache.make_key(TESTNET, 1, "icx_getTransactionResult", "0x01")))
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_bytes=2000)
+        values = {f"k{i}": os.urandom(300).hex() for i in range(6)}
+        for key, value in list(values.items())[:4]:
+            cache.set(key, value)
+        # k0 becomes the most recently used one
+        self.assertEqual(values["k0"], cache.get("k0"))
+        for key, value in list(values.items())[4:]:
+            cache.set(key, value)
+
+        self.assertLessEqual(cache.size(), 2000)
+        self.assertIsNone(cache.get("k1"))
+        self.assertEqual(values["k0"], cache.get("k0"))
+        self.assertEqual(values["k5"], cache.get("k5"))
+
+    def test_reader(self):
+        reader = create_reader()
+        reader.enable_result_cache(ResultCache())
+        service = reader._icon_service
+
+        def make_request(method, params):
+            return {"jsonrpc": "2.0", "id": 1, "result": {"method": method, "params": params}}
+
+        with patch.object(service, "make_request", side_effect=make_request) as make_request:
+            tx_hash = "0x" + "1" * 64
+            self.assertEqual(reader.get_tx_result(tx_hash), reader.get_tx_result(tx_hash))
+            reader.get_preps({"blockHeight": "0x10"})
+            reader.get_preps({"blockHeight": "0x10"})
+            reader.get_preps({})
+            reader.get_preps({})
+            self.assertEqual(4, make_request.call_count)
+
+    def test_reader_of_other_network(self):
+        cache = ResultCache()
+        tx_hash = "0x" + "1" * 64
+        results = []
+        for url in (MAINNET, TESTNET, MAINNET):
+            reader = create_reader()
+            reader.enable_result_cache(cache)
+            service = reader._icon_service
+            service.provider = SimpleNamespace(url=url)
+
+            def make_request(method, params):
+                return {"jsonrpc": "2.0", "id": 1, "result": {"url": url, "status": "0x1"}}
+
+            with patch.object(service, "make_request", side_effect=make_request):
+                results.append(reader.get_tx_result(tx_hash)["result"]["url"])
+
+        self.assertEqual([MAINNET, TESTNET, MAINNET], results)
@@ -0,0 +1,122 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from preptools.core.snapshot import (
+    ACCOUNT, ACCOUNT_COLUMNS, PREP, PREP_COLUMNS, iter_snapshot, open_snapshot_writer
+)
+from tests.commons.core_for_test import create_reader
+
+
+class TestSnapshot(unittest.TestCase):
+    total = 120
+
+    def make_request(self, method, params):
+        data = params["data"]["params"]
+        start, end = int(data["startRanking"], 16), int(data["endRanking"], 16)
+        if start > self.total:
+            return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32602, "message": "Invalid ranking"}}
+        preps = [{"address": f"hx{i:040x}", "power": hex(i)} for i in range(start, min(end, self.total) + 1)]
+        return {"jsonrpc": "2.0", "id": 1, "result": {"blockHeight": data.get("blockHeight", "0x64"), "preps": preps}}
+
+    def batch(self, requests):
+        ret = []
+        for i, (_, params) in enumerate(requests):
+            self.heights.add(params.get("height"))
+            method, address = params["data"]["method"], params["data"]["params"]["address"]
+            if method == "getBonderList":
+                result = {"bonderList": [address]}
+            elif method == "getStake":
+                result = {"stake": "0x1", "unstakes": []}
+            else:
+                ret.append({"jsonrpc": "2.0", "id": i, "error": {"code": -30032, "message": "Not found"}})
+                continue
+            ret.append({"jsonrpc": "2.0", "id": i, "result": result})
+        return ret
+
+    def test_iter_snapshot(self):
+        self.heights = set()
+        reader = create_reader()
+        addresses = ["hx" + "a" * 40, "hx" + "b" * 40, "hx" + "a" * 40]
+        with patch.object(reader._icon_service, "make_request", side_effect=self.make_request), \
+                patch.object(reader._icon_service, "batch", side_effect=self.batch, create=True):
+            records = list(iter_snapshot(reader, addresses=addresses, concurrency=3))
+
+        preps = [r for kind, r in records if kind == PREP]
+        accounts = [r for kind, r in records if kind == ACCOUNT]
+        self.assertEqual([f"hx{i:040x}" for i in range(1, self.total + 1)], [p["address"] for p in preps])
+        self.assertTrue(all(p["bonderList"] == [p["address"]] for p in preps))
+        self.assertEqual({"0x64"}, {r["blockHeight"] for _, r in records})
+        self.assertEqual({"0x64"}, self.heights)
+
+        self.assertEqual(["hx" + "a" * 40, "hx" + "b" * 40], [a["address"] for a in accounts])
+        self.assertEqual("0x1", accounts[0]["stake"])
+        self.assertEqual("-30032: Not found", accounts[0]["error"])
+
+    def test_writers(self):
+        records = [
+            {"blockHeight": "0x64", "address": "hx" + "a" * 40, "bonderList": ["hx" + "a" * 40]},
+            {"blockHeight": "0x64", "address": "hx" + "b" * 40, "bonderList": [], "newField": {"a": 1}},
+            {"blockHeight": "0x64", "address": "hx" + "c" * 40, "error": "-30032: Not found"},
+        ]
+        with tempfile.TemporaryDirectory() as d:
+            for fmt in ("jsonl", "csv"):
+                path = os.path.join(d, f"preps.{fmt}")
+                writer = open_snapshot_writer(path, fmt, PREP)
+                for record in records:
+                    writer.write(record)
+                writer.close()
+
+            writer = open_snapshot_writer(os.path.join(d, "accounts.csv"), "csv", ACCOUNT)
+            writer.close()
+
+            with open(os.path.join(d, "preps.jsonl")) as f:
+                self.assertEqual(records, [json.loads(line) for line in f])
+            with open(os.path.join(d, "preps.csv")) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(list(PREP_COLUMNS), list(rows[0]))
+            self.assertEqual(
+                [
+                    {"blockHeight": "0x64", "address": "hx" + "a" * 40, "bonderList": '["hx' + "a" * 40 + '"]'},
+                    {"blockHeight": "0x64", "address": "hx" + "b" * 40, "bonderList": "[]",
+                     "extra": '{"newField":{"a":1}}'},
+                    {"blockHeight": "0x64", "address": "hx" + "c" * 40, "error": "-30032: Not found"},
+                ],
+                [{k: v for k, v in r.items() if v} for r in rows])
+            with open(os.path.join(d, "accounts.csv")) as f:
+                self.assertEqual(",".join(ACCOUNT_COLUMNS), f.read().strip())
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_parquet_writer(self):
+        import pyarrow.parquet
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "accounts.parquet")
+            writer = open_snapshot_writer(path, "parquet", ACCOUNT)
+            writer.close()
+            self.assertEqual(list(ACCOUNT_COLUMNS), pyarrow.parquet.read_schema(path).names)
+
+            writer = open_snapshot_writer(path, "parquet", ACCOUNT)
+            writer.write({"blockHeight": "0x64", "address": "hx" + "a" * 40, "stake": "0x1", "unstakes": []})
+            writer.close()
+            table = pyarrow.parquet.read_table(path)
+            self.assertEqual(["0x1"], table.column("stake").to_pylist())
+            self.assertEqual(["[]"], table.column("unstakes").to_pylist())
@@ -0,0 +1,116 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from iconsdk.wallet.wallet import KeyWallet
+
+from preptools.core.prep import PRepToolsWriter
+from preptools.core.step_model import StepHistory, payload_size
+from tests.commons.constants import TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD
+from tests.commons.core_for_test import IconService
+
+URL = "http://127.0.0.1:9000/api/v3"
+
+
+class _CountingIconService(IconService):
+    def __init__(self):
+        super().__init__()
+        self.estimated = 0
+        self.revision = "0x18"
+
+    def call(self, call, full_response: bool = False):
+        if call.method == "getStepCosts":
+            return {"default": "0x186a0", "input": "0xc8"}
+        if call.method == "getRevision":
+            return self.revision
+        return super().call(call, full_response)
+
+    def estimate_step(self, transaction):
+        self.estimated += 1
+        return 100_000 + 100 * payload_size(transaction.data.get("params"))
+
+
+class TestStepHistory(unittest.TestCase):
+
+    def test_predict(self):
+        history = StepHistory()
+        self.assertIsNone(history.predict(URL, "setBond", 100))
+
+        for size in (100, 200, 300):
+            history.record(URL, "setBond", size, 1000 + 10 * size)
+
+        for size in (50, 250, 600):
+            self.assertGreaterEqual(history.predict(URL, "setBond", size), 1000 + 10 * size)
+        # too far from the history
+        self.assertIsNone(history.predict(URL, "setBond", 601))
+        self.assertIsNone(history.predict(URL, "voteProposal", 100))
+        self.assertIsNone(history.predict("http://localhost:9000/api/v3", "setBond", 100))
+
+    def test_record_result(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "step_history.json")
+            history = StepHistory(path)
+            for i in range(3):
+                history.add_pending(f"0x{i}", URL, "voteProposal", 80)
+
+            history = StepHistory(path)
+            self.assertFalse(history.record_result("0xff", 1))
+            for i in range(3):
+                self.assertTrue(history.record_result(f"0x{i}", 50000 + i))
+            self.assertGreaterEqual(StepHistory(path).predict(URL, "voteProposal", 80), 50002)
+
+    def test_writer(self):
+        service = _CountingIconService()
+        wallet = KeyWallet.load(TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD)
+        writer = PRepToolsWriter(service, 3, wallet, None, 0)
+        writer.set_listeners([lambda x: True])
+        writer.enable_step_prediction(StepHistory())
+
+        for i in range(5):
+            response = writer.vote_proposal({"id": f"0x{i:064x}", "vote": "0x1"})
+            step_limit = int(response["params"]["stepLimit"], 0)
+            self.assertGreaterEqual(step_limit, 100_000 + 100 * payload_size({"id": f"0x{i:064x}", "vote": "0x1"}))
+        self.assertEqual(3, service.estimated)
+
+    def test_writer_drops_history_of_other_step_version(self):
+        service = _CountingIconService()
+        wallet = KeyWallet.load(TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD)
+        history = StepHistory()
+        for i in range(5):
+            writer = PRepToolsWriter(service, 3, wallet, None, 0)
+            writer.set_listeners([lambda x: True])
+            writer.enable_step_prediction(history)
+            writer.vote_proposal({"id": f"0x{i:064x}", "vote": "0x1"})
+        self.assertEqual(3, service.estimated)
+
+        # A revision applied by someone else
+        service.revision = "0x19"
+        writer = PRepToolsWriter(service, 3, wallet, None, 0)
+        writer.set_listeners([lambda x: True])
+        writer.enable_step_prediction(history)
+        writer.vote_proposal({"id": f"0x{5:064x}", "vote": "0x1"})
+        self.assertEqual(4, service.estimated)
+
+    def test_set_version(self):
+        history = StepHistory()
+        self.assertFalse(history.set_version(URL, "v1"))
+        history.record(URL, "setBond", 10, 1000)
+        history.add_pending("0x1", URL, "setBond", 10)
+        self.assertFalse(history.set_version(URL, "v1"))
+
+        self.assertTrue(history.set_version(URL, "v2"))
+        self.assertFalse(history.record_result("0x1", 1000))
@@ -0,0 +1,168 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from preptools.core import transport
+from preptools.core.chain_cache import ChainConstantsCache
+from preptools.core.prep import create_reader, create_writer
+from preptools.utils.validation_checker import check_enough_balance
+from tests.commons.constants import TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.server.peers.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.posts.append([req["method"] for req in body] if isinstance(body, list) else body["method"])
+        time.sleep(getattr(self.server, "delay", 0))
+        if isinstance(body, list):
+            result = [
+                {"jsonrpc": "2.0", "id": req["id"], "result": "0x10000000" if req["method"] == "icx_getBalance" else "0x1"}
+                if req["method"] != "icx_getScoreApi"
+                else {"jsonrpc": "2.0", "id": req["id"], "error": {"code": -32602, "message": "Invalid params"}}
+                for req in reversed(body)
+            ]
+        elif body["method"] == "debug_estimateStep":
+            result = {"jsonrpc": "2.0", "id": body["id"], "result": "0x1000"}
+        elif body["method"] == "icx_sendTransaction":
+            result = {"jsonrpc": "2.0", "id": body["id"], "result": "0x" + "1" * 64}
+        else:
+            result = {"jsonrpc": "2.0", "id": body["id"], "result": {"method": body["params"]["data"]["method"]}}
+        data = json.dumps(result).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self) -> None:
+        transport.close_sessions()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.peers = set()
+        self.server.posts = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/v3"
+
+    def tearDown(self) -> None:
+        transport.close_sessions()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get_session(self):
+        session = transport.get_session(self.url)
+        self.assertIs(session, transport.get_session(f"http://127.0.0.1:{self.server.server_port}/api/v3d"))
+        self.assertIsNot(session, transport.get_session("http://localhost:1/api/v3"))
+
+    def test_connection_reuse(self):
+        reader = create_reader(self.url, 3)
+        reader.set_listeners([])
+        for _ in range(3):
+            self.assertEqual({"method": "getPRep"}, reader.get_prep("hx" + "0" * 40)["result"])
+
+        data = {"from_": "hx" + "0" * 40, "step_limit": 1}
+        self.assertTrue(check_enough_balance(self.url, data))
+        self.assertEqual(1, len(self.server.peers))
+
+    def test_batch_request(self):
+        service = transport.create_icon_service(self.url)
+        responses = service.batch([
+            ("icx_getBalance", {"address": "hx" + "0" * 40}),
+            ("icx_getScoreApi", {"address": "cx" + "0" * 40}),
+            ("icx_call", None),
+        ])
+        self.assertEqual([0, 1, 2], [res["id"] for res in responses])
+        self.assertEqual("0x10000000", responses[0]["result"])
+        self.assertEqual(-32602, responses[1]["error"]["code"])
+        self.assertEqual("0x1", responses[2]["result"])
+
+    def test_pre_send(self):
+        writer = create_writer(self.url, 3, TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD, None, 0)
+        pre_send = writer.enable_pre_send()
+        writer.set_listeners([functools.partial(check_enough_balance, self.url, pre_send=pre_send)])
+
+        self.assertEqual("0x" + "1" * 64, writer.set_stake({"value": "0x1"}))
+        self.assertEqual(0x1000, pre_send.estimated_step)
+        self.assertEqual(0x10000000, pre_send.balance)
+        self.assertEqual(0x1, pre_send.step_price)
+
+        # estimation and the balance batch go out together, then the transaction itself
+        self.assertEqual(3, len(self.server.posts))
+        self.assertIn("debug_estimateStep", self.server.posts[:2])
+        self.assertIn(["icx_getBalance", "icx_call"], self.server.posts[:2])
+        self.assertEqual("icx_sendTransaction", self.server.posts[2])
+
+    def test_pre_send_with_cache(self):
+        writer = create_writer(self.url, 3, TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD, 0x1000, 0)
+        pre_send = writer.enable_pre_send(ChainConstantsCache())
+        writer.set_listeners([functools.partial(check_enough_balance, self.url, pre_send=pre_send)])
+
+        writer.set_stake({"value": "0x1"})
+        writer.set_stake({"value": "0x1"})
+        self.assertEqual(
+            [["icx_getBalance", "icx_call"], "icx_sendTransaction", ["icx_getBalance"], "icx_sendTransaction"],
+            self.server.posts
+        )
+
+    def test_hedged_request(self):
+        slow = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        slow.peers = set()
+        slow.posts = []
+        slow.delay = 1
+        threading.Thread(target=slow.serve_forever, daemon=True).start()
+        slow_url = f"http://127.0.0.1:{slow.server_port}/api/v3"
+
+        try:
+            reader = create_reader([slow_url, self.url], 3)
+            reader.set_listeners([])
+            started = time.monotonic()
+            self.assertEqual({"method": "getPRep"}, reader.get_prep("hx" + "0" * 40)["result"])
+            self.assertLess(time.monotonic() - started, slow.delay)
+
+            provider = reader._icon_service.provider
+            self.assertIsInstance(provider, transport.HedgedHTTPProvider)
+            for _ in range(transport.MIN_LATENCY_SAMPLES):
+                reader.get_prep("hx" + "0" * 40)
+            self.assertEqual([self.url, slow_url], provider.ranked_urls())
+        finally:
+            slow.shutdown()
+            slow.server_close()
+
+    def test_response_listener(self):
+        timings = []
+        transport.add_response_listener(timings.append)
+        try:
+            service = transport.create_icon_service(self.url)
+            service.batch([("icx_getBalance", {"address": "hx" + "0" * 40}), ("icx_call", None)])
+            self.assertTrue(check_enough_balance(self.url, {"from_": "hx" + "0" * 40, "step_limit": 1}))
+        finally:
+            transport.remove_response_listener(timings.append)
+
+        # check_enough_balance also sends icx_getBalance and getStepPrice in a batch
+        self.assertEqual([("icx_getBalance", 2), ("icx_getBalance", 2)], [(t.method, t.count) for t in timings])
+        self.assertEqual(self.url, timings[0].url)
+        self.assertTrue(all(t.request_bytes > 0 and t.response_bytes > 0 and t.error is None for t in timings))
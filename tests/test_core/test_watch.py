@@ -0,0 +1,54 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from preptools.core.watch import watch
+
+
+class TestWatch(unittest.TestCase):
+
+    def test_watch_interval(self):
+        responses = iter([
+            {"result": {"grade": "0x0", "power": "0x1"}},
+            {"result": {"grade": "0x0", "power": "0x1"}},
+            {"result": {"grade": "0x1", "power": "0x1"}},
+            {"error": {"code": -32000, "message": "down"}},
+        ])
+        sleeps = []
+        events = list(watch(lambda: next(responses), interval=5, count=4, sleep=sleeps.append))
+
+        self.assertEqual([5, 5, 5], sleeps)
+        self.assertEqual(3, len(events))
+        self.assertEqual({"grade": "0x0", "power": "0x1"}, events[0]["result"])
+        self.assertEqual({"grade": {"old": "0x0", "new": "0x1"}}, events[1]["changes"])
+        self.assertEqual("down", events[2]["changes"]["error"]["new"]["message"])
+
+    def test_watch_on_block(self):
+        heights = iter([10, 10, 10, 11, 12])
+        proposals = iter([
+            {"result": {"proposals": [{"id": "0x1", "status": "0x0"}]}},
+            {"result": {"proposals": [{"id": "0x2", "status": "0x0"}, {"id": "0x1", "status": "0x4"}]}},
+            {"result": {"proposals": [{"id": "0x2", "status": "0x0"}, {"id": "0x1", "status": "0x4"}]}},
+        ])
+        sleeps = []
+        events = list(watch(lambda: next(proposals), get_block_height=lambda: next(heights), count=3,
+                            sleep=sleeps.append))
+
+        self.assertEqual(2, len(sleeps))
+        self.assertEqual(["0xa", "0xb"], [e["blockHeight"] for e in events])
+        self.assertEqual(
+            [("added", "0x2"), ("changed", "0x1")],
+            [(c["type"], c["id"]) for c in events[1]["changes"]])
+        self.assertEqual({"id": "0x2", "status": "0x0"}, events[1]["changes"][0]["proposal"])
@@ -0,0 +1,106 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import tempfile
+import unittest
+
+import requests
+
+from preptools.core.prep import create_reader, create_writer
+from preptools.testing.mock_node import MockNode, MockState, PENDING_ERROR_CODE
+from tests.commons.constants import TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD
+
+
+class TestMockNode(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.state = MockState.synthetic(preps=30, proposals=25, accounts=5, seed=1)
+        self.node = MockNode(self.state, block_interval=0.05).start()
+        self.reader = create_reader(self.node.url, 3)
+        self.reader.set_listeners([])
+
+    def tearDown(self) -> None:
+        self.node.stop()
+
+    def test_read(self):
+        address = self.state.preps[3]["address"]
+        self.assertEqual(self.state.preps[3], self.reader.get_prep(address)["result"])
+        self.assertEqual(30, len(list(self.reader.iter_preps(chunk_size=7))))
+
+        proposals = list(self.reader.iter_proposals())
+        self.assertEqual([p["id"] for p in reversed(self.state.proposals)], [p["id"] for p in proposals])
+
+        ret = self.reader.batch_call([address, "hx" + "0" * 40], ("getPRep", "getStake"))
+        self.assertIn("result", ret[address]["getPRep"])
+        self.assertIn("error", ret["hx" + "0" * 40]["getPRep"])
+        self.assertEqual("0x0", ret["hx" + "0" * 40]["getStake"]["result"]["stake"])
+
+    def test_send_transaction(self):
+        writer = create_writer(self.node.url, 3, TEST_KEYSTORE_PATH, TEST_KEYSTORE_PASSWORD, None, 0)
+        writer.set_listeners([lambda content: True])
+        tx_hash = writer.set_stake({"value": hex(10 ** 18)})
+
+        results = list(self.reader.wait_tx_results([tx_hash], timeout=5, interval=0.01))
+        self.assertEqual(1, len(results))
+        self.assertEqual("0x1", results[0][1]["status"])
+        self.assertEqual(1, self.node.requests["icx_sendTransaction"])
+
+        owner = writer._owner.get_address()
+        self.assertEqual(hex(10 ** 18), self.reader.get_stake(owner)["result"]["stake"])
+
+    def test_pending_and_unknown_transaction(self):
+        self.node.block_interval = 3600
+        tx_hash = self.node.handle({
+            "jsonrpc": "2.0", "id": 1, "method": "icx_sendTransaction",
+            "params": {"from": "hx" + "1" * 40, "to": "hx" + "2" * 40, "stepLimit": "0x1", "nid": "0x3",
+                       "signature": "sig"},
+        })["result"]
+
+        response = self.node.handle({"id": 2, "method": "icx_getTransactionResult", "params": {"txHash": tx_hash}})
+        self.assertEqual(PENDING_ERROR_CODE, response["error"]["code"])
+        response = self.node.handle({"id": 3, "method": "icx_getTransactionResult", "params": {"txHash": "0x1"}})
+        self.assertEqual(-31004, response["error"]["code"])
+
+    def test_no_block_interval(self):
+        node = MockNode(self.state, block_interval=0).start()
+        self.addCleanup(node.stop)
+        tx_hash = node.handle({
+            "jsonrpc": "2.0", "id": 1, "method": "icx_sendTransaction",
+            "params": {"from": "hx" + "1" * 40, "to": "hx" + "2" * 40, "stepLimit": "0x1", "nid": "0x3",
+                       "signature": "sig"},
+        })["result"]
+
+        self.assertEqual(2, node.block_height)
+        response = node.handle({"id": 2, "method": "icx_getTransactionResult", "params": {"txHash": tx_hash}})
+        self.assertEqual("0x2", response["result"]["blockHeight"])
+        self.assertRaises(ValueError, MockNode, self.state, block_interval=-1)
+
+    def test_injected_errors(self):
+        self.node.error_rate = 1.0
+        response = requests.post(self.node.url, json={"jsonrpc": "2.0", "id": 1, "method": "icx_getLastBlock"})
+        self.assertEqual(500, response.status_code)
+        self.assertEqual(-32000, response.json()["error"]["code"])
+
+    def test_load_state(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "state.json")
+            with open(path, "w") as f:
+                json.dump(self.state.to_dict(), f)
+            state = MockState.load(path)
+
+        self.assertEqual(self.state.preps, state.preps)
+        self.assertEqual(self.state.accounts, state.accounts)
+        self.assertEqual(self.state.step_price, state.step_price)
@@ -0,0 +1,62 @@
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from preptools.utils.constants import resolve_urls
+from preptools.utils.endpoints import EndpointManager
+
+
+class TestEndpointManager(unittest.TestCase):
+
+    def test_rank(self):
+        manager = EndpointManager(alpha=0.5)
+        manager.record("http://a/api/v3", 0.1)
+        manager.record("http://b/api/v3", 0.3)
+        manager.record("http://c/api/v3", None)
+        urls = ["http://c/api/v3", "http://d/api/v3", "http://b/api/v3", "http://a/api/v3"]
+        self.assertEqual(
+            ["http://a/api/v3", "http://b/api/v3", "http://d/api/v3", "http://c/api/v3"],
+            manager.rank(urls, probe=False))
+
+        # a degrades, b is the best one now
+        manager.record("http://a/api/v3", 0.9)
+        self.assertAlmostEqual(0.5, manager.score("http://a/api/v3")["latency"])
+        self.assertEqual("http://b/api/v3", manager.rank(urls, probe=False)[0])
+
+        # a recovered endpoint starts over from its new latency
+        manager.record("http://c/api/v3", 0.01)
+        self.assertEqual("http://c/api/v3", manager.rank(urls, probe=False)[0])
+
+    def test_probe_and_persist(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "endpoints.json")
+            manager = EndpointManager(path)
+            self.assertIsNone(manager.probe("http://127.0.0.1:1/api/v3"))
+            manager.record("http://a/api/v3", 0.2)
+            manager.save()
+
+            manager = EndpointManager(path)
+            self.assertFalse(manager.score("http://127.0.0.1:1/api/v3")["healthy"])
+            self.assertEqual(
+                ["http://a/api/v3", "http://127.0.0.1:1/api/v3"],
+                manager.rank(["http://127.0.0.1:1/api/v3", "http://a/api/v3"]))
+
+    def test_resolve_urls(self):
+        self.assertEqual(
+            ["https://ctz.solidwallet.io/api/v3", "http://localhost:9000/api/v3"],
+            resolve_urls("mainnet, http://localhost:9000/api/v3"))
+        self.assertEqual(["https://lisbon.net.solidwallet.io/api/v3"], resolve_urls(["lisbon"]))
@@ -21,6 +21,7 @@ import pytest
 
 from preptools.exception import InvalidFormatException
 from preptools.utils.validation_checker import (
+    BalanceBudget,
     validate_country,
     validate_email,
     validate_p2p_endpoint,
@@ -159,3 +160,13 @@ class TestValidationChecker(unittest.TestCase):
 )
 def test_is_valid_address(address: str, expected: bool):
     assert is_valid_address(address) == expected
+
+
+def test_balance_budget(capsys):
+    budget = BalanceBudget(balance=1000, step_price=10)
+    assert budget({"step_limit": 40, "value": 100})
+    assert budget({"step_limit": 40})
+    # 100 left
+    assert not budget({"step_limit": 10})
+    assert budget({"step_limit": 9})
+    assert "Your balance left(100)" in capsys.readouterr().out